@@ -5,12 +5,19 @@ A sample module for practicing documentation and testing workflows.
 This code intentionally lacks comprehensive documentation and tests.
 """
 
+import asyncio
+import csv
 import hashlib
+import heapq
+import hmac
 import secrets
 import re
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from itertools import islice
+from typing import Optional, Dict, Iterable, Iterator, List, Sequence, Tuple
 from enum import Enum
 
 
@@ -60,7 +67,20 @@ class AuthToken:
     created_at: datetime
 
 
+@dataclass
+class BulkRegisterResult:
+    index: int
+    email: str
+    user: Optional[User] = None
+    error: Optional[str] = None
+
+
 class PasswordValidator:
+    # One pass over the password finds every character class present
+    _CHARACTER_CLASSES = re.compile(
+        r'(?P<uppercase>[A-Z])|(?P<lowercase>[a-z])|(?P<digit>\d)|(?P<special>[!@#$%^&*(),.?":{}|<>])'
+    )
+
     def __init__(
         self,
         min_length: int = 8,
@@ -81,16 +101,22 @@ class PasswordValidator:
         if len(password) < self.min_length:
             errors.append(f"Password must be at least {self.min_length} characters")
         
-        if self.require_uppercase and not re.search(r'[A-Z]', password):
+        found = set()
+        for match in self._CHARACTER_CLASSES.finditer(password):
+            found.add(match.lastgroup)
+            if len(found) == 4:
+                break
+        
+        if self.require_uppercase and "uppercase" not in found:
             errors.append("Password must contain at least one uppercase letter")
         
-        if self.require_lowercase and not re.search(r'[a-z]', password):
+        if self.require_lowercase and "lowercase" not in found:
             errors.append("Password must contain at least one lowercase letter")
         
-        if self.require_digit and not re.search(r'\d', password):
+        if self.require_digit and "digit" not in found:
             errors.append("Password must contain at least one digit")
         
-        if self.require_special and not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if self.require_special and "special" not in found:
             errors.append("Password must contain at least one special character")
         
         return errors
@@ -99,47 +125,275 @@ class PasswordValidator:
         return len(self.validate(password)) == 0
 
 
+class PasswordHasher(ABC):
+    """
+    Password hashing scheme.
+
+    Hashes start with ``scheme$`` so verify_password() can tell which hasher
+    produced a stored value. Implementations must be picklable so hashing
+    can run in a process pool.
+    """
+
+    scheme: Optional[str] = None
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, stored_hash: str) -> bool:
+        pass
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """True if stored_hash was made by another scheme or with other parameters."""
+        return _scheme_of(stored_hash) != self.scheme
+
+
+class Sha256Hasher(PasswordHasher):
+    """Single salted SHA-256. Fast; kept for existing ``salt$hash`` values."""
+
+    def hash(self, password: str, salt: Optional[str] = None) -> str:
+        if salt is None:
+            salt = secrets.token_hex(16)
+        hash_input = f"{password}{salt}"
+        password_hash = hashlib.sha256(hash_input.encode()).hexdigest()
+        return f"{salt}${password_hash}"
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        salt, _ = stored_hash.split('$')
+        return hmac.compare_digest(self.hash(password, salt), stored_hash)
+
+
+class Pbkdf2Hasher(PasswordHasher):
+    """PBKDF2-HMAC-SHA256; cost is the iteration count."""
+
+    scheme = "pbkdf2_sha256"
+
+    def __init__(self, iterations: int = 600_000):
+        self.iterations = iterations
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_hex(16)
+        return f"{self.scheme}${self.iterations}${salt}${self._derive(password, salt, self.iterations)}"
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        if super().needs_rehash(stored_hash):
+            return True
+        return int(stored_hash.split('$')[1]) != self.iterations
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        _, iterations, salt, expected = stored_hash.split('$')
+        return hmac.compare_digest(self._derive(password, salt, int(iterations)), expected)
+
+    @staticmethod
+    def _derive(password: str, salt: str, iterations: int) -> str:
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations).hex()
+
+
+class ScryptHasher(PasswordHasher):
+    """scrypt; cost is n (CPU/memory), r (block size) and p (parallelism)."""
+
+    scheme = "scrypt"
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1):
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_hex(16)
+        derived = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{self.scheme}${self.n}${self.r}${self.p}${salt}${derived}"
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        if super().needs_rehash(stored_hash):
+            return True
+        return stored_hash.split('$')[1:4] != [str(self.n), str(self.r), str(self.p)]
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        _, n, r, p, salt, expected = stored_hash.split('$')
+        derived = self._derive(password, salt, int(n), int(r), int(p))
+        return hmac.compare_digest(derived, expected)
+
+    @staticmethod
+    def _derive(password: str, salt: str, n: int, r: int, p: int) -> str:
+        return hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+            maxmem=2 * 128 * n * r * p,
+        ).hex()
+
+
+# Schemes verify_password() recognizes; anything else is a legacy salt$hash
+_HASHERS_BY_SCHEME = {hasher.scheme: hasher for hasher in (Pbkdf2Hasher, ScryptHasher)}
+
+
+def _scheme_of(stored_hash: str) -> Optional[str]:
+    scheme = stored_hash.split('$', 1)[0]
+    return scheme if scheme in _HASHERS_BY_SCHEME else None
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    """
+    Verify against a hash made by any known scheme.
+
+    Cost parameters are read from the stored hash, so hashes made before a
+    scheme or cost change still verify.
+    """
+    hasher = _HASHERS_BY_SCHEME.get(_scheme_of(stored_hash), Sha256Hasher)()
+    return hasher.verify(password, stored_hash)
+
+
 class AuthenticationService:
     MAX_FAILED_ATTEMPTS = 5
     LOCKOUT_DURATION_MINUTES = 30
     TOKEN_EXPIRY_HOURS = 24
 
-    def __init__(self):
+    def __init__(
+        self,
+        hasher: Optional[PasswordHasher] = None,
+        executor: Optional[Executor] = None,
+    ):
         self._users: Dict[str, User] = {}
         self._tokens: Dict[str, AuthToken] = {}
         self._password_validator = PasswordValidator()
-
-    def _hash_password(self, password: str, salt: Optional[str] = None) -> str:
-        if salt is None:
-            salt = secrets.token_hex(16)
-        hash_input = f"{password}{salt}"
-        password_hash = hashlib.sha256(hash_input.encode()).hexdigest()
-        return f"{salt}${password_hash}"
+        self._hasher = hasher or Pbkdf2Hasher()
+        # Used by the async variants; a process pool is created on first use
+        self._executor = executor
+        self._owns_executor = executor is None
+        # Normalized email -> user id
+        self._email_index: Dict[str, str] = {}
+        # (expires_at, token) min-heap; entries for logged-out tokens are
+        # skipped when popped and dropped when the heap is compacted
+        self._token_expiry: List[Tuple[datetime, str]] = []
+
+    def _hash_password(self, password: str) -> str:
+        return self._hasher.hash(password)
 
     def _verify_password(self, password: str, stored_hash: str) -> bool:
-        salt, _ = stored_hash.split('$')
-        return self._hash_password(password, salt) == stored_hash
+        return verify_password(password, stored_hash)
 
     def register(self, email: str, password: str, role: UserRole = UserRole.USER) -> User:
-        if email in [u.email for u in self._users.values()]:
+        self._check_registration(email, password)
+        return self._add_user(email, self._hash_password(password), role)
+
+    async def register_async(
+        self, email: str, password: str, role: UserRole = UserRole.USER
+    ) -> User:
+        """register() with hashing run in the process pool, off the event loop."""
+        self._check_registration(email, password)
+        password_hash = await self._run_in_pool(self._hasher.hash, password)
+        # Another registration may have taken the email while we were hashing
+        if normalize_email(email) in self._email_index:
+            raise AuthError("Email already registered")
+        return self._add_user(email, password_hash, role)
+
+    def login(self, email: str, password: str) -> AuthToken:
+        """Log in; a password stored with an outdated scheme is rehashed."""
+        user = self._login_candidate(email)
+        verified = self._verify_password(password, user.password_hash)
+        token = self._complete_login(user, verified)
+        if self._hasher.needs_rehash(user.password_hash):
+            user.password_hash = self._hash_password(password)
+        return token
+
+    async def login_async(self, email: str, password: str) -> AuthToken:
+        """login() with verification (and any rehash) run in the process pool."""
+        user = self._login_candidate(email)
+        verified = await self._run_in_pool(verify_password, password, user.password_hash)
+        token = self._complete_login(user, verified)
+        if self._hasher.needs_rehash(user.password_hash):
+            user.password_hash = await self._run_in_pool(self._hasher.hash, password)
+        return token
+
+    def bulk_register(
+        self,
+        records: Iterable[Sequence[str]],
+        batch_size: int = 256,
+    ) -> Iterator[BulkRegisterResult]:
+        """
+        Register users from (email, password[, role]) records as a stream.
+
+        Records are processed batch_size at a time, with the batch's passwords
+        hashed in parallel in the process pool. One result is yielded per
+        record, in order; invalid records get an error and do not stop the
+        stream.
+        """
+        records = iter(records)
+        offset = 0
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            yield from self._register_batch(batch, offset)
+            offset += len(batch)
+
+    def bulk_register_csv(self, path: str, batch_size: int = 256) -> Iterator[BulkRegisterResult]:
+        """bulk_register() from a CSV file with email, password and optional role columns."""
+        with open(path, newline="") as f:
+            rows = (
+                (row.get("email") or "", row.get("password") or "", row.get("role") or UserRole.USER.value)
+                for row in csv.DictReader(f)
+            )
+            yield from self.bulk_register(rows, batch_size)
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _check_registration(self, email: str, password: str) -> None:
+        if normalize_email(email) in self._email_index:
             raise AuthError("Email already registered")
         
         validation_errors = self._password_validator.validate(password)
         if validation_errors:
             raise AuthError(f"Invalid password: {', '.join(validation_errors)}")
-        
+
+    def _register_batch(
+        self, batch: List[Sequence[str]], offset: int
+    ) -> List[BulkRegisterResult]:
+        results = []
+        accepted: List[Tuple[BulkRegisterResult, str, UserRole]] = []
+        seen = set()
+        for i, record in enumerate(batch):
+            email = record[0] if record else ""
+            result = BulkRegisterResult(index=offset + i, email=email)
+            results.append(result)
+            try:
+                if len(record) < 2:
+                    raise AuthError("Record must have an email and a password")
+                password = record[1]
+                role = UserRole(record[2]) if len(record) > 2 else UserRole.USER
+                # Also rejects duplicates within the batch
+                if normalize_email(email) in seen:
+                    raise AuthError("Email already registered")
+                self._check_registration(email, password)
+            except (AuthError, ValueError) as e:
+                result.error = str(e) if isinstance(e, AuthError) else f"Invalid record: {e}"
+                continue
+            seen.add(normalize_email(email))
+            accepted.append((result, password, role))
+
+        # Each hash costs far more than shipping it to a worker process
+        hashes = self._pool().map(self._hasher.hash, [password for _, password, _ in accepted])
+        for (result, _, role), password_hash in zip(accepted, hashes):
+            result.user = self._add_user(result.email, password_hash, role)
+        return results
+
+    def _add_user(self, email: str, password_hash: str, role: UserRole) -> User:
         user_id = secrets.token_urlsafe(16)
         user = User(
             id=user_id,
             email=email,
-            password_hash=self._hash_password(password),
+            password_hash=password_hash,
             role=role,
             created_at=datetime.utcnow()
         )
         self._users[user_id] = user
+        self._email_index[normalize_email(email)] = user_id
         return user
 
-    def login(self, email: str, password: str) -> AuthToken:
+    def _login_candidate(self, email: str) -> User:
         user = self._find_user_by_email(email)
         
         if user is None:
@@ -149,8 +403,10 @@ class AuthenticationService:
             raise AccountLockedError(
                 f"Account locked. Try again after {user.locked_until}"
             )
-        
-        if not self._verify_password(password, user.password_hash):
+        return user
+
+    def _complete_login(self, user: User, verified: bool) -> AuthToken:
+        if not verified:
             self._record_failed_attempt(user)
             raise InvalidCredentialsError("Invalid email or password")
         
@@ -159,6 +415,14 @@ class AuthenticationService:
         
         return self._create_token(user)
 
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor()
+        return self._executor
+
+    async def _run_in_pool(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+
     def logout(self, token: str) -> bool:
         if token in self._tokens:
             del self._tokens[token]
@@ -194,10 +458,10 @@ class AuthenticationService:
         return True
 
     def _find_user_by_email(self, email: str) -> Optional[User]:
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
+        user_id = self._email_index.get(normalize_email(email))
+        if user_id is None:
+            return None
+        return self._users[user_id]
 
     def _is_account_locked(self, user: User) -> bool:
         if user.locked_until is None:
@@ -223,8 +487,31 @@ class AuthenticationService:
             created_at=datetime.utcnow()
         )
         self._tokens[token.token] = token
+        heapq.heappush(self._token_expiry, (token.expires_at, token.token))
+        self.purge_expired_tokens()
         return token
 
+    def purge_expired_tokens(self) -> int:
+        """Remove expired tokens; O(expired) plus amortized compaction."""
+        now = datetime.utcnow()
+        purged = 0
+        while self._token_expiry and self._token_expiry[0][0] <= now:
+            expires_at, token = heapq.heappop(self._token_expiry)
+            auth_token = self._tokens.get(token)
+            if auth_token is not None and auth_token.expires_at == expires_at:
+                del self._tokens[token]
+                purged += 1
+        if len(self._token_expiry) > 2 * len(self._tokens) + 64:
+            self._token_expiry = [
+                (t.expires_at, t.token) for t in self._tokens.values()
+            ]
+            heapq.heapify(self._token_expiry)
+        return purged
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
 
 def validate_email(email: str) -> bool:
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
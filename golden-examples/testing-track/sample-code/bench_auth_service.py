@@ -0,0 +1,79 @@
+"""
+Login throughput and event-loop lag under a login storm.
+
+Compares verifying passwords on the event loop (sync login() called from a
+coroutine) with login_async(), which verifies in a process pool. A ticker
+task measures how late the loop wakes it up.
+
+Usage:
+    python bench_auth_service.py [--hasher pbkdf2|scrypt] [--logins 200] [--workers N]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from auth_service import AuthenticationService, Pbkdf2Hasher, ScryptHasher
+
+PASSWORD = "Bench-Passw0rd!"
+TICK_SECONDS = 0.005
+
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def storm(service: AuthenticationService, logins: int, use_pool: bool) -> tuple:
+    async def one() -> None:
+        if use_pool:
+            await service.login_async("bench@contoso.com", PASSWORD)
+        else:
+            service.login("bench@contoso.com", PASSWORD)
+
+    lags: list = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, lags
+
+
+def report(label: str, logins: int, elapsed: float, cores: int, lags: list) -> None:
+    lags = sorted(lags) or [0.0]
+    print(
+        f"{label:<14} {logins / elapsed:8.1f} logins/s  "
+        f"{logins / elapsed / cores:7.1f} /s/core  "
+        f"loop lag p50 {lags[len(lags) // 2] * 1e3:7.1f} ms  max {lags[-1] * 1e3:7.1f} ms"
+    )
+
+
+async def main(hasher_name: str, logins: int, workers: int) -> None:
+    hasher = ScryptHasher() if hasher_name == "scrypt" else Pbkdf2Hasher()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        service = AuthenticationService(hasher=hasher, executor=pool)
+        service.register("bench@contoso.com", PASSWORD)
+        await service.login_async("bench@contoso.com", PASSWORD)  # Warm the pool
+
+        elapsed, lags = await storm(service, logins, use_pool=False)
+        report("on event loop", logins, elapsed, 1, lags)
+
+        elapsed, lags = await storm(service, logins, use_pool=True)
+        report(f"pool x{workers}", logins, elapsed, workers, lags)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hasher", choices=["pbkdf2", "scrypt"], default="pbkdf2")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    asyncio.run(main(args.hasher, args.logins, args.workers))
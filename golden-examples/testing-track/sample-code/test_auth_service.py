@@ -0,0 +1,301 @@
+"""
+Tests for auth_service.
+
+Hashers use low cost parameters so the suite stays fast; cost is not what
+is under test. Run from this directory: python -m pytest -q
+"""
+
+import asyncio
+import heapq
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from auth_service import (
+    AuthError,
+    AuthenticationService,
+    InvalidCredentialsError,
+    Pbkdf2Hasher,
+    ScryptHasher,
+    Sha256Hasher,
+    UserRole,
+    verify_password,
+)
+
+PASSWORD = "Correct-Horse-1!"
+
+
+@pytest.fixture
+def service():
+    executor = ThreadPoolExecutor(max_workers=2)
+    service = AuthenticationService(hasher=Pbkdf2Hasher(iterations=1_000), executor=executor)
+    yield service
+    executor.shutdown()
+
+
+def add_legacy_user(service: AuthenticationService, email: str) -> None:
+    """A user stored before the switch to PBKDF2, with a salt$hash value."""
+    service._add_user(email, Sha256Hasher().hash(PASSWORD), UserRole.USER)
+
+
+class TestEmailIndex:
+    def test_should_reject_duplicate_registration_with_different_case(self, service):
+        # Arrange
+        service.register("Jane.Doe@Contoso.com", PASSWORD)
+
+        # Act / Assert
+        with pytest.raises(AuthError, match="already registered"):
+            service.register("  jane.doe@CONTOSO.COM ", PASSWORD)
+
+    def test_should_log_in_regardless_of_email_case(self, service):
+        # Arrange
+        user = service.register("Jane.Doe@Contoso.com", PASSWORD)
+
+        # Act
+        token = service.login("JANE.DOE@contoso.com", PASSWORD)
+
+        # Assert
+        assert token.user_id == user.id
+
+    def test_should_keep_email_as_registered(self, service):
+        # Arrange / Act
+        user = service.register("Jane.Doe@Contoso.com", PASSWORD)
+
+        # Assert
+        assert user.email == "Jane.Doe@Contoso.com"
+
+    def test_should_reject_unknown_email(self, service):
+        # Act / Assert
+        with pytest.raises(InvalidCredentialsError):
+            service.login("nobody@contoso.com", PASSWORD)
+
+
+class TestTokenExpiry:
+    def test_should_purge_only_expired_tokens(self, service):
+        # Arrange
+        service.register("jane@contoso.com", PASSWORD)
+        expired = service.login("jane@contoso.com", PASSWORD)
+        live = service.login("jane@contoso.com", PASSWORD)
+        expired.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        service._token_expiry = [(t.expires_at, t.token) for t in service._tokens.values()]
+        heapq.heapify(service._token_expiry)
+
+        # Act
+        purged = service.purge_expired_tokens()
+
+        # Assert
+        assert purged == 1
+        assert list(service._tokens) == [live.token]
+
+    def test_should_skip_logged_out_tokens(self, service):
+        # Arrange
+        service.register("jane@contoso.com", PASSWORD)
+        token = service.login("jane@contoso.com", PASSWORD)
+        service.logout(token.token)
+
+        # Act
+        purged = service.purge_expired_tokens()
+
+        # Assert
+        assert purged == 0
+        assert token.token not in service._tokens
+
+
+class TestBulkRegister:
+    def test_should_register_valid_records_in_order(self, service):
+        # Arrange
+        records = [(f"user{i}@contoso.com", PASSWORD) for i in range(5)]
+
+        # Act
+        results = list(service.bulk_register(records, batch_size=2))
+
+        # Assert
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert all(r.error is None and r.user is not None for r in results)
+        assert service.login("user4@contoso.com", PASSWORD)
+
+    def test_should_reject_duplicates_within_a_batch(self, service):
+        # Arrange
+        records = [("dup@contoso.com", PASSWORD), ("DUP@contoso.com ", PASSWORD)]
+
+        # Act
+        first, second = service.bulk_register(records)
+
+        # Assert
+        assert first.user is not None
+        assert second.user is None
+        assert second.error == "Email already registered"
+
+    def test_should_reject_duplicates_across_batches(self, service):
+        # Arrange
+        records = [("dup@contoso.com", PASSWORD), ("Dup@Contoso.com", PASSWORD)]
+
+        # Act
+        first, second = service.bulk_register(records, batch_size=1)
+
+        # Assert
+        assert first.user is not None
+        assert second.error == "Email already registered"
+
+    def test_should_report_per_record_errors_without_stopping(self, service):
+        # Arrange
+        service.register("taken@contoso.com", PASSWORD)
+        records = [
+            ("taken@contoso.com", PASSWORD),
+            ("weak@contoso.com", "weak"),
+            ("norole@contoso.com", PASSWORD, "superuser"),
+            ("missing-password@contoso.com",),
+            ("ok@contoso.com", PASSWORD, "admin"),
+        ]
+
+        # Act
+        results = list(service.bulk_register(records))
+
+        # Assert
+        assert results[0].error == "Email already registered"
+        assert results[1].error.startswith("Invalid password")
+        assert results[2].error.startswith("Invalid record")
+        assert results[3].error == "Record must have an email and a password"
+        assert results[4].user.role == UserRole.ADMIN
+
+    def test_should_import_csv(self, service, tmp_path):
+        # Arrange
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,password,role\n"
+            f"a@contoso.com,{PASSWORD},admin\n"
+            f"A@contoso.com,{PASSWORD},\n"
+            f"b@contoso.com,{PASSWORD},\n"
+        )
+
+        # Act
+        results = list(service.bulk_register_csv(str(path)))
+
+        # Assert
+        assert results[0].user.role == UserRole.ADMIN
+        assert results[1].error == "Email already registered"
+        assert results[2].user.role == UserRole.USER
+
+    def test_should_hash_in_process_pool(self):
+        # Arrange
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            service = AuthenticationService(hasher=Pbkdf2Hasher(iterations=1_000), executor=pool)
+            records = [(f"user{i}@contoso.com", PASSWORD) for i in range(4)]
+
+            # Act
+            results = list(service.bulk_register(records))
+
+        # Assert
+        assert all(r.user is not None for r in results)
+        assert service.login("user3@contoso.com", PASSWORD)
+
+
+class TestPasswordSchemes:
+    def test_should_verify_each_scheme_by_its_prefix(self):
+        # Arrange
+        hashes = [
+            Sha256Hasher().hash(PASSWORD),
+            Pbkdf2Hasher(iterations=1_000).hash(PASSWORD),
+            ScryptHasher(n=2 ** 4).hash(PASSWORD),
+        ]
+
+        # Act
+        results = [verify_password(PASSWORD, h) for h in hashes]
+        wrong = [verify_password("Wrong-Horse-1", h) for h in hashes]
+
+        # Assert
+        assert results == [True, True, True]
+        assert wrong == [False, False, False]
+
+    def test_should_need_rehash_when_scheme_or_cost_differs(self):
+        # Arrange
+        hasher = Pbkdf2Hasher(iterations=1_000)
+
+        # Act / Assert
+        assert hasher.needs_rehash(Sha256Hasher().hash(PASSWORD))
+        assert hasher.needs_rehash(Pbkdf2Hasher(iterations=500).hash(PASSWORD))
+        assert not hasher.needs_rehash(hasher.hash(PASSWORD))
+
+
+class TestLegacyHashes:
+    def test_should_log_in_with_legacy_hash(self, service):
+        # Arrange
+        add_legacy_user(service, "legacy@contoso.com")
+
+        # Act
+        token = service.login("legacy@contoso.com", PASSWORD)
+
+        # Assert
+        assert service.validate_token(token.token).email == "legacy@contoso.com"
+
+    def test_should_rehash_legacy_hash_on_successful_login(self, service):
+        # Arrange
+        add_legacy_user(service, "legacy@contoso.com")
+
+        # Act
+        service.login("legacy@contoso.com", PASSWORD)
+
+        # Assert
+        user = service._find_user_by_email("legacy@contoso.com")
+        assert user.password_hash.startswith("pbkdf2_sha256$1000$")
+        assert service.login("legacy@contoso.com", PASSWORD)
+
+    def test_should_not_rehash_on_failed_login(self, service):
+        # Arrange
+        add_legacy_user(service, "legacy@contoso.com")
+        user = service._find_user_by_email("legacy@contoso.com")
+        legacy_hash = user.password_hash
+
+        # Act
+        with pytest.raises(InvalidCredentialsError):
+            service.login("legacy@contoso.com", "Wrong-Horse-1")
+
+        # Assert
+        assert user.password_hash == legacy_hash
+
+
+class TestLoginAsync:
+    def test_should_issue_token_for_correct_password(self, service):
+        # Arrange
+        service.register("async@contoso.com", PASSWORD)
+
+        # Act
+        token = asyncio.run(service.login_async("async@contoso.com", PASSWORD))
+
+        # Assert
+        assert service.validate_token(token.token).email == "async@contoso.com"
+
+    def test_should_reject_wrong_password_and_count_attempt(self, service):
+        # Arrange
+        user = service.register("async@contoso.com", PASSWORD)
+
+        # Act
+        with pytest.raises(InvalidCredentialsError):
+            asyncio.run(service.login_async("async@contoso.com", "Wrong-Horse-1"))
+
+        # Assert
+        assert user.failed_attempts == 1
+
+    def test_should_rehash_legacy_hash_in_pool(self, service):
+        # Arrange
+        add_legacy_user(service, "legacy@contoso.com")
+
+        # Act
+        asyncio.run(service.login_async("legacy@contoso.com", PASSWORD))
+
+        # Assert
+        user = service._find_user_by_email("legacy@contoso.com")
+        assert user.password_hash.startswith("pbkdf2_sha256$")
+
+    def test_should_verify_in_process_pool(self):
+        # Arrange: hasher and verify_password must pickle to reach the workers
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            service = AuthenticationService(hasher=Pbkdf2Hasher(iterations=1_000), executor=pool)
+            asyncio.run(service.register_async("pool@contoso.com", PASSWORD))
+
+            # Act
+            token = asyncio.run(service.login_async("pool@contoso.com", PASSWORD))
+
+        # Assert
+        assert service.validate_token(token.token).email == "pool@contoso.com"
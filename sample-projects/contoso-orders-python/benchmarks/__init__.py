@@ -0,0 +1,17 @@
+"""
+Benchmarks for Contoso Orders API
+
+Standalone scripts, run from the project root:
+
+    python -m benchmarks.<script_name>
+"""
+
+import logging
+
+import structlog
+
+
+def quiet_logging() -> None:
+    """Silence per-request info logs so they do not dominate the timings."""
+    logging.basicConfig(level=logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
@@ -0,0 +1,85 @@
+"""
+Customer Search Benchmark
+
+Builds the customer trigram index over synthetic customers and reports
+build time, index memory per customer and query latency for partial names,
+typos, companies and emails.
+
+Usage:
+    python -m benchmarks.bench_customer_search [--customers 1000000] [--queries 200]
+"""
+
+import argparse
+import random
+import time
+
+from src.search import TrigramIndex
+
+FIRST = ["james", "mary", "robert", "patricia", "john", "jennifer", "michael", "linda",
+         "david", "elizabeth", "william", "barbara", "richard", "susan", "joseph", "jessica",
+         "thomas", "sarah", "charles", "karen", "wei", "priya", "olusegun", "anneliese"]
+LAST = ["smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis",
+        "rodriguez", "martinez", "hernandez", "lopez", "gonzalez", "wilson", "anderson",
+        "thomas", "taylor", "moore", "jackson", "martin", "nakamura", "okafor", "schmidt"]
+COMPANY_WORDS = ["acme", "globex", "initech", "umbrella", "stark", "wayne", "wonka",
+                 "tyrell", "cyberdyne", "soylent", "hooli", "vandelay", "contoso", "fabrikam"]
+SUFFIXES = ["corp", "inc", "llc", "labs", "systems", "group", "partners"]
+DOMAINS = ["email.com", "mail.net", "example.org", "startup.io", "corp.com"]
+
+
+def synthetic_customer(rng: random.Random, i: int) -> str:
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    company = ""
+    if rng.random() < 0.4:
+        company = f"{rng.choice(COMPANY_WORDS)}{rng.randrange(1000)} {rng.choice(SUFFIXES)}"
+    email = f"{first}.{last}{i}@{rng.choice(DOMAINS)}"
+    return " ".join(filter(None, (f"{first.title()} {last.title()}", company, email)))
+
+
+def queries(rng: random.Random, count: int) -> list:
+    result = []
+    for _ in range(count):
+        kind = rng.randrange(4)
+        if kind == 0:  # Partial last name
+            result.append(rng.choice(LAST)[:4])
+        elif kind == 1:  # Full name with a typo
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+            i = rng.randrange(len(name))
+            result.append(name[:i] + name[i + 1:])
+        elif kind == 2:  # Company
+            result.append(f"{rng.choice(COMPANY_WORDS)}{rng.randrange(1000)}")
+        else:  # Email prefix
+            result.append(f"{rng.choice(FIRST)}.{rng.choice(LAST)}{rng.randrange(1000)}")
+    return result
+
+
+def main(customers: int, query_count: int) -> None:
+    rng = random.Random(42)
+    index = TrigramIndex()
+
+    start = time.perf_counter()
+    for i in range(customers):
+        index.add(f"cust_{i:08x}", synthetic_customer(rng, i))
+    build = time.perf_counter() - start
+    memory = index.memory_bytes()
+    print(f"{customers} customers indexed in {build:.1f} s")
+    print(f"index memory {memory / 2 ** 20:.0f} MiB, {memory / customers:.0f} bytes/customer\n")
+
+    latencies = []
+    for query in queries(rng, query_count):
+        start = time.perf_counter()
+        index.search(query, limit=20)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(
+        f"search  p50 {latencies[len(latencies) // 2] * 1e3:8.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    main(args.customers, args.queries)
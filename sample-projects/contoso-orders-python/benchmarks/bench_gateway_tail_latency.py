@@ -0,0 +1,113 @@
+"""
+Payment Gateway Tail Latency Benchmark
+
+Runs the fake gateway over real TCP with injected tail latency and compares
+get_payment_status latency percentiles with request hedging off and on.
+
+Every lookup uses a different payment id so the status cache never answers.
+Client and gateway share one event loop, so keep concurrency low or the
+measured latency is mostly queueing for the CPU.
+
+Usage:
+    python -m benchmarks.bench_gateway_tail_latency [--requests 2000] [--concurrency 4]
+        [--latency-ms 5] [--tail-ms 200] [--tail-probability 0.02]
+"""
+
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import time
+
+from benchmarks import quiet_logging
+from benchmarks.bench_payment_gateway import free_port, start_gateway
+from src.services.gateway_client import PaymentGatewayClient
+from src.services.payment_service import PaymentService
+from src.testing.fake_payment_gateway import FakeGatewayState, create_fake_gateway_app
+
+WARMUP_REQUESTS = 200
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+
+async def run(
+    label: str,
+    service: PaymentService,
+    state: FakeGatewayState,
+    payment_ids: list[str],
+    concurrency: int,
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(payment_id: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await service.get_payment_status(payment_id)
+            latencies.append(time.perf_counter() - start)
+
+    # Warm up the latency window so timeouts and hedge delays are adaptive
+    await asyncio.gather(*(one(f"{label}-WARMUP-{i}") for i in range(WARMUP_REQUESTS)))
+    latencies.clear()
+    requests_before = state.request_count
+
+    await asyncio.gather(*(one(payment_id) for payment_id in payment_ids))
+
+    latencies.sort()
+    extra = (state.request_count - requests_before) / len(payment_ids) - 1
+    print(
+        f"{label:<12} p50 {percentile(latencies, 0.50) * 1e3:7.2f} ms  "
+        f"p95 {percentile(latencies, 0.95) * 1e3:7.2f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1e3:7.2f} ms  "
+        f"extra gateway requests {extra:6.1%}"
+    )
+
+
+async def main(
+    requests: int,
+    concurrency: int,
+    latency_ms: float,
+    tail_ms: float,
+    tail_probability: float,
+) -> None:
+    state = FakeGatewayState(
+        latency_ms=latency_ms, tail_latency_ms=tail_ms, tail_probability=tail_probability,
+    )
+    created_at = datetime.now(timezone.utc).isoformat()
+    for label in ("no hedging", "hedging"):
+        for i in range(requests):
+            state.payments[f"{label}-{i}"] = {"status": "authorized", "created_at": created_at}
+        for i in range(WARMUP_REQUESTS):
+            state.payments[f"{label}-WARMUP-{i}"] = {"status": "authorized", "created_at": created_at}
+
+    port = free_port()
+    server, server_task = await start_gateway(port, create_fake_gateway_app(state))
+    client = PaymentGatewayClient(base_url=f"http://127.0.0.1:{port}", max_concurrency=2 * concurrency)
+    await client.start()
+
+    print(
+        f"{requests} status lookups, concurrency {concurrency}, "
+        f"{latency_ms:g} ms base + {tail_ms:g} ms tail on {tail_probability:.0%} of requests\n"
+    )
+    for label, hedge_reads in (("no hedging", False), ("hedging", True)):
+        service = PaymentService(gateway=client, hedge_reads=hedge_reads)
+        await run(label, service, state, [f"{label}-{i}" for i in range(requests)], concurrency)
+
+    await client.close()
+    server.should_exit = True
+    await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--tail-ms", type=float, default=200.0)
+    parser.add_argument("--tail-probability", type=float, default=0.02)
+    args = parser.parse_args()
+    quiet_logging()
+    asyncio.run(main(
+        args.requests, args.concurrency, args.latency_ms, args.tail_ms, args.tail_probability,
+    ))
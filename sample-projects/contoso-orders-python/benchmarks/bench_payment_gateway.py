@@ -0,0 +1,96 @@
+"""
+Payment Gateway Throughput Benchmark
+
+Runs the fake gateway over real TCP on localhost and compares PaymentService
+throughput with the shared pooled client against opening a new client (and
+connection) for every call.
+
+Usage:
+    python -m benchmarks.bench_payment_gateway [--requests 2000] [--concurrency 50]
+"""
+
+from decimal import Decimal
+import argparse
+import asyncio
+import socket
+import time
+
+import uvicorn
+
+from benchmarks import quiet_logging
+from src.services.gateway_client import PaymentGatewayClient
+from src.services.payment_service import PaymentService
+from src.testing.fake_payment_gateway import create_fake_gateway_app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_gateway(port: int, app=None) -> tuple[uvicorn.Server, asyncio.Task]:
+    """Serve a fake gateway on localhost; returns the server and its task."""
+    config = uvicorn.Config(
+        app or create_fake_gateway_app(), host="127.0.0.1", port=port, log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def run(label: str, authorize, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await authorize(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {requests / elapsed:9.0f} req/s  {elapsed / requests * 1e3:7.2f} ms/req")
+
+
+async def main(requests: int, concurrency: int) -> None:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server, server_task = await start_gateway(port)
+
+    pooled = PaymentGatewayClient(base_url=base_url, max_concurrency=concurrency)
+    await pooled.start()
+    pooled_service = PaymentService(gateway=pooled)
+
+    async def pooled_authorize(i: int) -> None:
+        await pooled_service.authorize(
+            amount=Decimal("10.00"), customer_id="bench", order_id=f"POOLED-{i}",
+        )
+
+    async def unpooled_authorize(i: int) -> None:
+        client = PaymentGatewayClient(base_url=base_url, max_concurrency=1)
+        await client.start()
+        try:
+            await PaymentService(gateway=client).authorize(
+                amount=Decimal("10.00"), customer_id="bench", order_id=f"UNPOOLED-{i}",
+            )
+        finally:
+            await client.close()
+
+    print(f"{requests} authorizations, concurrency {concurrency}\n")
+    await run("client per request", unpooled_authorize, requests, concurrency)
+    await run("shared pooled client", pooled_authorize, requests, concurrency)
+
+    await pooled.close()
+    server.should_exit = True
+    await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    quiet_logging()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,75 @@
+"""
+Service Container Benchmark
+
+Compares per-request service construction (the old get_order_service()
+behaviour) with resolving shared services from the ServiceContainer.
+
+Usage:
+    python -m benchmarks.bench_service_container [--requests 10000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import quiet_logging
+from src.container import ServiceContainer
+from src.services.customer_service import CustomerService
+from src.services.order_service import OrderService
+
+
+def per_request_construction() -> None:
+    OrderService()
+    CustomerService()
+
+
+def make_container_lookup():
+    container = ServiceContainer()
+
+    def container_lookup() -> None:
+        container.order_service
+        container.customer_service
+
+    return container_lookup
+
+
+def measure(label: str, fn, requests: int) -> None:
+    """Report time per request and bytes allocated per request."""
+    fn()  # warm up imports and caches
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(requests):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += max(peak - before, 0)
+    tracemalloc.stop()
+
+    print(
+        f"{label:<28} {elapsed / requests * 1e6:8.2f} us/request  "
+        f"{allocated / requests:8.1f} B allocated/request"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=10000)
+    args = parser.parse_args()
+    quiet_logging()
+
+    container_lookup = make_container_lookup()
+
+    print(f"Simulating {args.requests} requests\n")
+    measure("per-request construction", per_request_construction, args.requests)
+    measure("shared container", container_lookup, args.requests)
+
+
+if __name__ == "__main__":
+    main()
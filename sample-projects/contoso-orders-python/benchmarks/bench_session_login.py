@@ -0,0 +1,85 @@
+"""
+Session Login Benchmark
+
+Measures create_session latency with a large number of live sessions, and
+compares it with the previous MAX_SESSIONS_PER_USER enforcement, which
+scanned every session in the store on each login.
+
+Usage:
+    python -m benchmarks.bench_session_login [--sessions 1000000] [--logins 2000]
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import time
+
+from benchmarks import quiet_logging
+from src.legacy import auth_provider
+from src.legacy.auth_provider import Session
+
+USERS = 200_000
+FULL_SCAN_LOGINS = 5  # The old path takes ~O(sessions) per login
+
+
+def populate(sessions: int) -> None:
+    now = datetime.utcnow()
+    store = auth_provider.get_session_store()
+    for i in range(sessions):
+        session_id = f"{i:064x}"
+        store[session_id] = Session(
+            session_id=session_id,
+            user_id=f"user_{i % USERS}",
+            user_email="bench@contoso.com",
+            is_admin=False,
+            created_at=now,
+            expires_at=now + timedelta(hours=1),
+        )
+
+
+def full_scan_cleanup(user_id: str) -> None:
+    """MAX_SESSIONS_PER_USER enforcement as it was before the per-user index."""
+    user_sessions = [
+        (sid, s) for sid, s in auth_provider._SESSION_STORE.items()
+        if s.user_id == user_id
+    ]
+    user_sessions.sort(key=lambda x: x[1].created_at)
+    while len(user_sessions) >= auth_provider.MAX_SESSIONS_PER_USER:
+        old_session_id, _ = user_sessions.pop(0)
+        auth_provider.invalidate_session(old_session_id)
+
+
+def measure(label: str, logins: int) -> None:
+    latencies = []
+    for i in range(logins):
+        start = time.perf_counter()
+        auth_provider.create_session(f"user_{i % USERS}", "bench@contoso.com")
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(
+        f"{label:<20} p50 {latencies[len(latencies) // 2] * 1e3:9.3f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:9.3f} ms"
+    )
+
+
+def main(sessions: int, logins: int) -> None:
+    print(f"Populating {sessions} live sessions for {USERS} users...")
+    populate(sessions)
+    print(f"{len(auth_provider.get_session_store())} live sessions\n")
+
+    measure("per-user index", logins)
+
+    indexed_cleanup = auth_provider._cleanup_user_sessions
+    auth_provider._cleanup_user_sessions = full_scan_cleanup
+    try:
+        measure("full scan (before)", FULL_SCAN_LOGINS)
+    finally:
+        auth_provider._cleanup_user_sessions = indexed_cleanup
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--logins", type=int, default=2000)
+    args = parser.parse_args()
+    quiet_logging()
+    main(args.sessions, args.logins)
@@ -0,0 +1,87 @@
+"""
+Session Store Soak Benchmark
+
+Creates millions of short-lived sessions on a simulated clock, sweeping
+expired ones the way SessionSweeper does, and reports live sessions, heap
+entries and traced memory per round. With the sweeper, all three stay flat
+once the number of sessions created per TTL window is steady.
+
+Usage:
+    python -m benchmarks.bench_session_store [--sessions 2000000] [--per-tick 10000]
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import secrets
+import time
+import tracemalloc
+
+from benchmarks import quiet_logging
+from src.legacy.auth_provider import Session
+from src.legacy.session_store import InMemorySessionStore
+
+TTL_TICKS = 30  # Sessions live for this many sweeper ticks
+REFRESH_EVERY = 4  # Every Nth new session is also refreshed once
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def main(sessions: int, per_tick: int) -> None:
+    clock = SimulatedClock()
+    store = InMemorySessionStore(clock=clock)
+    ttl = timedelta(seconds=TTL_TICKS)
+    ticks = sessions // per_tick
+    report_every = max(1, ticks // 10)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    sweep_seconds = 0.0
+    print(f"{'created':>10} {'live':>9} {'heap':>9} {'traced MB':>10} {'sweep ms/tick':>14}")
+
+    for tick in range(1, ticks + 1):
+        now = datetime.utcnow()
+        for i in range(per_tick):
+            session_id = secrets.token_hex(32)
+            session = Session(
+                session_id=session_id,
+                user_id=f"user_{i}",
+                user_email="soak@contoso.com",
+                is_admin=False,
+                created_at=now,
+                expires_at=now + ttl,
+            )
+            store[session_id] = session
+            if i % REFRESH_EVERY == 0:
+                store[session_id] = session  # Sliding refresh leaves a stale heap entry
+
+        clock.now += 1
+        sweep_start = time.perf_counter()
+        store.sweep()
+        sweep_seconds += time.perf_counter() - sweep_start
+
+        if tick % report_every == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            print(
+                f"{tick * per_tick:>10} {len(store):>9} {store.heap_size:>9} "
+                f"{current / 1e6:>10.1f} {sweep_seconds / tick * 1e3:>14.2f}"
+            )
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n{ticks * per_tick} sessions in {elapsed:.1f}s, peak traced {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2_000_000)
+    parser.add_argument("--per-tick", type=int, default=10_000)
+    args = parser.parse_args()
+    quiet_logging()
+    main(args.sessions, args.per_tick)
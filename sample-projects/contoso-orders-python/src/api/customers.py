@@ -6,9 +6,13 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, Query, HTTPException
 import logging  # NOTE: This module uses stdlib logging (inconsistent with orders.py)
 
+from src.container import get_customer_service, get_order_service
 from src.models.customer import Customer, CustomerTier
+from src.models.order import OrderStatus
+from src.schemas.order_schemas import OrderResponse
 from src.services.customer_service import CustomerService
-from src.legacy.auth_provider import get_current_session, Session
+from src.services.order_service import OrderService
+from src.legacy.auth_provider import get_current_session, require_admin, Session
 
 logger = logging.getLogger(__name__)
 
@@ -19,27 +23,76 @@ router = APIRouter()
 async def list_customers(
     tier: Optional[str] = None,
     active_only: bool = True,
-    limit: int = Query(50, le=200),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     session: Session = Depends(get_current_session),
+    service: CustomerService = Depends(get_customer_service),
 ):
-    """List customers with filtering."""
-    service = CustomerService()
-    customers = service.get_customers(tier=tier, active_only=active_only, limit=limit)
-    return {"customers": [c.to_dict() for c in customers], "count": len(customers)}
+    """List customers with filtering, one page at a time (oldest first)."""
+    customers, next_cursor = service.get_customers_page(
+        tier=tier, active_only=active_only, limit=limit, cursor=cursor,
+    )
+    return {
+        "customers": [c.to_dict() for c in customers],
+        "count": len(customers),
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/search")
+async def search_customers(
+    q: str = Query(..., min_length=2, description="Partial name, company or email"),
+    limit: int = Query(20, ge=1, le=100),
+    active_only: bool = False,
+    session: Session = Depends(get_current_session),
+    service: CustomerService = Depends(get_customer_service),
+):
+    """Fuzzy customer search, best match first (tolerates typos)."""
+    results = service.search_customers(q, limit=limit, active_only=active_only)
+    return {
+        "customers": [{**c.to_dict(), "score": round(score, 3)} for c, score in results],
+        "count": len(results),
+    }
+
+
+@router.get("/top-spenders")
+async def list_top_spenders(
+    limit: int = Query(10, ge=1, le=1000),
+    session: Session = Depends(require_admin),
+    order_service: OrderService = Depends(get_order_service),
+):
+    """Order aggregates of the highest-spending customers (for tier reviews)."""
+    stats = await order_service.top_customers_by_spend(limit)
+    return {"customers": [s.to_dict() for s in stats], "count": len(stats)}
+
+
+@router.get("/search/stats")
+async def get_search_index_stats(
+    session: Session = Depends(require_admin),
+    service: CustomerService = Depends(get_customer_service),
+):
+    """Size of the customer search index, including memory per customer."""
+    return service.search_index_stats()
 
 
 @router.get("/{customer_id}")
 async def get_customer(
     customer_id: str,
     session: Session = Depends(get_current_session),
+    service: CustomerService = Depends(get_customer_service),
+    order_service: OrderService = Depends(get_order_service),
 ):
-    service = CustomerService()
     customer = service.get_customer_by_id(customer_id)
     
     if customer is None:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    return customer.to_dict()
+    # Order aggregates only for callers allowed to see the customer's orders
+    body = customer.to_dict()
+    stats = await order_service.get_customer_order_stats(customer_id, session)
+    if stats is not None:
+        body["order_stats"] = stats.to_dict()
+    return body
 
 
 @router.post("/")
@@ -48,15 +101,10 @@ async def create_customer(
     email: str,
     company: Optional[str] = None,
     session: Session = Depends(get_current_session),
+    service: CustomerService = Depends(get_customer_service),
 ):
     """Create a new customer."""
-    service = CustomerService()
-    
-    # Check for existing customer with same email
-    existing = service.get_customer_by_email(email)
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
+    # Uniqueness is checked atomically by the service
     customer = service.create_customer(name=name, email=email, company=company)
     logger.info(f"Created customer {customer.id}")
     
@@ -68,15 +116,15 @@ async def update_customer(
     customer_id: str,
     name: Optional[str] = None,
     email: Optional[str] = None,
-    tier: Optional[str] = None,
+    tier: Optional[CustomerTier] = None,
     session: Session = Depends(get_current_session),
+    service: CustomerService = Depends(get_customer_service),
 ):
-    service = CustomerService()
     customer = service.update_customer(
         customer_id=customer_id,
         name=name,
         email=email,
-        tier=CustomerTier(tier) if tier else None,
+        tier=tier,
     )
     
     if customer is None:
@@ -88,13 +136,23 @@ async def update_customer(
 @router.get("/{customer_id}/orders")
 async def get_customer_orders(
     customer_id: str,
-    status: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     session: Session = Depends(get_current_session),
+    order_service: OrderService = Depends(get_order_service),
 ):
-    """Get all orders for a customer."""
-    # TODO: Implement this endpoint - currently returns mock data
+    """Get a customer's orders, newest first, one page at a time."""
+    orders, next_cursor = await order_service.list_customer_orders(
+        customer_id=customer_id,
+        status=status,
+        limit=limit,
+        cursor=cursor,
+        session=session,
+    )
     return {
         "customer_id": customer_id,
-        "orders": [],
-        "message": "Not implemented yet"
+        "orders": [OrderResponse.from_domain(o) for o in orders],
+        "count": len(orders),
+        "next_cursor": next_cursor,
     }
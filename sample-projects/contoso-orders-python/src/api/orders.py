@@ -4,8 +4,8 @@ Order API Endpoints
 Handles all order-related HTTP operations.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, Path
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, Header, Query, Path, Response
 from datetime import datetime
 import structlog
 
@@ -13,8 +13,12 @@ from src.schemas.order_schemas import (
     OrderCreateRequest,
     OrderResponse,
     OrderListResponse,
+    OrderQuoteRequest,
+    OrderQuoteResponse,
     OrderUpdateRequest,
 )
+from src.container import get_order_service
+from src.etag import etag_matches
 from src.services.order_service import OrderService, BusinessException
 from src.legacy.auth_provider import get_current_session, Session
 
@@ -24,11 +28,6 @@ logger = structlog.get_logger(__name__)
 router = APIRouter()
 
 
-def get_order_service() -> OrderService:
-    """Dependency injection for OrderService."""
-    return OrderService()
-
-
 @router.post("/", response_model=OrderResponse, status_code=201)
 async def create_order(
     request: OrderCreateRequest,
@@ -50,13 +49,35 @@ async def create_order(
     order = await order_service.create_order(
         customer_id=request.customer_id,
         items=request.items,
-        shipping_address=request.shipping_address,
+        shipping_address=request.shipping_address.model_dump(),
         session=session,
     )
     
     return OrderResponse.from_domain(order)
 
 
+@router.post("/quote", response_model=OrderQuoteResponse)
+async def quote_order(
+    request: OrderQuoteRequest,
+    session: Session = Depends(get_current_session),
+    order_service: OrderService = Depends(get_order_service),
+) -> OrderQuoteResponse:
+    """
+    Price a cart without creating an order.
+    
+    Returns the same subtotal, tax, shipping and total that order creation
+    would compute. Identical carts are served from the quote cache.
+    """
+    quote = await order_service.quote_order(
+        customer_id=request.customer_id,
+        items=[item.model_dump() for item in request.items],
+        shipping_address=request.shipping_address.model_dump(),
+        session=session,
+    )
+    
+    return OrderQuoteResponse.from_domain(quote)
+
+
 @router.get("/", response_model=OrderListResponse)
 async def list_orders(
     status: Optional[str] = Query(None, description="Filter by order status"),
@@ -89,11 +110,18 @@ async def list_orders(
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
+    response: Response,
     order_id: str = Path(..., description="The order ID"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     session: Session = Depends(get_current_session),
     order_service: OrderService = Depends(get_order_service),
-) -> OrderResponse:
-    """Get a single order by ID."""
+) -> Union[OrderResponse, Response]:
+    """
+    Get a single order by ID.
+    
+    Supports conditional GET: if If-None-Match matches the order's ETag,
+    returns 304 without building the response body.
+    """
     order = await order_service.get_order(order_id, session)
     
     if order is None:
@@ -103,6 +131,10 @@ async def get_order(
             http_status=404,
         )
     
+    if etag_matches(if_none_match, order.etag):
+        return Response(status_code=304, headers={"ETag": order.etag})
+    
+    response.headers["ETag"] = order.etag
     return OrderResponse.from_domain(order)
 
 
@@ -110,21 +142,27 @@ async def get_order(
 async def update_order(
     order_id: str,
     request: OrderUpdateRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None, alias="If-Match"),
     session: Session = Depends(get_current_session),
     order_service: OrderService = Depends(get_order_service),
 ) -> OrderResponse:
     """
     Update an existing order.
     
-    Only pending orders can be modified.
+    Only pending orders can be modified. Send If-Match with the ETag from
+    a previous GET to avoid overwriting a concurrent change (412 on mismatch).
     """
-    order = await order_service.update_order(order_id, request, session)
+    order = await order_service.update_order(order_id, request, session, if_match=if_match)
+    response.headers["ETag"] = order.etag
     return OrderResponse.from_domain(order)
 
 
 @router.post("/{order_id}/cancel", response_model=OrderResponse)
 async def cancel_order(
     order_id: str,
+    response: Response,
+    if_match: Optional[str] = Header(None, alias="If-Match"),
     session: Session = Depends(get_current_session),
     order_service: OrderService = Depends(get_order_service),
 ) -> OrderResponse:
@@ -133,6 +171,8 @@ async def cancel_order(
     
     Only pending or confirmed orders can be cancelled.
     Shipped orders require contacting support.
+    Supports If-Match like PATCH.
     """
-    order = await order_service.cancel_order(order_id, session)
+    order = await order_service.cancel_order(order_id, session, if_match=if_match)
+    response.headers["ETag"] = order.etag
     return OrderResponse.from_domain(order)
@@ -5,11 +5,15 @@ Provides product catalog access for order creation.
 """
 
 from typing import Optional, List
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Header, Query, HTTPException, Response
 from pydantic import BaseModel
 from decimal import Decimal
+import dataclasses
+import hashlib
 
+from src.etag import etag_matches, format_etag
 from src.models.product import Product, ProductCategory
+from src.services.order_service import invalidate_quote_cache
 
 
 router = APIRouter()
@@ -83,20 +87,62 @@ PRODUCT_CATALOG = [
 ]
 
 
+def _hash_catalog() -> str:
+    """Short content hash of PRODUCT_CATALOG (every field of every product)."""
+    contents = repr([dataclasses.astuple(product) for product in PRODUCT_CATALOG])
+    return hashlib.sha256(contents.encode()).hexdigest()[:16]
+
+
+# Catalog version for list ETags, computed once so requests need no scan.
+# A content hash rather than a counter: a deploy that changes the catalog
+# changes every ETag, while restarts and other workers agree on it.
+_CATALOG_VERSION = _hash_catalog()
+
+
+def bump_catalog_generation() -> str:
+    """
+    Record a catalog change.
+    
+    Must be called after any runtime mutation of PRODUCT_CATALOG (changes
+    shipped in a deploy are picked up at import). Re-hashes the catalog,
+    which invalidates product list ETags, and drops cached order quotes.
+    """
+    global _CATALOG_VERSION
+    _CATALOG_VERSION = _hash_catalog()
+    invalidate_quote_cache()
+    return _CATALOG_VERSION
+
+
+def _catalog_etag(*query: object) -> str:
+    """ETag for a product listing: catalog version plus the query parameters."""
+    query_hash = hashlib.sha256(repr(query).encode()).hexdigest()[:16]
+    return format_etag("catalog", _CATALOG_VERSION, query_hash)
+
+
 @router.get("/", response_model=ProductListResponse)
 def list_products(
+    response: Response,
     category: Optional[str] = Query(None, description="Filter by category"),
     in_stock_only: bool = Query(False, description="Show only in-stock items"),
     search: Optional[str] = Query(None, description="Search in name/description"),
     min_price: Optional[Decimal] = None,
     max_price: Optional[Decimal] = None,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
 ):
     """
     List available products.
     
     NOTE: This endpoint is public (no auth required) as product
     catalog is not sensitive data.
+    
+    Supports conditional GET: if If-None-Match matches the current catalog
+    ETag, returns 304 without filtering or serializing the catalog.
     """
+    etag = _catalog_etag(category, in_stock_only, search, min_price, max_price)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     results = PRODUCT_CATALOG.copy()
     
     if category:
@@ -0,0 +1,50 @@
+"""
+Internal Session API Endpoints
+
+Bulk session validation for the batch processing system (BatchProcessor).
+Admin sessions only.
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from src.config import settings
+from src.legacy.auth_provider import Session, require_admin, validate_sessions
+
+
+router = APIRouter()
+
+
+class ValidateSessionsRequest(BaseModel):
+    tokens: List[str] = Field(..., max_length=settings.SESSION_VALIDATE_MAX_TOKENS)
+
+
+class SessionUserInfo(BaseModel):
+    user_id: str
+    email: str
+    is_admin: bool
+
+
+class ValidateSessionsResponse(BaseModel):
+    # One entry per requested token, in order; null if the token is not valid
+    results: List[Optional[SessionUserInfo]]
+    valid: int
+
+
+@router.post("/validate", response_model=ValidateSessionsResponse)
+def validate_session_tokens(
+    request: ValidateSessionsRequest,
+    session: Session = Depends(require_admin),
+):
+    """
+    Validate up to SESSION_VALIDATE_MAX_TOKENS session tokens in one call.
+
+    Results are positional so tokens are never echoed back. Sessions are
+    not refreshed.
+    """
+    results = validate_sessions(request.tokens)
+    return ValidateSessionsResponse(
+        results=results,
+        valid=sum(result is not None for result in results),
+    )
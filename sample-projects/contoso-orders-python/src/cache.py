@@ -0,0 +1,186 @@
+"""
+In-Process Caching
+
+Small, dependency-free caches shared by the service layer.
+
+Team Convention: Caches hold derived data only. The repository is always
+the source of truth, so a cache may be cleared at any time.
+"""
+
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+import asyncio
+import threading
+import time
+
+from src.metrics import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache with a per-entry time-to-live.
+
+    Entries expire ``ttl_seconds`` after they were written. When the cache is
+    full, the least recently used entry is evicted. Expiry uses the monotonic
+    clock so wall-clock adjustments never resurrect stale entries.
+
+    Thread-safe: sync FastAPI endpoints run in a worker thread pool.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> bool:
+        """Remove a single entry. Returns True if it was present."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all entries (hit/miss counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark a failed load retrieved, so an error nobody awaited is not logged."""
+    if not task.cancelled():
+        task.exception()
+
+
+class _Flight:
+    """One in-progress load shared by every caller asking for the same key."""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.invalidated = False
+
+
+class CoalescingCache(Generic[K, V]):
+    """
+    Async read-through cache with request coalescing (single-flight).
+
+    - Fresh entries are served from a TTLCache
+    - On a miss, concurrent callers for the same key share one loader call,
+      run in its own task so no caller's cancellation (the one that started
+      it included) cancels it for the others
+    - invalidate() drops the entry and stops an in-flight load from caching
+      its (possibly stale) result; callers after the invalidation start a
+      fresh load
+
+    Must be used from a single event loop.
+
+    If metric_name is given, lookups are counted in ``<metric_name>_total``
+    by result (hit / miss / coalesced) and the hit rate is exported as the
+    ``<metric_name>_hit_rate`` gauge.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, metric_name: Optional[str] = None):
+        self._cache: TTLCache[K, V] = TTLCache(max_entries, ttl_seconds)
+        self._flights: Dict[K, _Flight] = {}
+        self.coalesced = 0
+        self.metric_name = metric_name
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        """Return the cached value for key, loading it at most once concurrently."""
+        value = self._cache.get(key)
+        if value is not None:
+            self._record("hit")
+            return value
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            self._record("coalesced")
+        else:
+            self._record("miss")
+            flight = _Flight()
+            flight.task = asyncio.create_task(self._load(key, flight, loader))
+            flight.task.add_done_callback(_retrieve_exception)
+            self._flights[key] = flight
+        # Shielded: a cancelled caller stops waiting, the load carries on
+        return await asyncio.shield(flight.task)
+
+    async def _load(self, key: K, flight: _Flight, loader: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await loader()
+            if not flight.invalidated:
+                self._cache.set(key, value)
+            return value
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def _record(self, result: str) -> None:
+        if self.metric_name is not None:
+            metrics.inc(f"{self.metric_name}_total", result=result)
+            metrics.set_gauge(f"{self.metric_name}_hit_rate", self.hit_rate)
+
+    def invalidate(self, key: K) -> None:
+        """Forget the cached value and any load already in progress."""
+        self._cache.invalidate(key)
+        flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight.invalidated = True
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """Lookups not answered from the cache (including coalesced ones)."""
+        return self._cache.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without a new loader call."""
+        lookups = self.hits + self.misses
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -30,15 +30,73 @@ class Settings(BaseSettings):
     # NOTE: Do not change these without Security Team approval
     AUTH_SERVICE_URL: str = "http://auth.internal.contoso.com"
     SESSION_TIMEOUT_MINUTES: int = 30
+    SESSION_SWEEP_INTERVAL_SECONDS: float = 5.0
+    SESSION_SWEEP_MAX_PER_TICK: int = 10000
+    SESSION_BACKEND: str = "memory"  # "memory" (single process) or "redis" (shared)
+    SESSION_REDIS_URL: str = "redis://localhost:6379/0"
+    SESSION_REDIS_POOL_SIZE: int = 10
+    SESSION_REDIS_TIMEOUT_SECONDS: float = 0.5
+    SESSION_L1_ENABLED: bool = True  # Per-worker cache in front of Redis
+    SESSION_L1_MAX_ENTRIES: int = 10000
+    SESSION_L1_TTL_SECONDS: float = 5.0  # Upper bound on revocation delay
+    SESSION_MISS_CACHE_MAX_ENTRIES: int = 50000  # Recent unknown IDs, per worker
+    SESSION_MISS_CACHE_TTL_SECONDS: float = 30.0
+    SESSION_VALIDATE_MAX_TOKENS: int = 10000  # Per validate_sessions() call
     
     # External Services
     PAYMENT_GATEWAY_URL: str = "https://payments.contoso.com/api"
     PAYMENT_GATEWAY_TIMEOUT: int = 30
+    PAYMENT_GATEWAY_ENABLED: bool = False  # False = simulate gateway calls locally
+    PAYMENT_GATEWAY_MAX_CONNECTIONS: int = 100
+    PAYMENT_GATEWAY_MAX_KEEPALIVE: int = 20
+    PAYMENT_GATEWAY_MAX_CONCURRENCY: int = 50
+    
+    # Payment Gateway Adaptive Timeouts and Hedging
+    PAYMENT_LATENCY_WINDOW: int = 1000  # Samples kept per operation
+    PAYMENT_LATENCY_MIN_SAMPLES: int = 50  # Use PAYMENT_GATEWAY_TIMEOUT until then
+    PAYMENT_TIMEOUT_P99_MULTIPLIER: float = 3.0
+    PAYMENT_TIMEOUT_MIN_SECONDS: float = 0.5
+    PAYMENT_HEDGING_ENABLED: bool = True  # Idempotent reads only
+    
+    # Payment Gateway Retry Budget (process-wide)
+    PAYMENT_RETRY_BUDGET_RATIO: float = 0.1  # Retries per request...
+    PAYMENT_RETRY_BUDGET_MIN_PER_SECOND: float = 1.0  # ...plus this floor...
+    PAYMENT_RETRY_BUDGET_WINDOW_SECONDS: float = 10.0  # ...over this window
+    
+    # Payment Gateway Circuit Breaker
+    PAYMENT_BREAKER_FAILURE_RATE: float = 0.5  # Open at >= 50% failures...
+    PAYMENT_BREAKER_MIN_CALLS: int = 10  # ...over at least this many calls...
+    PAYMENT_BREAKER_WINDOW_SECONDS: float = 30.0  # ...in this rolling window
+    PAYMENT_BREAKER_OPEN_SECONDS: float = 15.0
+    PAYMENT_BREAKER_HALF_OPEN_CALLS: int = 3
+    
+    # Payment Authorization Batching (requires PAYMENT_GATEWAY_ENABLED)
+    PAYMENT_BATCH_ENABLED: bool = False
+    PAYMENT_BATCH_MAX_SIZE: int = 50
+    PAYMENT_BATCH_MAX_DELAY_MS: float = 5.0
+    
+    # Payment Status Cache
+    PAYMENT_STATUS_CACHE_TTL_SECONDS: float = 2.0
+    PAYMENT_STATUS_CACHE_MAX_ENTRIES: int = 10000
     
     # Feature Flags
     ENABLE_NEW_PRICING_ENGINE: bool = False  # TODO: Enable after Q2 rollout
     ENABLE_ASYNC_ORDER_PROCESSING: bool = True
     
+    # Payment Outbox
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 0.2
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_BACKOFF_SECONDS: float = 1.0
+    OUTBOX_DEAD_LETTER_MAX_ENTRIES: int = 10000
+    
+    # Order Quotes
+    QUOTE_CACHE_MAX_ENTRIES: int = 10000
+    QUOTE_CACHE_TTL_SECONDS: int = 300
+    
+    # Request Deadlines
+    REQUEST_TIMEOUT_SECONDS: float = 10.0  # Also caps the X-Request-Timeout header
+    
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW_SECONDS: int = 60
@@ -0,0 +1,133 @@
+"""
+Service Container
+
+Application-scoped dependency container.
+
+One container is created per application in create_app() and lives for the
+lifetime of the process. Services that hold connection pools, caches or HTTP
+clients must be obtained from here so that state is reused across requests.
+
+Team Convention: Routes get services through the FastAPI dependencies at the
+bottom of this module, never by constructing them inline.
+"""
+
+from fastapi import Request
+import structlog
+
+from src.config import settings
+from src.legacy.auth_provider import get_session_store
+from src.legacy.session_store import InMemorySessionStore, SessionSweeper
+from src.repositories.order_repo import OrderRepository
+from src.repositories.outbox_repo import OutboxRepository
+from src.services.customer_service import CustomerService
+from src.services.order_service import OrderService
+from src.services.circuit_breaker import CircuitBreaker
+from src.services.gateway_client import PaymentGatewayClient
+from src.services.outbox_dispatcher import OutboxDispatcher
+from src.services.payment_service import PaymentService
+from src.services.retry_policy import RetryBudget
+
+logger = structlog.get_logger(__name__)
+
+
+class ServiceContainer:
+    """
+    Holds the shared service singletons for one application instance.
+
+    Lifecycle:
+    - __init__: cheap wiring only, no I/O
+    - startup(): warm up resources before the first request is served
+    - shutdown(): release resources in reverse dependency order
+    """
+
+    def __init__(self):
+        self.order_repository = OrderRepository()
+        self.outbox_repository = OutboxRepository()
+        self.gateway_client = (
+            PaymentGatewayClient() if settings.PAYMENT_GATEWAY_ENABLED else None
+        )
+        self.payment_breaker = CircuitBreaker("payment_gateway")
+        self.payment_retry_budget = RetryBudget("payment_gateway")
+        self.payment_service = PaymentService(
+            gateway=self.gateway_client,
+            breaker=self.payment_breaker,
+            retry_budget=self.payment_retry_budget,
+        )
+        self.customer_service = CustomerService()
+        self.order_service = OrderService(
+            repository=self.order_repository,
+            payment_service=self.payment_service,
+            customer_service=self.customer_service,
+        )
+        self.outbox_dispatcher = OutboxDispatcher(
+            outbox_repository=self.outbox_repository,
+            order_repository=self.order_repository,
+            payment_service=self.payment_service,
+        )
+        self.session_store = get_session_store()
+        # Redis expires sessions itself; only the in-memory store needs sweeping
+        self.session_sweeper = (
+            SessionSweeper(self.session_store)
+            if isinstance(self.session_store, InMemorySessionStore)
+            else None
+        )
+        self.started = False
+
+    async def startup(self) -> None:
+        """Warm up shared resources."""
+        if self.started:
+            return
+
+        # Touch the store once so first-request latency does not include
+        # lazy initialization.
+        order_count = self.order_repository.count()
+
+        if self.gateway_client is not None:
+            await self.gateway_client.start()
+        await self.outbox_dispatcher.start()
+        self.session_store.start()
+        if self.session_sweeper is not None:
+            await self.session_sweeper.start()
+
+        self.started = True
+        logger.info("service_container_started", orders=order_count)
+
+    async def shutdown(self) -> None:
+        """Release shared resources (dependents first)."""
+        if not self.started:
+            return
+
+        if self.session_sweeper is not None:
+            await self.session_sweeper.stop()
+        await self.outbox_dispatcher.stop()
+        await self.payment_service.close()
+        if self.gateway_client is not None:
+            await self.gateway_client.close()
+        self.session_store.close()
+
+        self.started = False
+        logger.info("service_container_stopped")
+
+
+# =============================================================================
+# FASTAPI DEPENDENCIES
+# =============================================================================
+
+def get_container(request: Request) -> ServiceContainer:
+    """Return the container owned by the running application."""
+    return request.app.state.container
+
+
+def get_order_service(request: Request) -> OrderService:
+    """Shared OrderService for the current application."""
+    return get_container(request).order_service
+
+
+def get_customer_service(request: Request) -> CustomerService:
+    """Shared CustomerService for the current application."""
+    return get_container(request).customer_service
+
+
+def get_payment_service(request: Request) -> PaymentService:
+    """Shared PaymentService for the current application."""
+    return get_container(request).payment_service
@@ -0,0 +1,73 @@
+"""
+Request Deadlines
+
+Every API request runs under a deadline set by middleware in create_app().
+The deadline lives in a context variable, so it follows the request through
+OrderService into PaymentService (and into tasks those services spawn)
+without being passed explicitly.
+
+Background work (outbox dispatcher, authorization batches) runs without a
+deadline, or with one of its own.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import time
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time before the work could be attempted."""
+    pass
+
+
+class Deadline:
+    """A point in time (monotonic clock) by which the work must be done."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left; negative once expired."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_CURRENT_DEADLINE: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the running request, if any."""
+    return _CURRENT_DEADLINE.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left until the current deadline, or None without a deadline."""
+    deadline = _CURRENT_DEADLINE.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Run a block under a deadline ``seconds`` from now.
+
+    A nested scope can only shorten the enclosing deadline, never extend it.
+    ``seconds=None`` detaches the block from any deadline, for work that must
+    outlive the request that started it.
+    """
+    if seconds is None:
+        deadline = None
+    else:
+        deadline = Deadline(seconds)
+        outer = _CURRENT_DEADLINE.get()
+        if outer is not None and outer.expires_at < deadline.expires_at:
+            deadline = outer
+    token = _CURRENT_DEADLINE.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT_DEADLINE.reset(token)
@@ -0,0 +1,43 @@
+"""
+Entity Tags
+
+Helpers for HTTP conditional requests (ETag, If-None-Match, If-Match).
+
+ETags are strong validators built from a resource version, so they can be
+computed without serializing the response body.
+"""
+
+from typing import Optional
+
+
+def format_etag(*parts: object) -> str:
+    """Build a quoted strong ETag from version components."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(header_value: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    Check an If-None-Match / If-Match header value against an ETag.
+    
+    Handles comma-separated lists and the "*" wildcard. A missing header
+    never matches.
+    
+    weak=True is the weak comparison If-None-Match uses: W/ validators match
+    their strong counterpart. Pass weak=False for If-Match, which requires
+    strong comparison (RFC 9110 13.1.1): a weak validator never satisfies a
+    precondition on a write.
+    """
+    if not header_value:
+        return False
+    
+    for candidate in header_value.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,32 @@
+"""
+Application Exceptions
+
+Shared by every service, so services that depend on each other can raise
+them without importing one another.
+"""
+
+from typing import Optional
+
+
+class BusinessException(Exception):
+    """
+    Standard business exception for the application.
+    
+    Company Standard: ALL business logic exceptions MUST use this class.
+    Never raise raw exceptions from service layer.
+    
+    Error codes should be SCREAMING_SNAKE_CASE and documented in docs/error-codes.md
+    """
+    
+    def __init__(
+        self,
+        error_code: str,
+        message: str,
+        http_status: int = 400,
+        details: Optional[dict] = None,
+    ):
+        self.error_code = error_code
+        self.message = message
+        self.http_status = http_status
+        self.details = details or {}
+        super().__init__(message)
@@ -12,6 +12,12 @@ HISTORY:
 - 2019-Q2: Initial implementation (ticket SEC-1234)
 - 2021-Q1: Added session caching (ticket SEC-2456)
 - 2023-Q3: Security audit passed (report #SA-2023-089)
+- 2026-Q4: Expiry-ordered session store with background sweeper (session_store.py)
+- 2026-Q4: Fused validate-and-refresh in get_current_session (touch_session)
+- 2026-Q4: Pluggable session backends, Redis shared by all workers (SESSION_BACKEND)
+- 2026-Q4: Per-worker L1 session cache with invalidation broadcast (session_cache.py)
+- 2026-Q4: Negative-lookup filter for malformed and unknown IDs (session_filter.py)
+- 2026-Q4: Bulk validate_sessions() for BatchProcessor, replacing per-token calls
 
 CONTACTS:
 - Security Team: security@contoso.com
@@ -29,11 +35,17 @@ All API endpoints MUST use get_current_session() for authentication.
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, List, Optional
 import hashlib
 import secrets
 import logging
 
+from src.config import settings
+from src.legacy.session_cache import CachedSessionStore
+from src.legacy.session_filter import FilteredSessionStore
+from src.legacy.session_store import InMemorySessionStore, SessionStore
+from src.resp_client import RespClient
+
 # NOTE: This legacy module uses stdlib logging, not structlog
 logger = logging.getLogger(__name__)
 
@@ -47,6 +59,11 @@ SESSION_TIMEOUT_MINUTES = 30
 SESSION_TOKEN_LENGTH = 64
 MAX_SESSIONS_PER_USER = 5
 
+# Sliding expiration is written at most once per interval. A session still
+# expires at most SESSION_TIMEOUT_MINUTES after its last refresh, i.e. the
+# idle timeout can be up to this much shorter, never longer.
+SESSION_REFRESH_INTERVAL_SECONDS = 60
+
 
 # =============================================================================
 # SESSION DATA STRUCTURES
@@ -82,29 +99,54 @@ class Session:
 
 # =============================================================================
 # SESSION STORE
-# In production, this is backed by Redis. Here we use in-memory for demo.
+# In production, this is backed by Redis (SESSION_BACKEND=redis) so that all
+# workers share sessions. The default in-memory store is for development;
+# its expired sessions are evicted by the SessionSweeper started with the
+# application (see src/container.py).
 # =============================================================================
 
-_SESSION_STORE: dict[str, Session] = {}
-
-# Pre-populate with test sessions for development
-_SESSION_STORE["dev_session_001"] = Session(
-    session_id="dev_session_001",
-    user_id="cust_001",
-    user_email="orders@acme.com",
-    is_admin=False,
-    created_at=datetime.utcnow(),
-    expires_at=datetime.utcnow() + timedelta(hours=24),
-)
-
-_SESSION_STORE["admin_session_001"] = Session(
-    session_id="admin_session_001",
-    user_id="admin_001",
-    user_email="admin@contoso.com",
-    is_admin=True,
-    created_at=datetime.utcnow(),
-    expires_at=datetime.utcnow() + timedelta(hours=24),
-)
+def _create_session_store() -> SessionStore:
+    if settings.SESSION_BACKEND == "redis":
+        # Imported here: the Redis store needs the Session class defined above
+        from src.legacy.redis_session_store import RedisInvalidationBus, RedisSessionStore
+        client = RespClient.from_url(
+            settings.SESSION_REDIS_URL,
+            pool_size=settings.SESSION_REDIS_POOL_SIZE,
+            timeout=settings.SESSION_REDIS_TIMEOUT_SECONDS,
+        )
+        store: SessionStore = RedisSessionStore(client)
+        if settings.SESSION_L1_ENABLED:
+            # Per-worker cache; revocations are broadcast to all workers
+            store = CachedSessionStore(store, bus=RedisInvalidationBus(client))
+        # Reject junk tokens without a round trip (see session_filter.py for
+        # why this is never applied to the in-memory store)
+        return FilteredSessionStore(store, token_length=SESSION_TOKEN_LENGTH)
+    if settings.SESSION_BACKEND != "memory":
+        raise ValueError(f"Unknown SESSION_BACKEND: {settings.SESSION_BACKEND!r}")
+    return InMemorySessionStore()
+
+
+_SESSION_STORE = _create_session_store()
+
+# Pre-populate with test sessions for development (never in a shared store)
+if isinstance(_SESSION_STORE, InMemorySessionStore):
+    _SESSION_STORE.save(Session(
+        session_id="dev_session_001",
+        user_id="cust_001",
+        user_email="orders@acme.com",
+        is_admin=False,
+        created_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(hours=24),
+    ))
+    
+    _SESSION_STORE.save(Session(
+        session_id="admin_session_001",
+        user_id="admin_001",
+        user_email="admin@contoso.com",
+        is_admin=True,
+        created_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(hours=24),
+    ))
 
 
 # =============================================================================
@@ -141,7 +183,7 @@ def create_session(
     # Enforce max sessions per user
     _cleanup_user_sessions(user_id)
     
-    _SESSION_STORE[session_id] = session
+    _SESSION_STORE.save(session)
     logger.info(f"Session created for user {user_id}")
     
     return session
@@ -153,17 +195,8 @@ def get_session(session_id: str) -> Optional[Session]:
     
     Returns None if session doesn't exist or is expired.
     """
-    session = _SESSION_STORE.get(session_id)
-    
-    if session is None:
-        return None
-    
-    if session.is_expired:
-        # Clean up expired session
-        invalidate_session(session_id)
-        return None
-    
-    return session
+    # The store checks expiry on the monotonic clock and drops expired entries
+    return _SESSION_STORE.get(session_id)
 
 
 def invalidate_session(session_id: str) -> bool:
@@ -172,8 +205,7 @@ def invalidate_session(session_id: str) -> bool:
     
     Returns True if session was invalidated, False if not found.
     """
-    if session_id in _SESSION_STORE:
-        del _SESSION_STORE[session_id]
+    if _SESSION_STORE.delete(session_id):
         logger.info(f"Session invalidated: {session_id[:8]}...")
         return True
     return False
@@ -191,17 +223,37 @@ def refresh_session(session_id: str) -> Optional[Session]:
         return None
     
     session.expires_at = datetime.utcnow() + timedelta(minutes=SESSION_TIMEOUT_MINUTES)
-    _SESSION_STORE[session_id] = session
+    _SESSION_STORE.save(session)
     
     return session
 
 
+def get_session_store() -> SessionStore:
+    """The process-wide session store (for lifecycle management)."""
+    return _SESSION_STORE
+
+
+def touch_session(session_id: str) -> Optional[Session]:
+    """
+    Validate a session and keep it alive, in a single store operation.
+    
+    Equivalent to get_session() followed by refresh_session(), except that the
+    new expiry is only written once per SESSION_REFRESH_INTERVAL_SECONDS.
+    """
+    return _SESSION_STORE.touch(
+        session_id,
+        ttl_seconds=SESSION_TIMEOUT_MINUTES * 60,
+        refresh_after_seconds=SESSION_REFRESH_INTERVAL_SECONDS,
+    )
+
+
 # =============================================================================
 # FASTAPI DEPENDENCY
 # All authenticated endpoints MUST use this dependency
 # =============================================================================
 
 from fastapi import Header, HTTPException, Depends
+from starlette.concurrency import run_in_threadpool
 
 
 async def get_current_session(
@@ -235,7 +287,12 @@ async def get_current_session(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    session = get_session(session_id)
+    # Validate and refresh (sliding expiration) in one store operation;
+    # a remote store call must not block the event loop
+    if _SESSION_STORE.is_remote:
+        session = await run_in_threadpool(touch_session, session_id)
+    else:
+        session = touch_session(session_id)
     
     if session is None:
         raise HTTPException(
@@ -244,9 +301,6 @@ async def get_current_session(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Refresh session on each request
-    refresh_session(session_id)
-    
     return session
 
 
@@ -284,19 +338,14 @@ def _cleanup_user_sessions(user_id: str) -> None:
     
     Enforces MAX_SESSIONS_PER_USER limit.
     """
-    user_sessions = [
-        (sid, s) for sid, s in _SESSION_STORE.items() 
-        if s.user_id == user_id
-    ]
+    # Per-user index, oldest first: O(sessions of this user), not O(all sessions)
+    user_sessions = _SESSION_STORE.session_ids_for_user(user_id)
     
-    # Sort by creation time (oldest first)
-    user_sessions.sort(key=lambda x: x[1].created_at)
-    
-    # Remove oldest sessions if over limit
-    while len(user_sessions) >= MAX_SESSIONS_PER_USER:
-        old_session_id, _ = user_sessions.pop(0)
-        invalidate_session(old_session_id)
-        logger.info(f"Removed old session for user {user_id}")
+    # Remove oldest sessions if over limit, in one batched store call
+    excess = len(user_sessions) - MAX_SESSIONS_PER_USER + 1
+    if excess > 0:
+        removed = _SESSION_STORE.delete_many(user_sessions[:excess])
+        logger.info(f"Removed {removed} old sessions for user {user_id}")
 
 
 def _hash_session_id(session_id: str) -> str:
@@ -308,6 +357,40 @@ def _hash_session_id(session_id: str) -> str:
     return hashlib.sha256(session_id.encode()).hexdigest()[:16]
 
 
+# =============================================================================
+# BATCH VALIDATION
+# Supported replacement for per-token validate_session_token() calls
+# =============================================================================
+
+def validate_sessions(tokens: Iterable[str]) -> List[Optional[dict]]:
+    """
+    Validate many session tokens at once.
+    
+    Returns one entry per token, in order: the user info dict (as returned by
+    get_user_from_session) for a live session, or None. Sessions are not
+    refreshed. With the Redis backend this is a single pipelined lookup.
+    """
+    tokens = list(tokens)
+    unique = list(dict.fromkeys(tokens))
+    sessions = dict(zip(unique, _SESSION_STORE.get_many(unique)))
+    results = [_user_info(sessions[token]) for token in tokens]
+    logger.info(
+        f"Validated {len(tokens)} session tokens in batch "
+        f"({sum(r is not None for r in results)} valid)"
+    )
+    return results
+
+
+def _user_info(session: Optional[Session]) -> Optional[dict]:
+    if session is None:
+        return None
+    return {
+        "user_id": session.user_id,
+        "email": session.user_email,
+        "is_admin": session.is_admin,
+    }
+
+
 # =============================================================================
 # LEGACY COMPATIBILITY FUNCTIONS
 # These exist for backward compatibility with older services
@@ -319,7 +402,8 @@ def validate_session_token(token: str) -> bool:
     DEPRECATED: Use get_session() instead.
     
     This function exists for backward compatibility with the legacy
-    batch processing system (BatchProcessor v1.x).
+    batch processing system (BatchProcessor v1.x). Batches should use
+    validate_sessions().
     
     Scheduled for removal: 2026-Q2
     """
@@ -338,11 +422,4 @@ def get_user_from_session(token: str) -> Optional[dict]:
     Scheduled for removal: 2026-Q2
     """
     logger.warning("DEPRECATED: get_user_from_session() called")
-    session = get_session(token)
-    if session is None:
-        return None
-    return {
-        "user_id": session.user_id,
-        "email": session.user_email,
-        "is_admin": session.is_admin,
-    }
+    return _user_info(get_session(token))
@@ -0,0 +1,253 @@
+"""
+==============================================================================
+LEGACY REDIS SESSION STORE
+==============================================================================
+
+Redis-backed SessionStore, shared by every API worker (SEC-1234).
+
+Layout:
+- ``session:<id>``        JSON session (without expires_at), with PX expiry
+- ``user_sessions:<uid>`` sorted set of session IDs scored by created_at
+
+Expiry is Redis's own key expiry; expires_at is rebuilt from PTTL on read, so
+sliding the expiry is a single PEXPIRE. User index entries are not removed
+when a session expires or is deleted; session_ids_for_user() prunes them
+lazily.
+
+Every operation is one pipelined round trip (including get_many() for any
+number of sessions), except touch() when the session
+is due for a refresh (two) and session_ids_for_user() when it has stale
+entries to prune (three).
+
+RedisInvalidationBus broadcasts revoked session IDs over pub/sub
+(``session_invalidations``) to the L1 caches of every worker.
+==============================================================================
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, List, Optional
+import json
+import logging
+import threading
+
+from src.legacy.auth_provider import Session
+from src.legacy.session_cache import InvalidationBus
+from src.legacy.session_store import SessionStore
+from src.resp_client import RespClient, Subscription
+
+# NOTE: This legacy module uses stdlib logging, not structlog
+logger = logging.getLogger(__name__)
+
+SESSION_PREFIX = "session:"
+USER_INDEX_PREFIX = "user_sessions:"
+INVALIDATION_CHANNEL = "session_invalidations"
+
+
+class RedisSessionStore(SessionStore):
+    """SessionStore over a pooled, pipelining RESP client."""
+
+    is_remote = True
+
+    def __init__(self, client: RespClient, index_ttl_seconds: float = 24 * 3600):
+        self.client = client
+        # A user index outlives the sessions in it by at least this long, so
+        # shorter-lived sessions saved later never expire it early
+        self.index_ttl_ms = int(index_ttl_seconds * 1000)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        data, ttl_ms = self.client.pipeline([
+            ("GET", _session_key(session_id)),
+            ("PTTL", _session_key(session_id)),
+        ])
+        return _decode(data, ttl_ms)
+
+    def get_many(self, session_ids: List[str]) -> List[Optional[Session]]:
+        if not session_ids:
+            return []
+        keys = [_session_key(session_id) for session_id in session_ids]
+        replies = self.client.pipeline(
+            [("MGET", *keys)] + [("PTTL", key) for key in keys]
+        )
+        return [_decode(data, ttl_ms) for data, ttl_ms in zip(replies[0], replies[1:])]
+
+    def save(self, session: Session) -> None:
+        ttl_ms = int((session.expires_at - datetime.utcnow()).total_seconds() * 1000)
+        if ttl_ms <= 0:
+            self.delete(session.session_id)
+            return
+        index_key = _user_index_key(session.user_id)
+        self.client.pipeline([
+            ("SET", _session_key(session.session_id), _encode(session), "PX", ttl_ms),
+            ("ZADD", index_key, _timestamp(session.created_at), session.session_id),
+            ("PEXPIRE", index_key, max(ttl_ms, self.index_ttl_ms)),
+        ])
+
+    def touch(
+        self,
+        session_id: str,
+        ttl_seconds: float,
+        refresh_after_seconds: float,
+    ) -> Optional[Session]:
+        session = self.get(session_id)
+        if session is None:
+            return None
+        remaining = (session.expires_at - datetime.utcnow()).total_seconds()
+        if remaining > ttl_seconds - refresh_after_seconds:
+            return session
+
+        ttl_ms = int(ttl_seconds * 1000)
+        index_key = _user_index_key(session.user_id)
+        refreshed, _ = self.client.pipeline([
+            ("PEXPIRE", _session_key(session_id), ttl_ms),
+            ("PEXPIRE", index_key, max(ttl_ms, self.index_ttl_ms)),
+        ])
+        if not refreshed:
+            return None  # Expired or deleted since the read
+        session.expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self.client.execute("DEL", _session_key(session_id)) > 0
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        keys = [_session_key(session_id) for session_id in session_ids]
+        if not keys:
+            return 0
+        return self.client.execute("DEL", *keys)
+
+    def session_ids_for_user(self, user_id: str) -> List[str]:
+        index_key = _user_index_key(user_id)
+        members = self.client.execute("ZRANGE", index_key, 0, -1)
+        if not members:
+            return []
+        exists = self.client.pipeline([
+            ("EXISTS", _session_key(member.decode())) for member in members
+        ])
+        live = [member.decode() for member, found in zip(members, exists) if found]
+        stale = [member for member, found in zip(members, exists) if not found]
+        if stale:
+            self.client.execute("ZREM", index_key, *stale)
+        return live
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """
+    Pub/sub invalidation broadcast.
+
+    A daemon thread holds the subscription. If it drops, the thread
+    resubscribes and calls on_reset, since broadcasts may have been missed.
+    """
+
+    def __init__(
+        self,
+        client: RespClient,
+        channel: str = INVALIDATION_CHANNEL,
+        reconnect_delay_seconds: float = 1.0,
+    ):
+        self.client = client
+        self.channel = channel
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self.subscribed = threading.Event()
+        self._subscription: Optional[Subscription] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def publish(self, session_ids: List[str]) -> None:
+        self.client.execute("PUBLISH", self.channel, json.dumps(session_ids))
+
+    def start(
+        self,
+        on_invalidate: Callable[[List[str]], None],
+        on_reset: Callable[[], None],
+    ) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen,
+            args=(on_invalidate, on_reset),
+            name="session-invalidation-listener",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopped.set()
+        if self._subscription is not None:
+            self._subscription.close()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.subscribed.clear()
+
+    def _listen(
+        self,
+        on_invalidate: Callable[[List[str]], None],
+        on_reset: Callable[[], None],
+    ) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._subscription = self.client.subscribe(self.channel)
+                # Anything revoked while we were not subscribed is unknown
+                on_reset()
+                self.subscribed.set()
+                while True:
+                    _, payload = self._subscription.get_message()
+                    on_invalidate(json.loads(payload))
+            except Exception:
+                self.subscribed.clear()
+                if self._stopped.is_set():
+                    return
+                logger.exception("Session invalidation subscription lost; reconnecting")
+                on_reset()
+                self._stopped.wait(self.reconnect_delay_seconds)
+
+
+def _session_key(session_id: str) -> str:
+    return SESSION_PREFIX + session_id
+
+
+def _user_index_key(user_id: str) -> str:
+    return USER_INDEX_PREFIX + user_id
+
+
+def _timestamp(naive_utc: datetime) -> float:
+    return naive_utc.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _encode(session: Session) -> str:
+    return json.dumps({
+        "session_id": session.session_id,
+        "user_id": session.user_id,
+        "user_email": session.user_email,
+        "is_admin": session.is_admin,
+        "created_at": session.created_at.isoformat(),
+        "ip_address": session.ip_address,
+        "user_agent": session.user_agent,
+    })
+
+
+def _decode(data: Optional[bytes], ttl_ms: int) -> Optional[Session]:
+    # PTTL is -2 for a missing key; -1 (no expiry) is never written by save()
+    if data is None or ttl_ms == -2:
+        return None
+    fields = json.loads(data)
+    expires_at = (
+        datetime.utcnow() + timedelta(milliseconds=ttl_ms)
+        if ttl_ms >= 0
+        else datetime.max
+    )
+    return Session(
+        session_id=fields["session_id"],
+        user_id=fields["user_id"],
+        user_email=fields["user_email"],
+        is_admin=fields["is_admin"],
+        created_at=datetime.fromisoformat(fields["created_at"]),
+        expires_at=expires_at,
+        ip_address=fields["ip_address"],
+        user_agent=fields["user_agent"],
+    )
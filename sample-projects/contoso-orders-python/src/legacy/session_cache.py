@@ -0,0 +1,162 @@
+"""
+==============================================================================
+LEGACY SESSION L1 CACHE
+==============================================================================
+
+Per-process cache of validated sessions in front of a shared (remote)
+SessionStore, so most authenticated requests need no network round trip.
+
+Revocation:
+- invalidate_session() and _cleanup_user_sessions() drop the session from
+  the local cache and broadcast the IDs on an InvalidationBus; every other
+  worker drops them from its own cache when the broadcast arrives
+- Entries expire after SESSION_L1_TTL_SECONDS regardless, which bounds how
+  long a revoked session can survive in a worker that missed a broadcast
+- If the bus connection drops, the cache is cleared when it reconnects
+==============================================================================
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional
+import logging
+
+from src.cache import TTLCache
+from src.config import settings
+from src.legacy.session_store import SessionStore
+from src.metrics import metrics
+
+# NOTE: This legacy module uses stdlib logging, not structlog
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from src.legacy.auth_provider import Session
+
+
+class InvalidationBus(ABC):
+    """Broadcasts revoked session IDs to every worker."""
+
+    @abstractmethod
+    def publish(self, session_ids: List[str]) -> None:
+        """Announce that these sessions were revoked."""
+
+    @abstractmethod
+    def start(
+        self,
+        on_invalidate: Callable[[List[str]], None],
+        on_reset: Callable[[], None],
+    ) -> None:
+        """
+        Start listening in the background.
+
+        on_invalidate receives revoked IDs; on_reset is called when
+        broadcasts may have been missed (e.g. after a reconnect).
+        """
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop listening."""
+
+
+class CachedSessionStore(SessionStore):
+    """SessionStore decorator adding a bounded, short-TTL in-process cache."""
+
+    def __init__(
+        self,
+        backend: SessionStore,
+        bus: Optional[InvalidationBus] = None,
+        max_entries: int = settings.SESSION_L1_MAX_ENTRIES,
+        ttl_seconds: float = settings.SESSION_L1_TTL_SECONDS,
+    ):
+        self.backend = backend
+        self.bus = bus
+        self.is_remote = backend.is_remote
+        self._l1: TTLCache = TTLCache(max_entries, ttl_seconds)
+
+    def start(self) -> None:
+        if self.bus is not None:
+            self.bus.start(self._evict, self._l1.clear)
+
+    def close(self) -> None:
+        if self.bus is not None:
+            self.bus.stop()
+        self.backend.close()
+
+    def get(self, session_id: str) -> Optional["Session"]:
+        session = self._cached(session_id)
+        if session is None:
+            session = self.backend.get(session_id)
+            if session is not None:
+                self._l1.set(session_id, session)
+        return session
+
+    def get_many(self, session_ids: List[str]) -> List[Optional["Session"]]:
+        sessions = [self._cached(session_id) for session_id in session_ids]
+        missing = [i for i, session in enumerate(sessions) if session is None]
+        if missing:
+            loaded = self.backend.get_many([session_ids[i] for i in missing])
+            for i, session in zip(missing, loaded):
+                sessions[i] = session
+                if session is not None:
+                    self._l1.set(session_ids[i], session)
+        return sessions
+
+    def save(self, session: "Session") -> None:
+        self.backend.save(session)
+        self._l1.set(session.session_id, session)
+
+    def touch(
+        self,
+        session_id: str,
+        ttl_seconds: float,
+        refresh_after_seconds: float,
+    ) -> Optional["Session"]:
+        session = self._cached(session_id)
+        if session is not None:
+            remaining = (session.expires_at - datetime.utcnow()).total_seconds()
+            if remaining > ttl_seconds - refresh_after_seconds:
+                return session  # Not due for a refresh: no round trip
+        session = self.backend.touch(session_id, ttl_seconds, refresh_after_seconds)
+        if session is None:
+            self._l1.invalidate(session_id)
+        else:
+            self._l1.set(session_id, session)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        deleted = self.backend.delete(session_id)
+        self._revoke([session_id])
+        return deleted
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        session_ids = list(session_ids)
+        deleted = self.backend.delete_many(session_ids)
+        self._revoke(session_ids)
+        return deleted
+
+    def session_ids_for_user(self, user_id: str) -> List[str]:
+        return self.backend.session_ids_for_user(user_id)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the L1 cache."""
+        return self._l1.hit_rate
+
+    def _cached(self, session_id: str) -> Optional["Session"]:
+        session = self._l1.get(session_id)
+        metrics.inc("session_l1_total", result="miss" if session is None else "hit")
+        metrics.set_gauge("session_l1_hit_rate", self._l1.hit_rate)
+        return session
+
+    def _revoke(self, session_ids: List[str]) -> None:
+        self._evict(session_ids)
+        if self.bus is not None and session_ids:
+            try:
+                self.bus.publish(session_ids)
+            except Exception:
+                # Other workers still drop it within SESSION_L1_TTL_SECONDS
+                logger.exception("Failed to broadcast session invalidation")
+
+    def _evict(self, session_ids: List[str]) -> None:
+        for session_id in session_ids:
+            self._l1.invalidate(session_id)
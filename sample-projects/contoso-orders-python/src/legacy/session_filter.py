@@ -0,0 +1,116 @@
+"""
+==============================================================================
+LEGACY SESSION NEGATIVE-LOOKUP FILTER
+==============================================================================
+
+Rejects session IDs that cannot be valid without asking the shared (remote)
+SessionStore, so junk tokens from credential-stuffing bots cost microseconds
+instead of a network round trip:
+
+- Structural check: IDs from _generate_session_token() are exactly
+  SESSION_TOKEN_LENGTH lowercase hex characters; anything else is rejected
+- Recent-miss cache: an ID the store did not know is remembered for
+  SESSION_MISS_CACHE_TTL_SECONDS, so replayed junk is rejected locally
+
+A Bloom filter of valid IDs was considered and rejected: each worker only
+sees the sessions it created, so it would reject sessions created elsewhere.
+
+FALSE NEGATIVES (a valid session rejected):
+- A session saved under a non-canonical ID (dev/test fixtures) is rejected
+  by the structural check. The filter is therefore only used in front of
+  the Redis backend, never the in-memory one.
+- A miss is cached per worker. If an ID is looked up before it is saved,
+  workers that saw the miss reject it until their entry expires. Saves through
+  this worker clear its own entry. Generated IDs are random 256-bit values,
+  so this needs a client presenting an ID before it was issued.
+==============================================================================
+"""
+
+from typing import TYPE_CHECKING, Iterable, List, Optional
+import re
+
+from src.cache import TTLCache
+from src.config import settings
+from src.legacy.session_store import SessionStore
+from src.metrics import metrics
+
+if TYPE_CHECKING:
+    from src.legacy.auth_provider import Session
+
+
+class FilteredSessionStore(SessionStore):
+    """SessionStore decorator that answers known-invalid lookups locally."""
+
+    def __init__(
+        self,
+        backend: SessionStore,
+        token_length: int,
+        max_misses: int = settings.SESSION_MISS_CACHE_MAX_ENTRIES,
+        miss_ttl_seconds: float = settings.SESSION_MISS_CACHE_TTL_SECONDS,
+    ):
+        self.backend = backend
+        self.is_remote = backend.is_remote
+        self._token_pattern = re.compile(f"[0-9a-f]{{{token_length}}}")
+        self._misses: TTLCache = TTLCache(max_misses, miss_ttl_seconds)
+
+    def is_well_formed(self, session_id: str) -> bool:
+        """True if session_id has the shape of a generated session token."""
+        return self._token_pattern.fullmatch(session_id) is not None
+
+    def start(self) -> None:
+        self.backend.start()
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def get(self, session_id: str) -> Optional["Session"]:
+        if self._rejected(session_id):
+            return None
+        return self._remember_miss(session_id, self.backend.get(session_id))
+
+    def get_many(self, session_ids: List[str]) -> List[Optional["Session"]]:
+        sessions: List[Optional["Session"]] = [None] * len(session_ids)
+        lookup = [i for i, session_id in enumerate(session_ids) if not self._rejected(session_id)]
+        if lookup:
+            loaded = self.backend.get_many([session_ids[i] for i in lookup])
+            for i, session in zip(lookup, loaded):
+                sessions[i] = self._remember_miss(session_ids[i], session)
+        return sessions
+
+    def save(self, session: "Session") -> None:
+        self.backend.save(session)
+        self._misses.invalidate(session.session_id)
+
+    def touch(
+        self,
+        session_id: str,
+        ttl_seconds: float,
+        refresh_after_seconds: float,
+    ) -> Optional["Session"]:
+        if self._rejected(session_id):
+            return None
+        session = self.backend.touch(session_id, ttl_seconds, refresh_after_seconds)
+        return self._remember_miss(session_id, session)
+
+    def delete(self, session_id: str) -> bool:
+        return self.backend.delete(session_id)
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        return self.backend.delete_many(session_ids)
+
+    def session_ids_for_user(self, user_id: str) -> List[str]:
+        return self.backend.session_ids_for_user(user_id)
+
+    def _rejected(self, session_id: str) -> bool:
+        if not self.is_well_formed(session_id):
+            metrics.inc("session_lookup_rejected_total", reason="malformed")
+            return True
+        if self._misses.get(session_id) is not None:
+            metrics.inc("session_lookup_rejected_total", reason="recent_miss")
+            return True
+        return False
+
+    def _remember_miss(self, session_id: str, session: Optional["Session"]) -> Optional["Session"]:
+        if session is None:
+            self._misses.set(session_id, True)
+        return session
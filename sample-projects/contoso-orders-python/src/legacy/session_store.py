@@ -0,0 +1,331 @@
+"""
+==============================================================================
+LEGACY SESSION STORE
+==============================================================================
+
+Session storage used by auth_provider (SEC-1234).
+
+SessionStore is the backend interface. InMemorySessionStore (below) serves a
+single process; RedisSessionStore (redis_session_store.py) is shared by every
+worker. SESSION_BACKEND selects one at import time.
+
+The in-memory store keeps sessions in expiry order on the monotonic clock:
+- Lookups never return an expired session, without calling datetime.utcnow()
+- A background SessionSweeper evicts expired sessions in O(expired) per tick,
+  so abandoned sessions do not accumulate
+- A per-user index (oldest first) makes enforcing MAX_SESSIONS_PER_USER cost
+  O(sessions of that user) instead of a scan of every session
+- touch() validates and slides a session's expiry in one operation, writing
+  only when the session is due for a refresh
+
+The store behaves like a dict of session_id -> Session so existing callers
+(and test fixtures) can keep using ``_SESSION_STORE[session_id] = session``.
+
+NOTE: Expiry is still defined by Session.expires_at; the monotonic deadline
+is derived from it whenever a session is written. Mutating expires_at on a
+stored session has no effect until the session is written back.
+==============================================================================
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from bisect import insort
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from src.config import settings
+from src.metrics import metrics
+
+# NOTE: This legacy module uses stdlib logging, not structlog
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from src.legacy.auth_provider import Session
+
+# (created_at, insertion sequence, session_id)
+IndexEntry = Tuple[datetime, int, str]
+
+
+class SessionStore(ABC):
+    """
+    Session backend interface.
+
+    Implementations never return expired sessions. Methods are synchronous;
+    async callers should run them in a thread pool when is_remote is True.
+    """
+
+    # True if calls go over the network
+    is_remote: bool = False
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional["Session"]:
+        """Return a live session, or None."""
+
+    def get_many(self, session_ids: List[str]) -> List[Optional["Session"]]:
+        """
+        get() for several sessions, in order.
+
+        Remote stores override this to look them all up in one round trip.
+        """
+        return [self.get(session_id) for session_id in session_ids]
+
+    @abstractmethod
+    def save(self, session: "Session") -> None:
+        """Store a session until its expires_at."""
+
+    @abstractmethod
+    def touch(
+        self,
+        session_id: str,
+        ttl_seconds: float,
+        refresh_after_seconds: float,
+    ) -> Optional["Session"]:
+        """
+        Return a live session and slide its expiry, as one operation.
+
+        The expiry is only rewritten once at least refresh_after_seconds of
+        the ttl have been used up, so an active session costs one write per
+        refresh interval instead of one per request. A session is never kept
+        alive beyond ttl_seconds after its last refresh.
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+
+    @abstractmethod
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        """Remove several sessions in one operation. Returns how many existed."""
+
+    @abstractmethod
+    def session_ids_for_user(self, user_id: str) -> List[str]:
+        """Live session IDs of one user, oldest first."""
+
+    def start(self) -> None:
+        """Start background work, if any (called at application startup)."""
+
+    def close(self) -> None:
+        """Release connections, if any."""
+
+
+class InMemorySessionStore(MutableMapping, SessionStore):
+    """
+    Dict-like session store with a min-heap of expiry deadlines.
+
+    The heap holds (deadline, session_id) entries. Refreshing a session pushes
+    a new entry and leaves the old one behind as stale; stale entries are
+    skipped when popped, and the heap is rebuilt if they ever outnumber live
+    sessions, so memory stays proportional to the number of live sessions.
+
+    A user_id -> [(created_at, seq, session_id)] index, kept sorted by
+    creation time (ties in insertion order), is updated on every write,
+    delete and eviction.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._sessions: Dict[str, "Session"] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._by_user: Dict[str, List[IndexEntry]] = {}
+        self._index_entries: Dict[str, IndexEntry] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+
+    # -- MutableMapping --------------------------------------------------------
+
+    def __getitem__(self, session_id: str) -> "Session":
+        with self._lock:
+            deadline = self._deadlines.get(session_id)
+            if deadline is None:
+                raise KeyError(session_id)
+            if deadline <= self._clock():
+                self._remove(session_id)
+                raise KeyError(session_id)
+            return self._sessions[session_id]
+
+    def __setitem__(self, session_id: str, session: "Session") -> None:
+        remaining = (session.expires_at - datetime.utcnow()).total_seconds()
+        with self._lock:
+            deadline = self._clock() + remaining
+            previous = self._sessions.get(session_id)
+            if previous is None:
+                self._index(session_id, session)
+            elif (previous.user_id, previous.created_at) != (session.user_id, session.created_at):
+                self._unindex(session_id, previous)
+                self._index(session_id, session)
+            self._sessions[session_id] = session
+            self._deadlines[session_id] = deadline
+            heapq.heappush(self._heap, (deadline, session_id))
+            self._maybe_compact()
+
+    def __delitem__(self, session_id: str) -> None:
+        with self._lock:
+            if session_id not in self._sessions:
+                raise KeyError(session_id)
+            self._remove(session_id)
+            self._maybe_compact()
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._sessions))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # -- SessionStore ----------------------------------------------------------
+
+    def save(self, session: "Session") -> None:
+        self[session.session_id] = session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            del self[session_id]
+            return True
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        with self._lock:
+            return sum(self.delete(session_id) for session_id in session_ids)
+
+    def touch(
+        self,
+        session_id: str,
+        ttl_seconds: float,
+        refresh_after_seconds: float,
+    ) -> Optional["Session"]:
+        with self._lock:
+            deadline = self._deadlines.get(session_id)
+            now = self._clock()
+            if deadline is None:
+                return None
+            if deadline <= now:
+                self._remove(session_id)
+                return None
+            session = self._sessions[session_id]
+            if deadline - now > ttl_seconds - refresh_after_seconds:
+                return session
+
+            session.expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+            deadline = now + ttl_seconds
+            self._deadlines[session_id] = deadline
+            heapq.heappush(self._heap, (deadline, session_id))
+            self._maybe_compact()
+            return session
+
+    # -- Per-user index --------------------------------------------------------
+
+    def session_ids_for_user(self, user_id: str) -> List[str]:
+        """Live session IDs of one user, oldest first. O(sessions of that user)."""
+        with self._lock:
+            now = self._clock()
+            return [
+                session_id
+                for _, _, session_id in self._by_user.get(user_id, ())
+                if self._deadlines[session_id] > now
+            ]
+
+    # -- Expiry ----------------------------------------------------------------
+
+    def sweep(self, max_evictions: Optional[int] = None) -> int:
+        """
+        Evict expired sessions, soonest deadline first.
+
+        Touches only expired (and stale) heap entries. Returns the number of
+        sessions evicted; stops early after max_evictions.
+        """
+        evicted = 0
+        with self._lock:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                if max_evictions is not None and evicted >= max_evictions:
+                    break
+                deadline, session_id = heapq.heappop(self._heap)
+                if self._deadlines.get(session_id) != deadline:
+                    continue  # Stale entry: refreshed or already removed
+                self._remove(session_id)
+                evicted += 1
+        return evicted
+
+    @property
+    def heap_size(self) -> int:
+        """Heap entries, including stale ones (for monitoring)."""
+        return len(self._heap)
+
+    def _remove(self, session_id: str) -> None:
+        # The heap entry is left behind and skipped when it surfaces
+        self._unindex(session_id, self._sessions.pop(session_id))
+        del self._deadlines[session_id]
+
+    def _index(self, session_id: str, session: "Session") -> None:
+        entry = (session.created_at, next(self._sequence), session_id)
+        self._index_entries[session_id] = entry
+        insort(self._by_user.setdefault(session.user_id, []), entry)
+
+    def _unindex(self, session_id: str, session: "Session") -> None:
+        user_sessions = self._by_user[session.user_id]
+        user_sessions.remove(self._index_entries.pop(session_id))
+        if not user_sessions:
+            del self._by_user[session.user_id]
+
+    def _maybe_compact(self) -> None:
+        # Rebuild once stale entries outnumber live ones: O(n) every n writes
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, sid) for sid, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+
+class SessionSweeper:
+    """
+    Background task that periodically evicts expired sessions.
+
+    Each tick evicts at most max_per_tick sessions so a mass expiry cannot
+    stall the event loop; the backlog is worked off over later ticks.
+    """
+
+    def __init__(
+        self,
+        store: InMemorySessionStore,
+        interval_seconds: float = settings.SESSION_SWEEP_INTERVAL_SECONDS,
+        max_per_tick: int = settings.SESSION_SWEEP_MAX_PER_TICK,
+    ):
+        self.store = store
+        self.interval_seconds = interval_seconds
+        self.max_per_tick = max_per_tick
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Session sweeper started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Session sweeper stopped")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                evicted = self.store.sweep(self.max_per_tick)
+            except Exception:
+                logger.exception("Session sweep failed")
+                continue
+            metrics.set_gauge("sessions_active", len(self.store))
+            metrics.inc("sessions_expired_total", evicted)
+            if evicted:
+                logger.debug(f"Evicted {evicted} expired sessions")
@@ -4,18 +4,35 @@ Contoso Orders API - Main Application Entry Point
 This module initializes the FastAPI application and registers all routers.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 import structlog
 
-from src.api import orders, customers, products
+from src.api import orders, customers, products, sessions
 from src.config import settings
+from src.container import ServiceContainer
+from src.deadline import DeadlineExceeded, deadline_scope
+from src.metrics import metrics
 from src.services.order_service import BusinessException
 
 # NOTE: We use structlog for structured logging per Platform Team guidelines
 logger = structlog.get_logger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop app-lifetime resources owned by the service container."""
+    logger.info("application_startup", version=settings.VERSION)
+    await app.state.container.startup()
+    try:
+        yield
+    finally:
+        await app.state.container.shutdown()
+        logger.info("application_shutdown")
+
+
 def create_app() -> FastAPI:
     """
     Application factory pattern.
@@ -27,12 +44,20 @@ def create_app() -> FastAPI:
         version=settings.VERSION,
         description="Enterprise Order Management API",
         docs_url="/docs" if settings.DEBUG else None,
+        lifespan=lifespan,
     )
     
+    # Shared services live for the lifetime of the app, not per request
+    app.state.container = ServiceContainer()
+    
+    # Register middleware
+    register_middleware(app)
+    
     # Register routers
     app.include_router(orders.router, prefix="/api/v1/orders", tags=["orders"])
     app.include_router(customers.router, prefix="/api/v1/customers", tags=["customers"])
     app.include_router(products.router, prefix="/api/v1/products", tags=["products"])
+    app.include_router(sessions.router, prefix="/api/v1/internal/sessions", tags=["internal"])
     
     # Register exception handlers
     register_exception_handlers(app)
@@ -40,6 +65,24 @@ def create_app() -> FastAPI:
     return app
 
 
+def register_middleware(app: FastAPI) -> None:
+    """Register global HTTP middleware."""
+    
+    @app.middleware("http")
+    async def request_deadline(request: Request, call_next):
+        # Every request gets a deadline; callers may ask for a shorter one
+        # with X-Request-Timeout (seconds), never a longer one.
+        timeout = settings.REQUEST_TIMEOUT_SECONDS
+        header = request.headers.get("X-Request-Timeout")
+        if header is not None:
+            try:
+                timeout = min(timeout, max(0.0, float(header)))
+            except ValueError:
+                pass
+        with deadline_scope(timeout):
+            return await call_next(request)
+
+
 def register_exception_handlers(app: FastAPI) -> None:
     """Register global exception handlers."""
     
@@ -63,6 +106,19 @@ def register_exception_handlers(app: FastAPI) -> None:
             },
         )
     
+    @app.exception_handler(DeadlineExceeded)
+    async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+        logger.warning("request_deadline_exceeded", path=request.url.path, message=str(exc))
+        return JSONResponse(
+            status_code=504,
+            content={
+                "error": {
+                    "code": "REQUEST_DEADLINE_EXCEEDED",
+                    "message": "The request ran out of time",
+                }
+            },
+        )
+    
     @app.exception_handler(Exception)
     async def generic_exception_handler(request: Request, exc: Exception):
         # Log full exception for debugging but return sanitized response
@@ -87,11 +143,7 @@ async def health_check():
     return {"status": "healthy", "version": settings.VERSION}
 
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("application_startup", version=settings.VERSION)
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("application_shutdown")
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Process metrics (counters, gauges, histograms) as JSON."""
+    return metrics.snapshot()
@@ -0,0 +1,115 @@
+"""
+Application Metrics
+
+Minimal in-process metrics registry (counters, gauges, histograms).
+
+Values are exposed as JSON on GET /metrics. Labels are folded into the metric
+key, Prometheus-style: ``payment_circuit_state{breaker="payment_gateway"}``.
+"""
+
+from typing import Dict, Sequence, Tuple
+import threading
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def _key(name: str, labels: Dict[str, object]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class Histogram:
+    """Cumulative bucketed histogram with count and sum."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {
+                **{str(bound): n for bound, n in zip(self.buckets, self.bucket_counts)},
+                "+Inf": self.count,
+            },
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of named metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Increment a counter."""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Set a gauge to an absolute value."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        **labels,
+    ) -> None:
+        """Record a value in a histogram (buckets are fixed on first use)."""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        return self._counters.get(_key(name, labels), 0)
+
+    def gauge(self, name: str, **labels) -> float:
+        """Current value of a gauge (0 if never set)."""
+        return self._gauges.get(_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        """Histogram by name; raises KeyError if nothing was observed."""
+        return self._histograms[_key(name, labels)]
+
+    def snapshot(self) -> dict:
+        """All metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {k: h.to_dict() for k, h in self._histograms.items()},
+            }
+
+    def reset(self) -> None:
+        """Clear all metrics (tests only)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
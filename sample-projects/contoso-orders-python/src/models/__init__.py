@@ -4,13 +4,14 @@ Domain Models
 Core business entities for the application.
 """
 
-from src.models.order import Order, OrderItem, OrderStatus
+from src.models.order import Order, OrderItem, OrderQuote, OrderStatus
 from src.models.customer import Customer, CustomerTier
 from src.models.product import Product, ProductCategory
 
 __all__ = [
     "Order",
     "OrderItem", 
+    "OrderQuote",
     "OrderStatus",
     "Customer",
     "CustomerTier",
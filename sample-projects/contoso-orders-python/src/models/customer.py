@@ -4,6 +4,7 @@ Customer Domain Model
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
@@ -48,3 +49,34 @@ class Customer:
     def display_name(self) -> str:
         """Get display name (company name if available, else customer name)."""
         return self.company or self.name
+
+
+@dataclass(frozen=True)
+class CustomerOrderStats:
+    """
+    Order aggregates for one customer.
+    
+    Cancelled and refunded orders do not count towards spend or order
+    count; last_order_at covers every order placed.
+    """
+    customer_id: str
+    lifetime_spend: Decimal = Decimal("0")
+    order_count: int = 0
+    last_order_at: Optional[datetime] = None
+    
+    @property
+    def average_order_value(self) -> Decimal:
+        """Mean total of counted orders (0 if there are none)."""
+        if self.order_count == 0:
+            return Decimal("0")
+        return (self.lifetime_spend / self.order_count).quantize(Decimal("0.01"))
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary representation."""
+        return {
+            "customer_id": self.customer_id,
+            "lifetime_spend": str(self.lifetime_spend),
+            "order_count": self.order_count,
+            "average_order_value": str(self.average_order_value),
+            "last_order_at": self.last_order_at.isoformat() if self.last_order_at else None,
+        }
@@ -10,6 +10,8 @@ from decimal import Decimal
 from enum import Enum
 from typing import List, Optional
 
+from src.etag import format_etag
+
 
 class OrderStatus(Enum):
     """Order lifecycle states."""
@@ -20,6 +22,7 @@ class OrderStatus(Enum):
     DELIVERED = "delivered"
     CANCELLED = "cancelled"
     REFUNDED = "refunded"
+    PAYMENT_FAILED = "payment_failed"  # Authorization declined by the gateway
 
 
 @dataclass
@@ -49,6 +52,22 @@ class OrderItem:
         return self.unit_price * self.quantity
 
 
+@dataclass(frozen=True)
+class OrderQuote:
+    """
+    Priced cart that has not been turned into an order.
+    
+    The fingerprint identifies the priced inputs (customer tier, items and
+    shipping address), so identical carts always produce the same quote.
+    """
+    fingerprint: str
+    subtotal: Decimal
+    tax: Decimal
+    shipping_cost: Decimal
+    total: Decimal
+    item_count: int
+
+
 @dataclass
 class Order:
     """
@@ -70,6 +89,13 @@ class Order:
     payment_id: Optional[str] = None
     tracking_number: Optional[str] = None
     notes: Optional[str] = None
+    payment_error: Optional[str] = None  # Gateway's reason when PAYMENT_FAILED
+    version: int = 0  # Incremented by the repository on every save
+    
+    @property
+    def etag(self) -> str:
+        """Strong ETag for the current version of this order."""
+        return format_etag(self.id, self.version)
     
     @property
     def item_count(self) -> int:
@@ -79,7 +105,7 @@ class Order:
     @property  
     def is_cancellable(self) -> bool:
         """Check if order can be cancelled."""
-        return self.status in (OrderStatus.PENDING, OrderStatus.CONFIRMED)
+        return self.status in (OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.PAYMENT_FAILED)
     
     @property
     def is_modifiable(self) -> bool:
@@ -91,19 +117,21 @@ class Order:
         Check if order can transition to a new status.
         
         Valid transitions:
-        - PENDING -> CONFIRMED, CANCELLED
+        - PENDING -> CONFIRMED, CANCELLED, PAYMENT_FAILED
         - CONFIRMED -> PROCESSING, CANCELLED
         - PROCESSING -> SHIPPED, CANCELLED
         - SHIPPED -> DELIVERED
         - DELIVERED -> REFUNDED
+        - PAYMENT_FAILED -> CANCELLED
         """
         valid_transitions = {
-            OrderStatus.PENDING: [OrderStatus.CONFIRMED, OrderStatus.CANCELLED],
+            OrderStatus.PENDING: [OrderStatus.CONFIRMED, OrderStatus.CANCELLED, OrderStatus.PAYMENT_FAILED],
             OrderStatus.CONFIRMED: [OrderStatus.PROCESSING, OrderStatus.CANCELLED],
             OrderStatus.PROCESSING: [OrderStatus.SHIPPED, OrderStatus.CANCELLED],
             OrderStatus.SHIPPED: [OrderStatus.DELIVERED],
             OrderStatus.DELIVERED: [OrderStatus.REFUNDED],
             OrderStatus.CANCELLED: [],
             OrderStatus.REFUNDED: [],
+            OrderStatus.PAYMENT_FAILED: [OrderStatus.CANCELLED],
         }
         return new_status in valid_transitions.get(self.status, [])
@@ -0,0 +1,44 @@
+"""
+Outbox Domain Model
+
+Pending side effects recorded in the same write as the order change that
+caused them (transactional outbox pattern).
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+
+class PaymentCommandType(Enum):
+    """Payment gateway operations that can be queued in the outbox."""
+    AUTHORIZE = "authorize"
+    VOID_AUTHORIZATION = "void_authorization"
+
+
+class OutboxStatus(Enum):
+    """Delivery states of an outbox message."""
+    PENDING = "pending"
+    DELIVERED = "delivered"
+    FAILED = "failed"  # Gave up after max attempts; needs manual follow-up
+
+
+@dataclass
+class OutboxMessage:
+    """
+    A payment command waiting to be delivered to the PaymentService.
+    
+    Delivery is at-least-once: the dispatcher may repeat a command after a
+    crash, so the order_id is sent to the gateway as the idempotency key.
+    """
+    id: str
+    order_id: str
+    command: PaymentCommandType
+    payload: dict
+    status: OutboxStatus = OutboxStatus.PENDING
+    attempts: int = 0
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    available_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    delivered_at: Optional[datetime] = None
+    last_error: Optional[str] = None
@@ -2,17 +2,137 @@
 Order Repository
 
 Data access for Order entities.
+
+Orders are also indexed per customer, ordered by (created_at, id), so a
+customer's order history costs O(that customer's orders) rather than a scan
+of every order. Per-customer spend and order counts are updated on every
+write, and customers are kept sorted by spend for top-N queries.
 """
 
-from typing import Optional, List
-from datetime import datetime
+from bisect import bisect_left, insort
+from collections.abc import MutableMapping
+from decimal import Decimal
+from typing import Dict, Iterator, Optional, List, Tuple
+from datetime import datetime, timezone
+import threading
 
 from src.repositories.base import BaseRepository
+from src.repositories.outbox_repo import OutboxRepository
+from src.models.customer import CustomerOrderStats
 from src.models.order import Order, OrderStatus
+from src.models.outbox import OutboxMessage
+
+
+# (created_at as a UTC timestamp, order id)
+OrderKey = Tuple[float, str]
+
+# Orders in these states do not count towards a customer's spend
+_UNCOUNTED_STATUSES = (OrderStatus.CANCELLED, OrderStatus.REFUNDED, OrderStatus.PAYMENT_FAILED)
+
+
+def _order_key(order: Order) -> OrderKey:
+    created_at = order.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)  # Naive means UTC
+    return (created_at.timestamp(), order.id)
+
+
+class _OrderTable(MutableMapping):
+    """
+    Dict of order id -> Order that maintains the per-customer index and
+    spend aggregates.
+    
+    Behaves like the plain dict it replaces, so callers (and test fixtures)
+    can keep reading and writing _ORDERS directly. Orders are mutated in
+    place before being saved, so what each order contributed is remembered
+    and reversed on the next write.
+    """
+    
+    def __init__(self):
+        self._orders: Dict[str, Order] = {}
+        # What each order is indexed under: (customer, key, counted total or None)
+        self._indexed: Dict[str, Tuple[str, OrderKey, Optional[Decimal]]] = {}
+        self._by_customer: Dict[str, List[OrderKey]] = {}
+        # customer -> (spend, order count), for customers with counted orders
+        self._spend: Dict[str, Tuple[Decimal, int]] = {}
+        self._by_spend: List[Tuple[Decimal, str]] = []
+        self.lock = threading.RLock()
+    
+    def __getitem__(self, order_id: str) -> Order:
+        return self._orders[order_id]
+    
+    def __setitem__(self, order_id: str, order: Order) -> None:
+        with self.lock:
+            self._unindex(order_id)
+            self._orders[order_id] = order
+            key = _order_key(order)
+            insort(self._by_customer.setdefault(order.customer_id, []), key)
+            counted = None if order.status in _UNCOUNTED_STATUSES else order.total
+            if counted is not None:
+                self._add_spend(order.customer_id, counted, 1)
+            self._indexed[order_id] = (order.customer_id, key, counted)
+    
+    def __delitem__(self, order_id: str) -> None:
+        with self.lock:
+            del self._orders[order_id]
+            self._unindex(order_id)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._orders)
+    
+    def __len__(self) -> int:
+        return len(self._orders)
+    
+    def customer_keys(self, customer_id: str) -> List[OrderKey]:
+        """A customer's order keys, oldest first. Read under self.lock."""
+        return self._by_customer.get(customer_id, [])
+    
+    def customer_stats(self, customer_id: str) -> CustomerOrderStats:
+        """A customer's order aggregates, in O(1)."""
+        with self.lock:
+            spend, count = self._spend.get(customer_id, (Decimal("0"), 0))
+            keys = self._by_customer.get(customer_id)
+            last_order_at = self._orders[keys[-1][1]].created_at if keys else None
+        return CustomerOrderStats(
+            customer_id=customer_id,
+            lifetime_spend=spend,
+            order_count=count,
+            last_order_at=last_order_at,
+        )
+    
+    def top_by_spend(self, limit: int) -> List[CustomerOrderStats]:
+        """The limit highest-spending customers, in O(limit)."""
+        with self.lock:
+            top = self._by_spend[-limit:] if limit > 0 else []
+            return [self.customer_stats(customer_id) for _, customer_id in reversed(top)]
+    
+    def _unindex(self, order_id: str) -> None:
+        indexed = self._indexed.pop(order_id, None)
+        if indexed is None:
+            return
+        customer_id, key, counted = indexed
+        keys = self._by_customer[customer_id]
+        del keys[bisect_left(keys, key)]
+        if not keys:
+            del self._by_customer[customer_id]
+        if counted is not None:
+            self._add_spend(customer_id, -counted, -1)
+    
+    def _add_spend(self, customer_id: str, amount: Decimal, orders: int) -> None:
+        spend, count = self._spend.pop(customer_id, (Decimal("0"), 0))
+        if count:
+            del self._by_spend[bisect_left(self._by_spend, (spend, customer_id))]
+        spend, count = spend + amount, count + orders
+        if count:
+            self._spend[customer_id] = (spend, count)
+            insort(self._by_spend, (spend, customer_id))
 
 
 # In-memory store (simulating database)
-_ORDERS: dict[str, Order] = {}
+_ORDERS = _OrderTable()
+
+# Serializes multi-record writes (simulating a database transaction)
+_TRANSACTION_LOCK = threading.Lock()
 
 
 class OrderRepository(BaseRepository[Order]):
@@ -42,15 +162,12 @@ class OrderRepository(BaseRepository[Order]):
         
         Supports filtering by status and customer_id.
         """
-        orders = list(_ORDERS.values())
+        orders = self._candidates(customer_id)
         
         # Apply filters
         if status:
             orders = [o for o in orders if o.status == status]
         
-        if customer_id:
-            orders = [o for o in orders if o.customer_id == customer_id]
-        
         # Sort by created_at descending (newest first)
         orders.sort(key=lambda o: o.created_at, reverse=True)
         
@@ -58,19 +175,77 @@ class OrderRepository(BaseRepository[Order]):
         return orders[offset:offset + limit]
     
     def find_by_customer(self, customer_id: str) -> List[Order]:
-        """Get all orders for a customer."""
-        return [o for o in _ORDERS.values() if o.customer_id == customer_id]
+        """Get all orders for a customer, oldest first."""
+        return self._candidates(customer_id)
+    
+    def customer_stats(self, customer_id: str) -> CustomerOrderStats:
+        """Lifetime spend, order count and last order time for a customer."""
+        return _ORDERS.customer_stats(customer_id)
+    
+    def top_customers_by_spend(self, limit: int = 10) -> List[CustomerOrderStats]:
+        """Aggregates of the highest-spending customers, highest first."""
+        return _ORDERS.top_by_spend(limit)
+    
+    def find_page_by_customer(
+        self,
+        customer_id: str,
+        status: Optional[OrderStatus] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """
+        One page of a customer's orders, newest first.
+        
+        Returns (orders, next_cursor); pass next_cursor back for the following
+        page, None on the last page. Cost is O(limit) without a status filter,
+        and at most O(customer's orders) with one.
+        
+        Raises ValueError for a malformed cursor.
+        """
+        with _ORDERS.lock:
+            keys = _ORDERS.customer_keys(customer_id)
+            position = bisect_left(keys, _parse_cursor(cursor)) if cursor else len(keys)
+            orders: List[Order] = []
+            next_cursor = None
+            for i in range(position - 1, -1, -1):
+                order = _ORDERS[keys[i][1]]
+                if status is not None and order.status != status:
+                    continue
+                if len(orders) == limit:
+                    next_cursor = _format_cursor(_order_key(orders[-1]))
+                    break
+                orders.append(order)
+        return orders, next_cursor
     
     def find_by_status(self, status: OrderStatus) -> List[Order]:
         """Get all orders with a specific status."""
         return [o for o in _ORDERS.values() if o.status == status]
     
     def save(self, entity: Order) -> Order:
-        """Save or update an order."""
+        """
+        Save or update an order.
+        
+        Bumps the order version, which invalidates previously issued ETags.
+        """
         entity.updated_at = datetime.utcnow()
+        entity.version += 1
         _ORDERS[entity.id] = entity
         return entity
     
+    def save_with_outbox(self, entity: Order, messages: List[OutboxMessage]) -> Order:
+        """
+        Save an order and enqueue outbox messages as one atomic write.
+        
+        Either the order change and all of its messages are recorded, or
+        neither is. In production this is a single database transaction.
+        """
+        outbox = OutboxRepository()
+        with _TRANSACTION_LOCK:
+            saved = self.save(entity)
+            for message in messages:
+                outbox.save(message)
+        return saved
+    
     def delete(self, entity_id: str) -> bool:
         """Delete an order by ID."""
         if entity_id in _ORDERS:
@@ -85,15 +260,16 @@ class OrderRepository(BaseRepository[Order]):
         **filters,
     ) -> int:
         """Count orders matching filters."""
-        orders = list(_ORDERS.values())
-        
-        if status:
-            orders = [o for o in orders if o.status == status]
-        
-        if customer_id:
-            orders = [o for o in orders if o.customer_id == customer_id]
-        
-        return len(orders)
+        if not status:
+            return len(self._candidates(customer_id))
+        return sum(1 for o in self._candidates(customer_id) if o.status == status)
+    
+    def _candidates(self, customer_id: Optional[str]) -> List[Order]:
+        """Every order, or only one customer's (oldest first) via the index."""
+        if not customer_id:
+            return list(_ORDERS.values())
+        with _ORDERS.lock:
+            return [_ORDERS[order_id] for _, order_id in _ORDERS.customer_keys(customer_id)]
     
     def find_recent(self, hours: int = 24) -> List[Order]:
         """
@@ -107,3 +283,12 @@ class OrderRepository(BaseRepository[Order]):
             o for o in _ORDERS.values() 
             if o.created_at and o.created_at >= cutoff
         ]
+
+
+def _format_cursor(key: OrderKey) -> str:
+    return f"{key[0]!r}:{key[1]}"
+
+
+def _parse_cursor(cursor: str) -> OrderKey:
+    timestamp, order_id = cursor.split(":", 1)
+    return (float(timestamp), order_id)
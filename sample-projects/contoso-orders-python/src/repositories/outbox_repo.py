@@ -0,0 +1,180 @@
+"""
+Outbox Repository
+
+Data access for OutboxMessage entities.
+
+Only undelivered work is kept. The outbox table holds PENDING messages, with
+a heap ordered by available_at so each dispatcher poll costs O(due messages),
+not O(every message ever enqueued). DELIVERED messages are deleted, and FAILED
+ones move to a dead-letter table that keeps the most recent
+OUTBOX_DEAD_LETTER_MAX_ENTRIES for manual follow-up.
+"""
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Optional, List, Tuple
+from datetime import datetime, timezone
+import heapq
+import threading
+
+from src.config import settings
+from src.repositories.base import BaseRepository
+from src.models.outbox import OutboxMessage, OutboxStatus
+
+
+# (available_at, created_at, message id)
+DueKey = Tuple[datetime, datetime, str]
+
+
+class _OutboxTable(MutableMapping):
+    """
+    Dict of message id -> pending OutboxMessage that keeps a due-time heap.
+    
+    Behaves like the plain dict it replaces. A message rescheduled by saving
+    it again gets a new heap entry; the old one is recognised as stale and
+    skipped when it reaches the top.
+    """
+    
+    def __init__(self):
+        self._messages: Dict[str, OutboxMessage] = {}
+        self._due: List[DueKey] = []
+        # available_at of each message's live heap entry
+        self._scheduled: Dict[str, datetime] = {}
+        self.lock = threading.RLock()
+    
+    def __getitem__(self, message_id: str) -> OutboxMessage:
+        return self._messages[message_id]
+    
+    def __setitem__(self, message_id: str, message: OutboxMessage) -> None:
+        with self.lock:
+            self._messages[message_id] = message
+            if self._scheduled.get(message_id) != message.available_at:
+                self._scheduled[message_id] = message.available_at
+                heapq.heappush(self._due, (message.available_at, message.created_at, message_id))
+    
+    def __delitem__(self, message_id: str) -> None:
+        with self.lock:
+            del self._messages[message_id]
+            self._scheduled.pop(message_id, None)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._messages)
+    
+    def __len__(self) -> int:
+        return len(self._messages)
+    
+    def clear(self) -> None:
+        with self.lock:
+            self._messages.clear()
+            self._due.clear()
+            self._scheduled.clear()
+    
+    def claim_due(self, limit: int, now: datetime) -> List[OutboxMessage]:
+        """
+        Pop up to limit messages whose available_at has passed, earliest first.
+        
+        Claimed messages leave the heap until they are saved again.
+        """
+        claimed: List[OutboxMessage] = []
+        with self.lock:
+            while self._due and self._due[0][0] <= now and len(claimed) < limit:
+                available_at, _, message_id = heapq.heappop(self._due)
+                if self._scheduled.get(message_id) != available_at:
+                    continue  # Superseded by a later save, or deleted
+                del self._scheduled[message_id]
+                message = self._messages[message_id]
+                if message.available_at > now:
+                    # Rescheduled in place without a save; queue it for then
+                    self[message_id] = message
+                    continue
+                claimed.append(message)
+        return claimed
+
+
+# In-memory store (simulating the outbox table): pending messages only
+_OUTBOX = _OutboxTable()
+
+# FAILED messages, oldest first; the oldest are dropped past the limit
+_DEAD_LETTERS: "OrderedDict[str, OutboxMessage]" = OrderedDict()
+
+
+class OutboxRepository(BaseRepository[OutboxMessage]):
+    """
+    Repository for outbox message persistence.
+    
+    Messages are written by OrderRepository.save_with_outbox() together with
+    the order change, and consumed by the OutboxDispatcher.
+    
+    Team Convention: All repository methods return Optional[T] for single-item lookups.
+    """
+    
+    def find_by_id(self, entity_id: str) -> Optional[OutboxMessage]:
+        """Find a pending or dead-lettered outbox message by ID."""
+        return _OUTBOX.get(entity_id) or _DEAD_LETTERS.get(entity_id)
+    
+    def find_all(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        status: Optional[OutboxStatus] = None,
+        order_id: Optional[str] = None,
+        **filters,
+    ) -> List[OutboxMessage]:
+        """Find pending and dead-lettered outbox messages, oldest first."""
+        messages = [*_OUTBOX.values(), *_DEAD_LETTERS.values()]
+        
+        if status:
+            messages = [m for m in messages if m.status == status]
+        
+        if order_id:
+            messages = [m for m in messages if m.order_id == order_id]
+        
+        messages.sort(key=lambda m: m.created_at)
+        return messages[offset:offset + limit]
+    
+    def find_due(self, limit: int, now: Optional[datetime] = None) -> List[OutboxMessage]:
+        """
+        Claim pending messages whose retry delay has elapsed, earliest due first.
+        
+        The caller must save() each claimed message once it is handled; a
+        message that is still PENDING is then queued again for its new
+        available_at. In production this is SELECT ... FOR UPDATE SKIP LOCKED
+        so several dispatchers can share the table.
+        """
+        return _OUTBOX.claim_due(limit, now or datetime.now(timezone.utc))
+    
+    def save(self, entity: OutboxMessage) -> OutboxMessage:
+        """
+        Save or update an outbox message.
+        
+        DELIVERED messages are deleted and FAILED ones move to the dead-letter
+        table, so the outbox only ever holds outstanding work.
+        """
+        if entity.status == OutboxStatus.PENDING:
+            _OUTBOX[entity.id] = entity
+            return entity
+        
+        _OUTBOX.pop(entity.id, None)
+        if entity.status == OutboxStatus.FAILED:
+            _DEAD_LETTERS[entity.id] = entity
+            _DEAD_LETTERS.move_to_end(entity.id)
+            while len(_DEAD_LETTERS) > settings.OUTBOX_DEAD_LETTER_MAX_ENTRIES:
+                _DEAD_LETTERS.popitem(last=False)
+        return entity
+    
+    def delete(self, entity_id: str) -> bool:
+        """Delete an outbox message by ID."""
+        if entity_id in _OUTBOX:
+            del _OUTBOX[entity_id]
+            return True
+        return _DEAD_LETTERS.pop(entity_id, None) is not None
+    
+    def count(self, status: Optional[OutboxStatus] = None, **filters) -> int:
+        """Count stored outbox messages, optionally by status."""
+        if status is None:
+            return len(_OUTBOX) + len(_DEAD_LETTERS)
+        if status == OutboxStatus.PENDING:
+            return len(_OUTBOX)
+        if status == OutboxStatus.FAILED:
+            return len(_DEAD_LETTERS)
+        return 0  # Delivered messages are not kept
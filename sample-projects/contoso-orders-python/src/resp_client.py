@@ -0,0 +1,254 @@
+"""
+RESP Client
+
+Minimal blocking client for the Redis serialization protocol (RESP2), with a
+connection pool and pipelining. Covers what the session backend needs
+without adding a Redis client dependency.
+
+    client = RespClient.from_url("redis://:password@localhost:6379/0")
+    client.execute("SET", "key", "value", "PX", 1000)
+    value, ttl = client.pipeline([("GET", "key"), ("PTTL", "key")])
+
+Thread-safe: each command or pipeline borrows one pooled connection.
+Subscriptions (pub/sub) get a dedicated connection of their own. Every new
+connection sends AUTH first when credentials are configured.
+"""
+
+from typing import List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlparse
+import queue
+import socket
+import threading
+
+Reply = Union[None, int, bytes, str, list, "RespError"]
+
+
+class RespError(Exception):
+    """Error reply from the server (``-ERR ...``) or a protocol failure."""
+    pass
+
+
+def encode_command(args: Sequence[object]) -> bytes:
+    """Encode one command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode()
+        else:
+            data = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+def read_reply(reader) -> Reply:
+    """
+    Read one reply from a buffered binary reader.
+
+    Error replies are returned (not raised) so a pipeline can read every
+    reply before reporting a failure.
+    """
+    line = reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by server")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        return RespError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length == -1:
+            return None
+        data = reader.read(length + 2)
+        if len(data) != length + 2:
+            raise ConnectionError("Connection closed by server")
+        return data[:-2]
+    if kind == b"*":
+        count = int(body)
+        if count == -1:
+            return None
+        return [read_reply(reader) for _ in range(count)]
+    raise RespError(f"Unexpected reply type: {line!r}")
+
+
+class _Connection:
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def close(self) -> None:
+        self.reader.close()
+        self.sock.close()
+
+
+class Subscription:
+    """
+    A pub/sub connection subscribed to one or more channels.
+
+    get_message() blocks until a message arrives. close() may be called from
+    another thread to unblock it; get_message() then raises ConnectionError.
+    """
+
+    def __init__(self, connection: _Connection, channels: Sequence[str]):
+        self._connection = connection
+        connection.sock.settimeout(None)  # Messages may be minutes apart
+        connection.sock.sendall(encode_command(("SUBSCRIBE", *channels)))
+        for _ in channels:
+            reply = read_reply(connection.reader)
+            if isinstance(reply, RespError):
+                raise reply
+
+    def get_message(self) -> Tuple[str, bytes]:
+        """Block for the next message; returns (channel, payload)."""
+        while True:
+            reply = read_reply(self._connection.reader)
+            if isinstance(reply, list) and reply and reply[0] == b"message":
+                return reply[1].decode(), reply[2]
+
+    def close(self) -> None:
+        try:
+            self._connection.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._connection.close()
+
+
+class RespClient:
+    """
+    Pooled RESP client.
+
+    At most pool_size connections are in use at once; callers beyond that
+    wait up to timeout seconds for one to be returned. A connection that
+    fails mid command is discarded rather than returned, since its reply
+    stream may be out of step.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        pool_size: int = 10,
+        timeout: float = 1.0,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.username = username
+        self.password = password
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self.round_trips = 0
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RespClient":
+        """Build a client from ``redis://[[username]:password@]host:port/db``."""
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported URL scheme: {parsed.scheme!r}")
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=db,
+            username=unquote(parsed.username) if parsed.username else None,
+            password=unquote(parsed.password) if parsed.password is not None else None,
+            **kwargs,
+        )
+
+    def execute(self, *args: object) -> Reply:
+        """Send one command and return its reply; raises RespError on error replies."""
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence[object]]) -> List[Reply]:
+        """
+        Send several commands in one write and read all replies.
+
+        One network round trip regardless of the number of commands. Raises
+        the first RespError after all replies have been read.
+        """
+        if not commands:
+            return []
+        payload = b"".join(encode_command(command) for command in commands)
+        connection = self._acquire()
+        try:
+            connection.sock.sendall(payload)
+            replies = [read_reply(connection.reader) for _ in commands]
+        except BaseException:
+            connection.close()
+            self._slots.release()
+            raise
+        self._release(connection)
+        self.round_trips += 1
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def subscribe(self, *channels: str) -> Subscription:
+        """Open a dedicated connection subscribed to channels."""
+        connection = _Connection(self.host, self.port, self.timeout)
+        try:
+            self._authenticate(connection)
+            return Subscription(connection, channels)
+        except BaseException:
+            connection.close()
+            raise
+
+    def close(self) -> None:
+        """Close pooled connections; call once no commands are in flight."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+
+    def _acquire(self) -> _Connection:
+        # A slot is held for as long as a connection is in use
+        if not self._slots.acquire(timeout=self.timeout):
+            raise ConnectionError("Timed out waiting for a pooled connection")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        connection = None
+        try:
+            connection = _Connection(self.host, self.port, self.timeout)
+            self._authenticate(connection)
+            if self.db:
+                self._handshake(connection, ("SELECT", self.db))
+        except BaseException:
+            if connection is not None:
+                connection.close()
+            self._slots.release()
+            raise
+        return connection
+
+    def _authenticate(self, connection: _Connection) -> None:
+        if self.password is None:
+            return
+        if self.username:
+            self._handshake(connection, ("AUTH", self.username, self.password))
+        else:
+            self._handshake(connection, ("AUTH", self.password))
+
+    @staticmethod
+    def _handshake(connection: _Connection, command: Sequence[object]) -> None:
+        connection.sock.sendall(encode_command(command))
+        reply = read_reply(connection.reader)
+        if isinstance(reply, RespError):
+            raise reply
+
+    def _release(self, connection: _Connection) -> None:
+        self._idle.put(connection)
+        self._slots.release()
@@ -9,7 +9,7 @@ from decimal import Decimal
 from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
-from src.models.order import Order, OrderStatus
+from src.models.order import Order, OrderQuote, OrderStatus
 
 
 class OrderItemRequest(BaseModel):
@@ -36,7 +36,7 @@ class OrderCreateRequest(BaseModel):
     """Request to create a new order."""
     customer_id: str = Field(..., description="Customer ID for the order")
     items: List[OrderItemRequest] = Field(..., min_length=1, max_length=50)
-    shipping_address: dict = Field(..., description="Shipping address")
+    shipping_address: ShippingAddressRequest = Field(..., description="Shipping address")
     notes: Optional[str] = Field(None, max_length=500)
     
     model_config = ConfigDict(
@@ -64,6 +64,35 @@ class OrderCreateRequest(BaseModel):
     )
 
 
+class OrderQuoteRequest(BaseModel):
+    """Request to price a cart without creating an order."""
+    customer_id: str = Field(..., description="Customer ID for the quote")
+    items: List[OrderItemRequest] = Field(..., min_length=1, max_length=50)
+    shipping_address: ShippingAddressRequest = Field(..., description="Shipping address")
+
+
+class OrderQuoteResponse(BaseModel):
+    """Priced cart returned by the quote endpoint."""
+    fingerprint: str
+    subtotal: Decimal
+    tax: Decimal
+    shipping_cost: Decimal
+    total: Decimal
+    item_count: int
+    
+    @classmethod
+    def from_domain(cls, quote: OrderQuote) -> "OrderQuoteResponse":
+        """Convert domain OrderQuote to response model."""
+        return cls(
+            fingerprint=quote.fingerprint,
+            subtotal=quote.subtotal,
+            tax=quote.tax,
+            shipping_cost=quote.shipping_cost,
+            total=quote.total,
+            item_count=quote.item_count,
+        )
+
+
 class OrderUpdateRequest(BaseModel):
     """Request to update an existing order."""
     shipping_address: Optional[ShippingAddressRequest] = None
@@ -105,6 +134,7 @@ class OrderResponse(BaseModel):
     payment_id: Optional[str] = None
     tracking_number: Optional[str] = None
     notes: Optional[str] = None
+    payment_error: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -142,6 +172,7 @@ class OrderResponse(BaseModel):
             payment_id=order.payment_id,
             tracking_number=order.tracking_number,
             notes=order.notes,
+            payment_error=order.payment_error,
             created_at=order.created_at,
             updated_at=order.updated_at,
         )
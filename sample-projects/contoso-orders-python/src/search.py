@@ -0,0 +1,145 @@
+"""
+In-Process Text Search
+
+Dependency-free trigram index for fuzzy, partial-string lookups.
+
+Text is lowercased and split into words; each word is padded (two spaces
+before, one after, as PostgreSQL pg_trgm does) and cut into trigrams, so
+"smi" matches "Smith" and small typos still share most trigrams.
+
+A document's score for a query is the fraction of the query's trigrams it
+contains, with shorter documents ranked first among equal scores. Candidates
+are found by prefix filtering: a document scoring at least min_score must
+appear in one of the query's rarest trigram posting lists, so common trigrams
+(``com`` in every email) are only probed, never scanned. When at least
+``limit`` documents contain every query trigram, only those are ranked.
+"""
+
+from collections import Counter
+from math import ceil
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+import heapq
+import re
+import sys
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct padded trigrams of every word in text."""
+    grams: Set[str] = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Inverted index of trigram -> documents.
+
+    Documents are numbered internally so posting lists hold small ints rather
+    than key strings. Not thread-safe: callers serialize writes and searches.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._numbers: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = []
+        self._texts: List[Optional[str]] = []
+        self._sizes: List[int] = []
+        self._free: List[int] = []  # Numbers of removed documents, for reuse
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index text under key, replacing any previous text for key."""
+        self.remove(key)
+        grams = trigrams(text)
+        if self._free:
+            number = self._free.pop()
+            self._keys[number], self._texts[number], self._sizes[number] = key, text, len(grams)
+        else:
+            number = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(text)
+            self._sizes.append(len(grams))
+        self._numbers[key] = number
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(number)
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop key from the index. Returns True if it was indexed."""
+        number = self._numbers.pop(key, None)
+        if number is None:
+            return False
+        for gram in trigrams(self._texts[number]):
+            posting = self._postings[gram]
+            posting.discard(number)
+            if not posting:
+                del self._postings[gram]
+        self._keys[number] = self._texts[number] = None
+        self._sizes[number] = 0
+        self._free.append(number)
+        return True
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        min_score: float = 0.5,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Best matches for query as (key, score), highest score first.
+
+        score is the fraction of the query's trigrams found in the document.
+        """
+        grams = trigrams(query)
+        if not grams or limit <= 0:
+            return []
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in grams), key=len,
+        )
+        if not postings[0]:
+            full: Set[int] = set()
+        else:
+            full = postings[0].intersection(*postings[1:])
+        if len(full) >= limit:
+            # Enough documents contain the whole query; partial matches
+            # cannot outrank them
+            best = heapq.nsmallest(limit, full, key=self._sizes.__getitem__)
+            return [(self._keys[number], 1.0) for number in best]
+
+        needed = max(1, ceil(min_score * len(postings)))
+        # A document missing every one of the rarest (len - needed + 1)
+        # trigrams cannot contain `needed` of them
+        prefix = len(postings) - needed + 1
+        shared: Counter = Counter()
+        for posting in postings[:prefix]:
+            shared.update(posting)
+        for posting in postings[prefix:]:
+            shared.update(posting.intersection(shared.keys()))
+
+        # Sort key: score, then fewer trigrams (a tighter match)
+        best = heapq.nlargest(
+            limit,
+            (number for number, count in shared.items() if count >= needed),
+            key=lambda number: (shared[number], -self._sizes[number]),
+        )
+        return [(self._keys[number], shared[number] / len(postings)) for number in best]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index (excluding the keys themselves)."""
+        total = sum(
+            sys.getsizeof(obj)
+            for obj in (self._postings, self._numbers, self._keys, self._texts, self._sizes, self._free)
+        )
+        total += sum(sys.getsizeof(gram) + sys.getsizeof(posting) for gram, posting in self._postings.items())
+        total += sum(sys.getsizeof(text) for text in self._texts if text is not None)
+        # Document numbers above 256 are separate int objects
+        total += sum(sys.getsizeof(number) for number in self._numbers.values() if number > 256)
+        return total
@@ -0,0 +1,196 @@
+"""
+Circuit Breaker
+
+Fails fast when a downstream dependency is unhealthy instead of tying up
+workers in timeouts and retry backoff.
+
+States:
+- CLOSED: calls pass through; outcomes are recorded in a rolling window
+- OPEN: calls are rejected immediately with CircuitOpenError
+- HALF_OPEN: after the open period, a few trial calls are let through;
+  if they all succeed the breaker closes, any failure re-opens it
+"""
+
+from collections import deque
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Tuple, TypeVar
+import time
+import structlog
+
+from src.config import settings
+from src.metrics import metrics
+from src.services.gateway_client import PaymentGatewayError
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitState(Enum):
+    """Circuit breaker states (value is the exported gauge value)."""
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class CircuitOpenError(PaymentGatewayError):
+    """Raised without calling the gateway while the breaker is open."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a rolling time window.
+
+    The breaker opens when, within the last ``window_seconds``, at least
+    ``minimum_calls`` calls were made and the fraction that failed is at or
+    above ``failure_rate_threshold``.
+
+    Only PaymentGatewayError (timeouts, connection errors, 5xx) counts as a
+    failure; declines and validation errors are the caller's problem, not the
+    gateway's.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = settings.PAYMENT_BREAKER_FAILURE_RATE,
+        minimum_calls: int = settings.PAYMENT_BREAKER_MIN_CALLS,
+        window_seconds: float = settings.PAYMENT_BREAKER_WINDOW_SECONDS,
+        open_seconds: float = settings.PAYMENT_BREAKER_OPEN_SECONDS,
+        half_open_max_calls: int = settings.PAYMENT_BREAKER_HALF_OPEN_CALLS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (timestamp, failed)
+        self._failures = 0
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        metrics.set_gauge("payment_circuit_state", self._state.value, breaker=name)
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state; an expired OPEN period moves to HALF_OPEN."""
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.open_seconds
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        """Failure fraction within the rolling window."""
+        self._prune(self._clock())
+        return self._failures / len(self._outcomes) if self._outcomes else 0.0
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` under the breaker.
+
+        Raises CircuitOpenError immediately, without calling ``fn``, while open.
+        """
+        admitted_in = self._acquire()
+        try:
+            result = await fn()
+        except PaymentGatewayError:
+            self._record(admitted_in, failed=True)
+            raise
+        except BaseException:
+            # Not the gateway's fault; release a half-open slot without judging
+            if admitted_in == self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight -= 1
+            raise
+        self._record(admitted_in, failed=False)
+        return result
+
+    def _acquire(self) -> CircuitState:
+        """Admit a call or raise CircuitOpenError; returns the admitting state."""
+        state = self.state
+        if state == CircuitState.OPEN:
+            metrics.inc("payment_circuit_rejected_total", breaker=self.name)
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        if state == CircuitState.HALF_OPEN:
+            if self._half_open_in_flight >= self.half_open_max_calls:
+                metrics.inc("payment_circuit_rejected_total", breaker=self.name)
+                raise CircuitOpenError(f"Circuit '{self.name}' is half-open")
+            self._half_open_in_flight += 1
+        return state
+
+    def _record(self, admitted_in: CircuitState, failed: bool) -> None:
+        metrics.inc(
+            "payment_circuit_calls_total",
+            breaker=self.name,
+            outcome="failure" if failed else "success",
+        )
+
+        if admitted_in != self._state:
+            # Straggler admitted before the last transition; its outcome
+            # says nothing about the current state
+            return
+
+        if self._state == CircuitState.HALF_OPEN:
+            self._half_open_in_flight -= 1
+            if failed:
+                self._open()
+                return
+            self._half_open_successes += 1
+            if self._half_open_successes >= self.half_open_max_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+
+        now = self._clock()
+        self._outcomes.append((now, failed))
+        if failed:
+            self._failures += 1
+        self._prune(now)
+
+        if (
+            len(self._outcomes) >= self.minimum_calls
+            and self._failures / len(self._outcomes) >= self.failure_rate_threshold
+        ):
+            self._open()
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            _, failed = self._outcomes.popleft()
+            if failed:
+                self._failures -= 1
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, new_state: CircuitState) -> None:
+        old_state = self._state
+        self._state = new_state
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        if new_state == CircuitState.CLOSED:
+            self._outcomes.clear()
+            self._failures = 0
+
+        metrics.set_gauge("payment_circuit_state", new_state.value, breaker=self.name)
+        metrics.inc(
+            "payment_circuit_transitions_total",
+            breaker=self.name,
+            from_state=old_state.name.lower(),
+            to_state=new_state.name.lower(),
+        )
+        log = logger.warning if new_state == CircuitState.OPEN else logger.info
+        log(
+            "circuit_state_changed",
+            breaker=self.name,
+            from_state=old_state.name,
+            to_state=new_state.name,
+        )
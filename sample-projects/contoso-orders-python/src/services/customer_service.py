@@ -2,14 +2,31 @@
 Customer Service
 
 Business logic for customer management.
+
+Indexes over _CUSTOMERS, maintained on every write:
+- Emails are unique regardless of case. A normalized email -> customer ID
+  index makes lookups O(1); creates and updates check and claim an email under
+  one lock, so two concurrent requests cannot register the same address.
+- (created_at, id) keys sorted per (tier, is_active) segment. Listings
+  merge the segments matching the filters from the cursor onwards, so a page
+  costs O(page size), not O(customers), and customers are listed in creation
+  order. New customers sort last, so creating one appends to its segment;
+  only tier changes and deactivation move a key between segments.
+- A trigram index over name, company and email for fuzzy search.
 """
 
-from typing import List, Optional
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
+import heapq
 import logging
+import threading
 import uuid
 
+from src.exceptions import BusinessException
 from src.models.customer import Customer, CustomerTier
+from src.search import TrigramIndex
 
 # Using stdlib logging here (inconsistent with order_service which uses structlog)
 logger = logging.getLogger(__name__)
@@ -43,6 +60,101 @@ _CUSTOMERS: dict[str, Customer] = {
 }
 
 
+# Normalized email -> customer ID, for every customer in _CUSTOMERS
+_EMAIL_INDEX: dict[str, str] = {}
+
+# (created_at as a UTC timestamp, customer id)
+CustomerKey = Tuple[float, str]
+
+# Sorted customer keys per (tier, is_active)
+_SEGMENTS: dict[Tuple[CustomerTier, bool], List[CustomerKey]] = {}
+
+# Fuzzy search over name, company and email
+_SEARCH_INDEX = TrigramIndex()
+
+# Serializes customer writes so index checks and updates are atomic; listings
+# take it too, since they walk the segment lists
+_WRITE_LOCK = threading.Lock()
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form used for email uniqueness and lookups."""
+    return email.strip().lower()
+
+
+def _search_text(customer: Customer) -> str:
+    return " ".join(filter(None, (customer.name, customer.company, customer.email)))
+
+
+def _customer_key(customer: Customer) -> CustomerKey:
+    created_at = customer.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)  # Naive means UTC
+    return (created_at.timestamp(), customer.id)
+
+
+def _add_to_segment(customer: Customer) -> None:
+    # Newest key goes last, so this is an append for new customers
+    insort(_SEGMENTS.setdefault((customer.tier, customer.is_active), []), _customer_key(customer))
+
+
+def _remove_from_segment(customer: Customer) -> None:
+    """Drop a customer's segment entry; call before changing tier or is_active."""
+    segment = _SEGMENTS.get((customer.tier, customer.is_active), [])
+    key = _customer_key(customer)
+    position = bisect_left(segment, key)
+    if position < len(segment) and segment[position] == key:
+        del segment[position]
+
+
+def _index_customer(customer: Customer) -> None:
+    _EMAIL_INDEX[normalize_email(customer.email)] = customer.id
+    _add_to_segment(customer)
+    _SEARCH_INDEX.add(customer.id, _search_text(customer))
+
+
+def _ids_from(segment: List[CustomerKey], start: int) -> Iterator[CustomerKey]:
+    # Indexes from start directly; islice would step over the skipped keys
+    for i in range(start, len(segment)):
+        yield segment[i]
+
+
+def _format_cursor(key: CustomerKey) -> str:
+    return f"{key[0]!r}:{key[1]}"
+
+
+def _parse_cursor(cursor: str) -> CustomerKey:
+    timestamp, customer_id = cursor.split(":", 1)
+    return (float(timestamp), customer_id)
+
+
+def rebuild_indexes() -> None:
+    """Rebuild every index from _CUSTOMERS (after loading or restoring it)."""
+    _EMAIL_INDEX.clear()
+    _SEGMENTS.clear()
+    _SEARCH_INDEX.clear()
+    for customer in _CUSTOMERS.values():
+        _EMAIL_INDEX[normalize_email(customer.email)] = customer.id
+        _SEGMENTS.setdefault((customer.tier, customer.is_active), []).append(_customer_key(customer))
+        _SEARCH_INDEX.add(customer.id, _search_text(customer))
+    for segment in _SEGMENTS.values():
+        segment.sort()
+
+
+rebuild_indexes()
+
+
+def _claim_email(email: str, customer_id: str) -> None:
+    """Reserve email for customer_id; caller holds _WRITE_LOCK."""
+    owner = _EMAIL_INDEX.get(normalize_email(email))
+    if owner is not None and owner != customer_id:
+        raise BusinessException(
+            error_code="EMAIL_ALREADY_REGISTERED",
+            message="Email already registered",
+            http_status=409,
+        )
+
+
 class CustomerService:
     """Service for customer operations."""
     
@@ -53,19 +165,84 @@ class CustomerService:
         limit: int = 50,
     ) -> List[Customer]:
         """Get list of customers with optional filtering."""
-        customers = list(_CUSTOMERS.values())
+        customers, _ = self.get_customers_page(tier=tier, active_only=active_only, limit=limit)
+        return customers
+    
+    def get_customers_page(
+        self,
+        tier: Optional[str] = None,
+        active_only: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Customer], Optional[str]]:
+        """
+        One page of customers, oldest first, with optional filtering.
         
-        if active_only:
-            customers = [c for c in customers if c.is_active]
+        Returns (customers, next_cursor). Pass next_cursor back to get the
+        following page; it is None on the last page. Customers created while
+        paging sort after every existing customer, so pages never skip or
+        repeat anyone.
         
+        Raises BusinessException (INVALID_CURSOR) for a malformed cursor.
+        """
+        tiers = list(CustomerTier)
         if tier:
             try:
-                tier_enum = CustomerTier(tier.lower())
-                customers = [c for c in customers if c.tier == tier_enum]
+                tiers = [CustomerTier(tier.lower())]
             except ValueError:
                 logger.warning(f"Invalid tier filter: {tier}")
+        statuses = [True] if active_only else [True, False]
+        try:
+            after = _parse_cursor(cursor) if cursor else None
+        except ValueError:
+            raise BusinessException(
+                error_code="INVALID_CURSOR",
+                message="Malformed pagination cursor",
+            )
+        
+        with _WRITE_LOCK:
+            runs = []
+            for segment_key in [(t, s) for t in tiers for s in statuses]:
+                segment = _SEGMENTS.get(segment_key, [])
+                start = bisect_right(segment, after) if after else 0
+                runs.append(_ids_from(segment, start))
+            keys = list(islice(heapq.merge(*runs), limit + 1))
+            customers = [_CUSTOMERS[customer_id] for _, customer_id in keys[:limit]]
         
-        return customers[:limit]
+        next_cursor = _format_cursor(keys[limit - 1]) if len(keys) > limit else None
+        return customers, next_cursor
+    
+    def search_customers(
+        self,
+        query: str,
+        limit: int = 20,
+        active_only: bool = False,
+    ) -> List[Tuple[Customer, float]]:
+        """
+        Fuzzy search by partial name, company or email.
+        
+        Returns (customer, score) pairs, best first; score is the fraction of
+        the query's trigrams the customer matches.
+        """
+        # Over-fetch so filtering out inactive customers still fills the page
+        fetch = limit * 4 if active_only else limit
+        with _WRITE_LOCK:
+            matches = _SEARCH_INDEX.search(query, limit=fetch)
+            results = [(_CUSTOMERS[customer_id], score) for customer_id, score in matches]
+        if active_only:
+            results = [(c, score) for c, score in results if c.is_active]
+        return results[:limit]
+    
+    def search_index_stats(self) -> dict:
+        """Size of the search index, for capacity planning."""
+        with _WRITE_LOCK:
+            customers = len(_SEARCH_INDEX)
+            memory = _SEARCH_INDEX.memory_bytes()
+        return {
+            "customers": customers,
+            "memory_bytes": memory,
+            "bytes_per_customer": memory // customers if customers else 0,
+        }
     
     def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
         """
@@ -76,12 +253,11 @@ class CustomerService:
         return _CUSTOMERS.get(customer_id)
     
     def get_customer_by_email(self, email: str) -> Optional[Customer]:
-        """Look up customer by email address."""
-        email_lower = email.lower()
-        for customer in _CUSTOMERS.values():
-            if customer.email.lower() == email_lower:
-                return customer
-        return None
+        """Look up customer by email address (case-insensitive)."""
+        customer_id = _EMAIL_INDEX.get(normalize_email(email))
+        if customer_id is None:
+            return None
+        return _CUSTOMERS.get(customer_id)
     
     def create_customer(
         self,
@@ -89,7 +265,11 @@ class CustomerService:
         email: str,
         company: Optional[str] = None,
     ) -> Customer:
-        """Create a new customer."""
+        """
+        Create a new customer.
+        
+        Raises BusinessException (EMAIL_ALREADY_REGISTERED) if the email is taken.
+        """
         customer_id = f"cust_{uuid.uuid4().hex[:8]}"
         
         customer = Customer(
@@ -102,7 +282,10 @@ class CustomerService:
             created_at=datetime.now(timezone.utc),
         )
         
-        _CUSTOMERS[customer_id] = customer
+        with _WRITE_LOCK:
+            _claim_email(email, customer_id)
+            _CUSTOMERS[customer_id] = customer
+            _index_customer(customer)
         logger.info(f"Created new customer: {customer_id}")
         
         return customer
@@ -114,21 +297,35 @@ class CustomerService:
         email: Optional[str] = None,
         tier: Optional[CustomerTier] = None,
     ) -> Optional[Customer]:
-        """Update customer details."""
+        """
+        Update customer details.
+        
+        Raises BusinessException (EMAIL_ALREADY_REGISTERED) if a new email
+        belongs to another customer.
+        """
         customer = self.get_customer_by_id(customer_id)
         
         if customer is None:
             return None
         
-        if name:
-            customer.name = name
-        if email:
-            customer.email = email
-        if tier:
-            customer.tier = tier
-        
-        customer.updated_at = datetime.now(timezone.utc)
-        _CUSTOMERS[customer_id] = customer
+        with _WRITE_LOCK:
+            # Only the indexes over fields that change are touched
+            if email:
+                _claim_email(email, customer_id)
+                _EMAIL_INDEX.pop(normalize_email(customer.email), None)
+                customer.email = email
+                _EMAIL_INDEX[normalize_email(email)] = customer_id
+            if name:
+                customer.name = name
+            if name or email:
+                _SEARCH_INDEX.add(customer_id, _search_text(customer))
+            if tier and tier != customer.tier:
+                _remove_from_segment(customer)
+                customer.tier = tier
+                _add_to_segment(customer)
+            
+            customer.updated_at = datetime.now(timezone.utc)
+            _CUSTOMERS[customer_id] = customer
         
         return customer
     
@@ -140,8 +337,11 @@ class CustomerService:
         """
         customer = self.get_customer_by_id(customer_id)
         if customer:
-            customer.is_active = False
-            customer.updated_at = datetime.now(timezone.utc)
+            with _WRITE_LOCK:
+                _remove_from_segment(customer)
+                customer.is_active = False
+                customer.updated_at = datetime.now(timezone.utc)
+                _add_to_segment(customer)
             return True
         return False
     
@@ -0,0 +1,203 @@
+"""
+Payment Gateway HTTP Client
+
+Shared, pooled async HTTP client for the Contoso Payment Gateway.
+
+One client is created by the ServiceContainer at startup and closed at
+shutdown, so connections (and their TCP/TLS handshakes) are reused across
+orders instead of being paid per call.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import asyncio
+import time
+import httpx
+import structlog
+
+from src.config import settings
+from src.metrics import metrics
+
+logger = structlog.get_logger(__name__)
+
+
+class PaymentGatewayError(Exception):
+    """Exception for payment gateway failures."""
+    pass
+
+
+class PaymentGatewayTimeout(PaymentGatewayError):
+    """The gateway did not answer within the request timeout."""
+    pass
+
+
+class PaymentDeclinedError(Exception):
+    """
+    The gateway rejected the request (4xx).
+
+    Not a PaymentGatewayError on purpose: declines are final and must not be retried.
+    """
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class PaymentGatewayClient:
+    """
+    Pooled HTTP client with bounded concurrency.
+
+    - Keep-alive connection pool sized by PAYMENT_GATEWAY_MAX_CONNECTIONS
+    - At most PAYMENT_GATEWAY_MAX_CONCURRENCY requests in flight; extra
+      callers wait for a slot instead of opening more connections
+    - Every request, including its wait for a slot, is bounded by
+      PAYMENT_GATEWAY_TIMEOUT (or the per-request timeout)
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.PAYMENT_GATEWAY_URL,
+        timeout: float = settings.PAYMENT_GATEWAY_TIMEOUT,
+        max_connections: int = settings.PAYMENT_GATEWAY_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.PAYMENT_GATEWAY_MAX_KEEPALIVE,
+        max_concurrency: int = settings.PAYMENT_GATEWAY_MAX_CONCURRENCY,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_concurrency = max_concurrency
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self) -> None:
+        """Open the connection pool."""
+        if self._client is not None:
+            return
+        # Created here, not in __init__, so it binds to the running event loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+            ),
+            transport=self._transport,
+        )
+        logger.info(
+            "payment_gateway_client_started",
+            base_url=self.base_url,
+            max_connections=self.max_connections,
+            max_concurrency=self.max_concurrency,
+        )
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info("payment_gateway_client_closed")
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None) -> AsyncIterator[float]:
+        """
+        Hold one of the max_concurrency request slots.
+
+        Waits at most timeout (default: the client timeout) for a slot and
+        yields the part of timeout that is left, for use with send().
+
+        Raises PaymentGatewayTimeout if no slot frees up in time.
+        """
+        if self._client is None:
+            raise PaymentGatewayError("Payment gateway client is not started")
+
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        # Not wait_for: before Python 3.12 it can drop a permit acquired just
+        # as the timeout fires. An abandoned acquire instead releases any
+        # permit it ends up holding.
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            done, _ = await asyncio.wait({acquire}, timeout=timeout)
+        except BaseException:
+            self._abandon(acquire)
+            raise
+        if not done:
+            self._abandon(acquire)
+            metrics.inc("payment_gateway_slot_timeouts_total")
+            raise PaymentGatewayTimeout(
+                f"No gateway request slot free within {timeout:.3f}s"
+            )
+        try:
+            yield max(0.0, timeout - (time.monotonic() - start))
+        finally:
+            self._semaphore.release()
+
+    def _abandon(self, acquire: "asyncio.Future[bool]") -> None:
+        acquire.cancel()
+        acquire.add_done_callback(self._release_if_acquired)
+
+    def _release_if_acquired(self, acquire: "asyncio.Future[bool]") -> None:
+        if not acquire.cancelled() and acquire.exception() is None:
+            self._semaphore.release()
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Send a request from within slot() and return the decoded JSON body.
+
+        Same errors as request().
+        """
+        if self._client is None:
+            raise PaymentGatewayError("Payment gateway client is not started")
+        if timeout is not None and timeout <= 0:
+            raise PaymentGatewayTimeout(f"Gateway timeout: {method} {path}")
+
+        try:
+            response = await self._client.request(
+                method,
+                path,
+                json=json,
+                headers=headers,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            )
+        except httpx.TimeoutException as e:
+            raise PaymentGatewayTimeout(f"Gateway timeout: {method} {path}") from e
+        except httpx.TransportError as e:
+            raise PaymentGatewayError(f"Gateway unreachable: {e}") from e
+
+        if response.status_code >= 500:
+            raise PaymentGatewayError(f"Gateway error {response.status_code}: {method} {path}")
+        if response.status_code >= 400:
+            raise PaymentDeclinedError(response.status_code, response.text)
+        return response.json()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Send a request and return the decoded JSON body.
+
+        timeout overrides the client default for this request only, and
+        covers both the wait for a slot and the request itself.
+
+        Raises PaymentGatewayTimeout on timeouts, PaymentGatewayError for
+        connection errors and 5xx, PaymentDeclinedError for 4xx.
+        """
+        async with self.slot(timeout) as remaining:
+            return await self.send(method, path, json=json, headers=headers, timeout=remaining)
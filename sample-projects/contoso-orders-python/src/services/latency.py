@@ -0,0 +1,90 @@
+"""
+Gateway Latency Tracking
+
+Rolling per-operation latency percentiles, used to derive adaptive timeouts
+and hedging delays for payment gateway calls.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+import math
+
+from src.config import settings
+from src.metrics import metrics
+
+
+class _OperationWindow:
+    """Last N latencies of one operation, with lazily refreshed percentiles."""
+
+    # Re-sort at most once per this many new samples
+    REFRESH_EVERY = 20
+
+    def __init__(self, window_size: int):
+        self.samples: Deque[float] = deque(maxlen=window_size)
+        self._sorted: list[float] = []
+        self._stale = 0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self._stale += 1
+
+    def percentile(self, q: float) -> float:
+        if self._stale >= self.REFRESH_EVERY or len(self._sorted) != len(self.samples):
+            self._sorted = sorted(self.samples)
+            self._stale = 0
+        index = min(len(self._sorted) - 1, max(0, math.ceil(q * len(self._sorted)) - 1))
+        return self._sorted[index]
+
+
+class LatencyTracker:
+    """
+    Rolling latency percentiles per gateway operation.
+
+    Timeouts are derived as ``p99 * multiplier``, clamped to
+    [min_timeout, max_timeout]. Until an operation has ``min_samples``
+    observations the static max_timeout (PAYMENT_GATEWAY_TIMEOUT) is used.
+    """
+
+    def __init__(
+        self,
+        window_size: int = settings.PAYMENT_LATENCY_WINDOW,
+        min_samples: int = settings.PAYMENT_LATENCY_MIN_SAMPLES,
+        timeout_multiplier: float = settings.PAYMENT_TIMEOUT_P99_MULTIPLIER,
+        min_timeout: float = settings.PAYMENT_TIMEOUT_MIN_SECONDS,
+        max_timeout: float = settings.PAYMENT_GATEWAY_TIMEOUT,
+    ):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._windows: Dict[str, _OperationWindow] = {}
+
+    def record(self, operation: str, seconds: float) -> None:
+        """Record one observed call latency."""
+        window = self._windows.get(operation)
+        if window is None:
+            window = self._windows[operation] = _OperationWindow(self.window_size)
+        window.add(seconds)
+        metrics.observe(
+            "payment_gateway_latency_ms",
+            seconds * 1000,
+            operation=operation,
+        )
+
+    def percentile(self, operation: str, q: float) -> Optional[float]:
+        """The q-th latency percentile in seconds, or None with too few samples."""
+        window = self._windows.get(operation)
+        if window is None or len(window.samples) < self.min_samples:
+            return None
+        return window.percentile(q)
+
+    def timeout_for(self, operation: str) -> float:
+        """Adaptive timeout in seconds for the next call of an operation."""
+        p99 = self.percentile(operation, 0.99)
+        if p99 is None:
+            timeout = self.max_timeout
+        else:
+            timeout = min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_multiplier))
+        metrics.set_gauge("payment_gateway_timeout_seconds", timeout, operation=operation)
+        return timeout
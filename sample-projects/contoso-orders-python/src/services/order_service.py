@@ -8,10 +8,20 @@ pricing, and state management.
 from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 from decimal import Decimal
+import hashlib
+import json
 import structlog
 
-from src.models.order import Order, OrderItem, OrderStatus, ShippingAddress
+from src.cache import TTLCache
+from src.deadline import DeadlineExceeded
+from src.etag import etag_matches
+from src.exceptions import BusinessException  # Re-exported for existing imports
+from src.models.customer import CustomerOrderStats
+from src.models.order import Order, OrderItem, OrderQuote, OrderStatus, ShippingAddress
+from src.models.outbox import PaymentCommandType
 from src.repositories.order_repo import OrderRepository
+from src.services.customer_service import CustomerService
+from src.services.outbox_dispatcher import new_payment_command
 from src.services.payment_service import PaymentService
 from src.legacy.auth_provider import Session
 from src.config import settings
@@ -20,28 +30,22 @@ from src.config import settings
 logger = structlog.get_logger(__name__)
 
 
-class BusinessException(Exception):
+# Quote cache shared by every OrderService instance, keyed by cart fingerprint
+_QUOTE_CACHE: TTLCache[str, OrderQuote] = TTLCache(
+    max_entries=settings.QUOTE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.QUOTE_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_quote_cache() -> None:
     """
-    Standard business exception for the application.
+    Drop every cached quote.
     
-    Company Standard: ALL business logic exceptions MUST use this class.
-    Never raise raw exceptions from service layer.
-    
-    Error codes should be SCREAMING_SNAKE_CASE and documented in docs/error-codes.md
+    Must be called whenever product prices or pricing rules (tax, shipping)
+    change, otherwise checkout pages may show stale totals until the TTL expires.
     """
-    
-    def __init__(
-        self,
-        error_code: str,
-        message: str,
-        http_status: int = 400,
-        details: Optional[dict] = None,
-    ):
-        self.error_code = error_code
-        self.message = message
-        self.http_status = http_status
-        self.details = details or {}
-        super().__init__(message)
+    _QUOTE_CACHE.clear()
+    logger.info("quote_cache_invalidated")
 
 
 class OrderService:
@@ -52,10 +56,17 @@ class OrderService:
     External service calls (payments) are wrapped with retry logic.
     """
     
-    def __init__(self):
-        self.repository = OrderRepository()
-        self.payment_service = PaymentService()
-        # TODO: Inject these dependencies properly
+    def __init__(
+        self,
+        repository: Optional[OrderRepository] = None,
+        payment_service: Optional[PaymentService] = None,
+        customer_service: Optional[CustomerService] = None,
+    ):
+        # Shared instances are injected by the ServiceContainer (src/container.py);
+        # defaults keep direct construction working in scripts and tests.
+        self.repository = repository or OrderRepository()
+        self.payment_service = payment_service or PaymentService()
+        self.customer_service = customer_service or CustomerService()
     
     async def create_order(
         self,
@@ -89,10 +100,10 @@ class OrderService:
             )
         
         # Calculate totals
-        subtotal = sum(item.total_price for item in order_items)
-        tax = self._calculate_tax(subtotal, shipping_address)
-        shipping_cost = self._calculate_shipping(order_items, shipping_address)
-        total = subtotal + tax + shipping_cost
+        shipping_address = self._normalize_address(shipping_address)
+        subtotal, tax, shipping_cost, total = self._calculate_totals(
+            order_items, shipping_address
+        )
         
         # Create order entity
         order = Order(
@@ -109,19 +120,72 @@ class OrderService:
             updated_at=datetime.now(timezone.utc),
         )
         
-        # Persist order
-        saved_order = self.repository.save(order)
-        
         # Authorize payment (async in background if enabled)
         if settings.ENABLE_ASYNC_ORDER_PROCESSING:
-            # TODO: Move to background task queue
-            await self._authorize_payment_async(saved_order)
+            # Order and authorize command are written together; the
+            # OutboxDispatcher calls the gateway after we return.
+            saved_order = self.repository.save_with_outbox(order, [
+                new_payment_command(order.id, PaymentCommandType.AUTHORIZE),
+            ])
         else:
+            saved_order = self.repository.save(order)
             await self._authorize_payment_async(saved_order)
         
         logger.info("order_created", order_id=saved_order.id, total=str(total))
         return saved_order
     
+    async def quote_order(
+        self,
+        customer_id: str,
+        items: List[dict],
+        shipping_address: dict,
+        session: Session,
+    ) -> OrderQuote:
+        """
+        Price a cart without creating an order.
+        
+        Uses the same pricing code as create_order. Results are cached by a
+        canonical fingerprint of (customer tier, items, shipping address).
+        """
+        if not self._can_create_order(session, customer_id):
+            raise BusinessException(
+                error_code="UNAUTHORIZED_CUSTOMER",
+                message="You can only request quotes for your own account",
+                http_status=403,
+            )
+        
+        order_items = self._validate_and_build_items(items)
+        
+        if not order_items:
+            raise BusinessException(
+                error_code="EMPTY_ORDER",
+                message="Order must contain at least one item",
+            )
+        
+        # Normalized once, so the fingerprint and the pricing see the same address
+        shipping_address = self._normalize_address(shipping_address)
+        fingerprint = self._cart_fingerprint(customer_id, order_items, shipping_address)
+        cached = _QUOTE_CACHE.get(fingerprint)
+        if cached is not None:
+            logger.debug("quote_cache_hit", fingerprint=fingerprint)
+            return cached
+        
+        subtotal, tax, shipping_cost, total = self._calculate_totals(
+            order_items, shipping_address
+        )
+        quote = OrderQuote(
+            fingerprint=fingerprint,
+            subtotal=subtotal,
+            tax=tax,
+            shipping_cost=shipping_cost,
+            total=total,
+            item_count=sum(item.quantity for item in order_items),
+        )
+        _QUOTE_CACHE.set(fingerprint, quote)
+        
+        logger.info("order_quoted", customer_id=customer_id, total=str(total))
+        return quote
+    
     async def get_order(self, order_id: str, session: Session) -> Optional[Order]:
         """
         Get an order by ID.
@@ -166,13 +230,64 @@ class OrderService:
         
         return orders, total
     
+    async def list_customer_orders(
+        self,
+        customer_id: str,
+        status: Optional[OrderStatus],
+        limit: int,
+        cursor: Optional[str],
+        session: Session,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of a customer's order history, newest first."""
+        if not self._can_view_customer_orders(session, customer_id):
+            raise BusinessException(
+                error_code="ORDER_ACCESS_DENIED",
+                message="You do not have permission to view this customer's orders",
+                http_status=403,
+            )
+        
+        try:
+            return self.repository.find_page_by_customer(
+                customer_id, status=status, limit=limit, cursor=cursor,
+            )
+        except ValueError:
+            raise BusinessException(
+                error_code="INVALID_CURSOR",
+                message="Malformed pagination cursor",
+            )
+    
+    async def get_customer_order_stats(
+        self,
+        customer_id: str,
+        session: Session,
+    ) -> Optional[CustomerOrderStats]:
+        """
+        Lifetime spend, order count, average value and last order time.
+        
+        None if the session may not see this customer's orders (same rule
+        as list_customer_orders: admins and the customer only).
+        """
+        if not self._can_view_customer_orders(session, customer_id):
+            return None
+        return self.repository.customer_stats(customer_id)
+    
+    async def top_customers_by_spend(self, limit: int) -> List[CustomerOrderStats]:
+        """Highest-spending customers first, e.g. for tier reviews."""
+        return self.repository.top_customers_by_spend(limit)
+    
     async def update_order(
         self,
         order_id: str,
         updates: dict,
         session: Session,
+        if_match: Optional[str] = None,
     ) -> Order:
-        """Update an order."""
+        """
+        Update an order.
+        
+        If if_match is given (the client's If-Match header), the update is
+        rejected unless it matches the order's current ETag.
+        """
         order = await self.get_order(order_id, session)
         
         if order is None:
@@ -182,6 +297,8 @@ class OrderService:
                 http_status=404,
             )
         
+        self._check_precondition(order, if_match)
+        
         if order.status != OrderStatus.PENDING:
             raise BusinessException(
                 error_code="ORDER_NOT_MODIFIABLE",
@@ -200,8 +317,17 @@ class OrderService:
         order.updated_at = datetime.now(timezone.utc)
         return self.repository.save(order)
     
-    async def cancel_order(self, order_id: str, session: Session) -> Order:
-        """Cancel an order."""
+    async def cancel_order(
+        self,
+        order_id: str,
+        session: Session,
+        if_match: Optional[str] = None,
+    ) -> Order:
+        """
+        Cancel an order.
+        
+        If if_match is given, the order must still be at that ETag.
+        """
         order = await self.get_order(order_id, session)
         
         if order is None:
@@ -211,26 +337,53 @@ class OrderService:
                 http_status=404,
             )
         
-        if order.status not in (OrderStatus.PENDING, OrderStatus.CONFIRMED):
+        self._check_precondition(order, if_match)
+        
+        if not order.is_cancellable:
             raise BusinessException(
                 error_code="ORDER_CANNOT_CANCEL",
                 message=f"Cannot cancel order in {order.status.value} status",
             )
         
-        # Void payment authorization
-        if order.payment_id:
-            await self.payment_service.void_authorization(order.payment_id)
-        
         order.status = OrderStatus.CANCELLED
         order.updated_at = datetime.now(timezone.utc)
         
+        # Void payment authorization
+        if settings.ENABLE_ASYNC_ORDER_PROCESSING:
+            commands = []
+            if order.payment_id:
+                commands.append(new_payment_command(
+                    order.id,
+                    PaymentCommandType.VOID_AUTHORIZATION,
+                    payment_id=order.payment_id,
+                ))
+            saved_order = self.repository.save_with_outbox(order, commands)
+        else:
+            if order.payment_id:
+                await self.payment_service.void_authorization(order.payment_id)
+            saved_order = self.repository.save(order)
+        
         logger.info("order_cancelled", order_id=order_id)
-        return self.repository.save(order)
+        return saved_order
+    
+    def _check_precondition(self, order: Order, if_match: Optional[str]) -> None:
+        """Reject the write if the client's If-Match no longer matches the order."""
+        if if_match is not None and not etag_matches(if_match, order.etag, weak=False):
+            raise BusinessException(
+                error_code="ORDER_PRECONDITION_FAILED",
+                message="Order has been modified since it was last retrieved",
+                http_status=412,
+                details={"order_id": order.id, "etag": order.etag},
+            )
     
     def _can_create_order(self, session: Session, customer_id: str) -> bool:
         """Check if session user can create order for customer."""
         return session.is_admin or session.user_id == customer_id
     
+    def _can_view_customer_orders(self, session: Session, customer_id: str) -> bool:
+        """Check if session can view a customer's order history."""
+        return session.is_admin or session.user_id == customer_id
+    
     def _can_view_order(self, session: Session, order: Order) -> bool:
         """Check if session user can view order."""
         return session.is_admin or session.user_id == order.customer_id
@@ -251,6 +404,54 @@ class OrderService:
         
         return order_items
     
+    def _calculate_totals(
+        self,
+        items: List[OrderItem],
+        shipping_address: dict,
+    ) -> Tuple[Decimal, Decimal, Decimal, Decimal]:
+        """Calculate (subtotal, tax, shipping_cost, total) for a set of items."""
+        subtotal = sum((item.total_price for item in items), Decimal("0"))
+        tax = self._calculate_tax(subtotal, shipping_address)
+        shipping_cost = self._calculate_shipping(items, shipping_address)
+        total = subtotal + tax + shipping_cost
+        return subtotal, tax, shipping_cost, total
+    
+    def _cart_fingerprint(
+        self,
+        customer_id: str,
+        items: List[OrderItem],
+        shipping_address: dict,
+    ) -> str:
+        """
+        Build a canonical hash of everything that affects a quote.
+        
+        Item order, price formatting ("10.0" vs "10.00") and address key order
+        do not change the price, so they are normalized away. The address is
+        hashed exactly as given: pass the _normalize_address() result that
+        pricing uses, so one fingerprint can never map to two prices.
+        """
+        customer = self.customer_service.get_customer_by_id(customer_id)
+        tier = customer.tier.value if customer else None
+        
+        canonical = {
+            "tier": tier,
+            "items": sorted(
+                [item.product_id, item.sku, item.quantity, format(item.unit_price.normalize(), "f")]
+                for item in items
+            ),
+            "shipping_address": shipping_address,
+        }
+        payload = json.dumps(canonical, separators=(",", ":"), sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _normalize_address(self, shipping_address: dict) -> dict:
+        """Strip surrounding whitespace from address fields and drop unset ones."""
+        return {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in shipping_address.items()
+            if value is not None
+        }
+    
     def _calculate_tax(self, subtotal: Decimal, shipping_address: dict) -> Decimal:
         """
         Calculate tax based on shipping address.
@@ -291,6 +492,14 @@ class OrderService:
             )
             order.payment_id = payment_id
             self.repository.save(order)
+        except DeadlineExceeded:
+            logger.error("payment_authorization_deadline_exceeded", order_id=order.id)
+            raise BusinessException(
+                error_code="REQUEST_DEADLINE_EXCEEDED",
+                message="The request ran out of time. Please try again.",
+                http_status=504,
+                details={"order_id": order.id},
+            )
         except Exception as e:
             logger.error("payment_authorization_failed", order_id=order.id, error=str(e))
             # Don't fail order creation - payment can be retried
@@ -0,0 +1,211 @@
+"""
+Outbox Dispatcher
+
+Delivers payment commands recorded in the outbox to the PaymentService.
+
+Order changes and their payment side effects are written together by
+OrderRepository.save_with_outbox(), so the HTTP request returns after a single
+local write. This dispatcher runs in the background for the lifetime of the
+app, delivers due messages in batches, and retries transient gateway
+failures with exponential backoff. Declines and other errors are final.
+"""
+
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
+import uuid
+import structlog
+from tenacity import RetryError
+
+from src.config import settings
+from src.models.order import OrderStatus
+from src.models.outbox import OutboxMessage, OutboxStatus, PaymentCommandType
+from src.repositories.order_repo import OrderRepository
+from src.repositories.outbox_repo import OutboxRepository
+from src.services.payment_service import (
+    PaymentDeclinedError,
+    PaymentGatewayError,
+    PaymentService,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Worth another attempt later: the gateway was down, slow, behind an open
+# breaker (CircuitOpenError and PaymentGatewayTimeout are PaymentGatewayErrors),
+# or PaymentService gave up its own retries (RetryError)
+RETRYABLE_ERRORS = (PaymentGatewayError, RetryError, asyncio.TimeoutError)
+
+
+def new_payment_command(
+    order_id: str,
+    command: PaymentCommandType,
+    **payload,
+) -> OutboxMessage:
+    """Build a pending outbox message for a payment command."""
+    return OutboxMessage(
+        id=f"OBX-{uuid.uuid4().hex[:16].upper()}",
+        order_id=order_id,
+        command=command,
+        payload=payload,
+    )
+
+
+class OutboxDispatcher:
+    """
+    Background delivery of outbox messages.
+
+    Delivery is at-least-once. A message is marked DELIVERED only after the
+    PaymentService call succeeds. Transient failures (RETRYABLE_ERRORS) are
+    retried; after max_attempts the message is marked FAILED, logged and
+    moved to the dead-letter table for manual follow-up. Any other error is FAILED at once: a declined
+    authorization also moves its order to PAYMENT_FAILED.
+    """
+
+    def __init__(
+        self,
+        outbox_repository: OutboxRepository,
+        order_repository: OrderRepository,
+        payment_service: PaymentService,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        retry_backoff: float = settings.OUTBOX_RETRY_BACKOFF_SECONDS,
+    ):
+        self.outbox_repository = outbox_repository
+        self.order_repository = order_repository
+        self.payment_service = payment_service
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the background delivery loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="outbox-dispatcher")
+            logger.info("outbox_dispatcher_started", batch_size=self.batch_size)
+
+    async def stop(self) -> None:
+        """Stop the loop, then make one final delivery pass."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.dispatch_once()
+        logger.info("outbox_dispatcher_stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.dispatch_once()
+            except Exception:
+                logger.exception("outbox_dispatch_failed")
+                delivered = 0
+            # A full batch means there is probably more work waiting
+            if delivered < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def dispatch_once(self) -> int:
+        """
+        Deliver one batch of due messages concurrently.
+
+        Returns the number of messages attempted.
+        """
+        batch = self.outbox_repository.find_due(limit=self.batch_size)
+        if not batch:
+            return 0
+
+        await asyncio.gather(*(self._deliver(message) for message in batch))
+        return len(batch)
+
+    async def _deliver(self, message: OutboxMessage) -> None:
+        message.attempts += 1
+        try:
+            await self._execute(message)
+        except RETRYABLE_ERRORS as e:
+            message.last_error = str(e)
+            if message.attempts >= self.max_attempts:
+                self._fail(message, e)
+            else:
+                delay = self.retry_backoff * (2 ** (message.attempts - 1))
+                message.available_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                logger.warning(
+                    "outbox_message_retry",
+                    message_id=message.id,
+                    attempts=message.attempts,
+                    retry_in_seconds=delay,
+                )
+        except PaymentDeclinedError as e:
+            message.last_error = str(e)
+            self._fail(message, e)
+            if message.command == PaymentCommandType.AUTHORIZE:
+                self._record_payment_failure(message.order_id, str(e))
+        except Exception as e:
+            message.last_error = str(e)
+            self._fail(message, e)
+        else:
+            message.status = OutboxStatus.DELIVERED
+            message.delivered_at = datetime.now(timezone.utc)
+        finally:
+            # find_due claimed the message; saving releases it, even if the
+            # dispatcher was cancelled mid-delivery
+            self.outbox_repository.save(message)
+
+    def _fail(self, message: OutboxMessage, error: Exception) -> None:
+        message.status = OutboxStatus.FAILED
+        logger.error(
+            "outbox_message_failed",
+            message_id=message.id,
+            order_id=message.order_id,
+            command=message.command.value,
+            attempts=message.attempts,
+            error=str(error),
+        )
+
+    def _record_payment_failure(self, order_id: str, reason: str) -> None:
+        """Move a still-pending order to PAYMENT_FAILED after a decline."""
+        order = self.order_repository.find_by_id(order_id)
+        if order is None or not order.can_transition_to(OrderStatus.PAYMENT_FAILED):
+            return  # Cancelled meanwhile; nothing to record
+        order.status = OrderStatus.PAYMENT_FAILED
+        order.payment_error = reason
+        order.updated_at = datetime.now(timezone.utc)
+        self.order_repository.save(order)
+        logger.warning("order_payment_failed", order_id=order_id, reason=reason)
+
+    async def _execute(self, message: OutboxMessage) -> None:
+        if message.command == PaymentCommandType.AUTHORIZE:
+            await self._authorize(message)
+        elif message.command == PaymentCommandType.VOID_AUTHORIZATION:
+            await self.payment_service.void_authorization(message.payload["payment_id"])
+        else:
+            raise ValueError(f"Unknown payment command: {message.command}")
+
+    async def _authorize(self, message: OutboxMessage) -> None:
+        order = self.order_repository.find_by_id(message.order_id)
+        if order is None or order.status == OrderStatus.CANCELLED:
+            # Cancelled before we got to it; nothing to authorize
+            logger.info("outbox_authorize_skipped", order_id=message.order_id)
+            return
+
+        payment_id = await self.payment_service.authorize(
+            amount=order.total,
+            customer_id=order.customer_id,
+            order_id=order.id,
+        )
+
+        # Re-read: the order may have been cancelled while we awaited the gateway
+        order = self.order_repository.find_by_id(message.order_id)
+        if order.status == OrderStatus.CANCELLED:
+            self.outbox_repository.save(new_payment_command(
+                order.id, PaymentCommandType.VOID_AUTHORIZATION, payment_id=payment_id,
+            ))
+            return
+
+        order.payment_id = payment_id
+        self.order_repository.save(order)
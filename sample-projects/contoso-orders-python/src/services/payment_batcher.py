@@ -0,0 +1,152 @@
+"""
+Payment Authorization Batcher
+
+Coalesces concurrent authorize calls into batch requests to the gateway.
+
+A batch is sent when it reaches ``max_batch_size`` requests or when its
+oldest request has waited ``max_delay_ms``, whichever comes first. Each
+caller awaits its own result; the batcher fans the batch response back out.
+
+A batch serves many requests, so it is sent without any one caller's
+request deadline; each caller still stops waiting at its own and gets
+DeadlineExceeded. Its request stays in the batch: the gateway may still
+authorize it, and a retry with the same idempotency key returns that
+payment.
+"""
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+import asyncio
+import structlog
+
+from src.config import settings
+from src.deadline import DeadlineExceeded, deadline_scope, remaining_time
+from src.metrics import metrics
+
+logger = structlog.get_logger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of one request in a batch: exactly one of the fields is set."""
+    value: Optional[object] = None
+    error: Optional[BaseException] = None
+
+
+# Sends a list of request payloads, returns one BatchItemResult per payload
+SendBatch = Callable[[List[dict]], Awaitable[List[BatchItemResult]]]
+
+
+def _discard_result(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class AuthorizationBatcher:
+    """
+    Size- and time-bounded micro-batcher.
+
+    Must be used from a single event loop. If the whole batch fails (gateway
+    down, breaker open), every caller in it receives that error and may retry
+    individually.
+    """
+
+    def __init__(
+        self,
+        send_batch: SendBatch,
+        max_batch_size: int = settings.PAYMENT_BATCH_MAX_SIZE,
+        max_delay_ms: float = settings.PAYMENT_BATCH_MAX_DELAY_MS,
+    ):
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def submit(self, payload: dict) -> object:
+        """
+        Queue one request and wait for its result.
+
+        Raises DeadlineExceeded if the request deadline passes first.
+        """
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            metrics.inc("request_deadline_exceeded_total", operation="authorize_batch")
+            raise DeadlineExceeded("Request deadline exceeded before authorize_batch")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((payload, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush("size")
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_delay())
+
+        if remaining is None:
+            return await future
+        try:
+            # Shielded: giving up must not cancel the request for the batch
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            # Nobody awaits the result any more; retrieve it so a failed
+            # batch is not reported as an unretrieved exception
+            future.add_done_callback(_discard_result)
+            metrics.inc("request_deadline_exceeded_total", operation="authorize_batch")
+            raise DeadlineExceeded("Request deadline exceeded during authorize_batch") from None
+
+    async def flush(self) -> None:
+        """Send whatever is pending now and wait for all batches in flight."""
+        self._flush("manual")
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _flush_after_delay(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        self._flush("delay")
+
+    def _flush(self, reason: str) -> None:
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        metrics.observe("payment_authorize_batch_size", len(batch), buckets=BATCH_SIZE_BUCKETS)
+        metrics.inc("payment_authorize_batches_total", reason=reason)
+        task = asyncio.create_task(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: List[tuple[dict, asyncio.Future]]) -> None:
+        payloads = [payload for payload, _ in batch]
+        try:
+            with deadline_scope(None):
+                results = await self.send_batch(payloads)
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch response has {len(results)} results for {len(batch)} requests"
+                )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.warning("payment_batch_failed", size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue  # Caller was cancelled
+            if result.error is not None:
+                future.set_exception(result.error)
+            else:
+                future.set_result(result.value)
@@ -4,24 +4,70 @@ Payment Service
 Handles payment processing integration with external payment gateway.
 
 NOTE: This follows the Circuit Breaker pattern per Architecture Review 2024-Q3.
-All external calls use tenacity for retry logic.
+All gateway calls go through a shared CircuitBreaker, which fails fast while
+the gateway is unhealthy. All external calls use tenacity for retry logic;
+retries stop as soon as the breaker is open, when the request deadline is
+too close, or when the process-wide retry budget is spent.
+
+Per-call timeouts adapt to the observed latency of each operation (see
+LatencyTracker), and idempotent reads are hedged: if the first request has
+not answered by the p95 latency, a second one is sent and the first
+response wins.
 """
 
 from typing import Optional
 from decimal import Decimal
 from datetime import datetime
+import asyncio
+import time
 import uuid
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
+from src.cache import CoalescingCache
 from src.config import settings
+from src.deadline import DeadlineExceeded, remaining_time
+from src.metrics import metrics
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.services.payment_batcher import AuthorizationBatcher, BatchItemResult
+from src.services.gateway_client import (
+    PaymentDeclinedError,
+    PaymentGatewayClient,
+    PaymentGatewayError,
+    PaymentGatewayTimeout,
+)
+from src.services.latency import LatencyTracker
+from src.services.retry_policy import (
+    RetryBudget,
+    count_request_in_budget,
+    stop_before_deadline,
+    stop_when_budget_exhausted,
+)
 
 logger = structlog.get_logger(__name__)
 
+__all__ = [
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "PaymentDeclinedError",
+    "PaymentGatewayError",
+    "PaymentGatewayTimeout",
+    "PaymentService",
+]
+
+_AUTHORIZE_WAIT = wait_exponential(multiplier=1, min=2, max=10)
+
 
-class PaymentGatewayError(Exception):
-    """Exception for payment gateway failures."""
-    pass
+def _retry_budget(retry_state: RetryCallState) -> RetryBudget:
+    """The retry budget of the PaymentService whose method is being retried."""
+    return retry_state.args[0].retry_budget
 
 
 class PaymentService:
@@ -30,16 +76,159 @@ class PaymentService:
     
     Integrates with Contoso Payment Gateway API.
     All amounts are in USD.
+    
+    When constructed without a gateway client (PAYMENT_GATEWAY_ENABLED=false),
+    gateway calls are simulated locally.
+    
+    With batch_authorizations (PAYMENT_BATCH_ENABLED), concurrent authorize
+    calls are coalesced into batch requests by an AuthorizationBatcher.
+    
+    With hedge_reads (PAYMENT_HEDGING_ENABLED), get_payment_status sends a
+    second request when the first is slower than the operation's p95.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        gateway: Optional[PaymentGatewayClient] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        batch_authorizations: bool = settings.PAYMENT_BATCH_ENABLED,
+        latency: Optional[LatencyTracker] = None,
+        hedge_reads: bool = settings.PAYMENT_HEDGING_ENABLED,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
+        self.gateway = gateway
+        self.breaker = breaker or CircuitBreaker("payment_gateway")
+        self.latency = latency or LatencyTracker()
+        self.hedge_reads = hedge_reads
+        self.retry_budget = retry_budget or RetryBudget("payment_gateway")
+        self.batcher = (
+            AuthorizationBatcher(self._send_authorization_batch)
+            if gateway is not None and batch_authorizations
+            else None
+        )
+        self._status_cache: CoalescingCache[str, dict] = CoalescingCache(
+            max_entries=settings.PAYMENT_STATUS_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PAYMENT_STATUS_CACHE_TTL_SECONDS,
+            metric_name="payment_status_cache",
+        )
         self.gateway_url = settings.PAYMENT_GATEWAY_URL
         self.timeout = settings.PAYMENT_GATEWAY_TIMEOUT
     
+    async def close(self) -> None:
+        """Send any coalesced authorizations still waiting for their batch."""
+        if self.batcher is not None:
+            await self.batcher.flush()
+    
+    async def _call_gateway(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> dict:
+        """
+        Send a gateway request through the circuit breaker.
+        
+        The timeout is derived from the operation's recent latency and never
+        outlives the request deadline. Timed-out calls are recorded at their
+        timeout so a slow gateway raises the percentiles instead of hiding
+        from them.
+        
+        Raises DeadlineExceeded, without calling the gateway, if the request
+        deadline has already passed, and instead of PaymentGatewayTimeout if
+        the call times out only because the deadline shortened its timeout.
+        Neither counts as a breaker failure, so callers with short deadlines
+        cannot open the breaker for everyone.
+        """
+        timeout = self.latency.timeout_for(operation)
+        remaining = remaining_time()
+        cut_by_deadline = remaining is not None and remaining < timeout
+        if cut_by_deadline:
+            if remaining <= 0:
+                metrics.inc("request_deadline_exceeded_total", operation=operation)
+                raise DeadlineExceeded(f"Request deadline exceeded before {operation}")
+            timeout = remaining
+        
+        async def timed_request() -> dict:
+            try:
+                async with self.gateway.slot(timeout) as remaining:
+                    # Time spent queued for a slot is not gateway latency
+                    start = time.perf_counter()
+                    try:
+                        result = await self.gateway.send(
+                            method, path, json=json, headers=headers, timeout=remaining,
+                        )
+                    except PaymentGatewayTimeout:
+                        if not cut_by_deadline:
+                            self.latency.record(operation, remaining)
+                        raise
+            except PaymentGatewayTimeout as e:
+                if not cut_by_deadline:
+                    raise
+                # The caller ran out of time, not the gateway: surface it as
+                # DeadlineExceeded so the breaker does not count a failure
+                metrics.inc("request_deadline_exceeded_total", operation=operation)
+                raise DeadlineExceeded(f"Request deadline exceeded during {operation}") from e
+            self.latency.record(operation, time.perf_counter() - start)
+            return result
+        
+        return await self.breaker.call(timed_request)
+    
+    async def _hedged_call(self, operation: str, method: str, path: str) -> dict:
+        """
+        Send an idempotent request, hedging it after the operation's p95.
+        
+        Whichever request succeeds first wins and the other is cancelled.
+        Fails only if both fail, with the error of the last one to finish.
+        """
+        hedge_delay = self.latency.percentile(operation, 0.95) if self.hedge_reads else None
+        primary = asyncio.ensure_future(self._call_gateway(operation, method, path))
+        if hedge_delay is None:
+            return await primary
+        
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary.result()
+            
+            metrics.inc("payment_gateway_hedged_total", operation=operation)
+            hedge = asyncio.ensure_future(self._call_gateway(operation, method, path))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Check every finished task so no failure goes unretrieved
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    winner = succeeded[0]
+                    metrics.inc(
+                        "payment_gateway_hedge_wins_total",
+                        operation=operation,
+                        winner="hedge" if winner is hedge else "primary",
+                    )
+                    return winner.result()
+                error = next(iter(done)).exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(PaymentGatewayError),
+        stop=(
+            stop_after_attempt(3)
+            | stop_before_deadline(_AUTHORIZE_WAIT)
+            # Last, so a retry is only charged when nothing else stopped it
+            | stop_when_budget_exhausted(_retry_budget)
+        ),
+        wait=_AUTHORIZE_WAIT,
+        # Never sleep-and-retry into an open breaker
+        retry=(
+            retry_if_exception_type(PaymentGatewayError)
+            & retry_if_not_exception_type(CircuitOpenError)
+        ),
+        before=count_request_in_budget(_retry_budget),
     )
     async def authorize(
         self,
@@ -63,17 +252,54 @@ class PaymentService:
             order_id=order_id,
         )
         
-        # Simulate payment gateway call
-        # In production, this would be an HTTP call to the payment gateway
-        payment_id = f"PAY-{uuid.uuid4().hex[:16].upper()}"
-        
-        # Simulate occasional failures for testing retry logic
-        # if random.random() < 0.1:
-        #     raise PaymentGatewayError("Gateway timeout")
+        if self.gateway is None:
+            # Simulate payment gateway call
+            payment_id = f"PAY-{uuid.uuid4().hex[:16].upper()}"
+        elif self.batcher is not None:
+            payment_id = await self.batcher.submit({
+                "amount": str(amount),
+                "customer_id": customer_id,
+                "order_id": order_id,
+                "payment_method_id": payment_method_id,
+                "idempotency_key": order_id,
+            })
+        else:
+            # order_id doubles as the idempotency key so outbox redelivery
+            # never authorizes the same order twice
+            result = await self._call_gateway(
+                "authorize",
+                "POST",
+                "/authorizations",
+                json={
+                    "amount": str(amount),
+                    "customer_id": customer_id,
+                    "order_id": order_id,
+                    "payment_method_id": payment_method_id,
+                },
+                headers={"Idempotency-Key": order_id},
+            )
+            payment_id = result["payment_id"]
         
         logger.info("payment_authorized", payment_id=payment_id)
         return payment_id
     
+    async def _send_authorization_batch(self, payloads: list) -> list:
+        """Send coalesced authorizations as one gateway request."""
+        response = await self._call_gateway(
+            "authorize_batch", "POST", "/authorizations/batch", json={"authorizations": payloads},
+        )
+        results = []
+        for item in response["results"]:
+            if "payment_id" in item:
+                results.append(BatchItemResult(value=item["payment_id"]))
+            elif item["error"]["status"] >= 500:
+                results.append(BatchItemResult(error=PaymentGatewayError(item["error"]["message"])))
+            else:
+                results.append(BatchItemResult(
+                    error=PaymentDeclinedError(item["error"]["status"], item["error"]["message"]),
+                ))
+        return results
+    
     async def capture(self, payment_id: str, amount: Optional[Decimal] = None) -> bool:
         """
         Capture an authorized payment.
@@ -82,8 +308,20 @@ class PaymentService:
         """
         logger.info("capturing_payment", payment_id=payment_id, amount=str(amount) if amount else "full")
         
-        # Simulate capture
-        return True
+        if self.gateway is None:
+            # Simulate capture
+            captured = True
+        else:
+            result = await self._call_gateway(
+                "capture",
+                "POST",
+                f"/payments/{payment_id}/capture",
+                json={"amount": str(amount) if amount is not None else None},
+            )
+            captured = result["captured"]
+        
+        self._status_cache.invalidate(payment_id)
+        return captured
     
     async def void_authorization(self, payment_id: str) -> bool:
         """
@@ -93,8 +331,15 @@ class PaymentService:
         """
         logger.info("voiding_payment", payment_id=payment_id)
         
-        # Simulate void
-        return True
+        if self.gateway is None:
+            # Simulate void
+            voided = True
+        else:
+            result = await self._call_gateway("void", "POST", f"/payments/{payment_id}/void")
+            voided = result["voided"]
+        
+        self._status_cache.invalidate(payment_id)
+        return voided
     
     async def refund(
         self,
@@ -114,14 +359,40 @@ class PaymentService:
             reason=reason,
         )
         
-        refund_id = f"REF-{uuid.uuid4().hex[:12].upper()}"
+        if self.gateway is None:
+            # Simulate refund processing
+            refund_id = f"REF-{uuid.uuid4().hex[:12].upper()}"
+        else:
+            result = await self._call_gateway(
+                "refund",
+                "POST",
+                f"/payments/{payment_id}/refunds",
+                json={"amount": str(amount), "reason": reason},
+            )
+            refund_id = result["refund_id"]
+        
+        self._status_cache.invalidate(payment_id)
         
-        # Simulate refund processing
         logger.info("refund_processed", refund_id=refund_id)
         return refund_id
     
     async def get_payment_status(self, payment_id: str) -> dict:
-        """Get current status of a payment."""
+        """
+        Get current status of a payment.
+        
+        Served from a short-TTL cache; concurrent lookups for the same payment
+        share one gateway call. Capture, void and refund invalidate the entry.
+        A slow lookup is hedged with a second request (see _hedged_call).
+        """
+        status = await self._status_cache.get_or_load(
+            payment_id, lambda: self._fetch_payment_status(payment_id)
+        )
+        return dict(status)
+    
+    async def _fetch_payment_status(self, payment_id: str) -> dict:
+        if self.gateway is not None:
+            return await self._hedged_call("get_status", "GET", f"/payments/{payment_id}")
+        
         # Simulate status lookup
         return {
             "payment_id": payment_id,
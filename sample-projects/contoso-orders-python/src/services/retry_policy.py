@@ -0,0 +1,134 @@
+"""
+Retry Policy
+
+Limits on retrying payment gateway calls, as tenacity stop conditions:
+
+- stop_before_deadline: do not retry when the request deadline would expire
+  before the next attempt could finish
+- RetryBudget / stop_when_budget_exhausted: cap retries at a fraction of
+  recent requests across the whole process, so an incident does not turn
+  every request into three
+"""
+
+from collections import deque
+from typing import Callable, Deque
+import time
+import structlog
+from tenacity import RetryCallState
+
+from src.config import settings
+from src.deadline import remaining_time
+from src.metrics import metrics
+
+logger = structlog.get_logger(__name__)
+
+
+class RetryBudget:
+    """
+    Process-wide retry budget over a rolling time window.
+
+    Within the last ``window_seconds``, retries are allowed while
+    ``retries < ratio * requests + min_retries_per_second * window_seconds``.
+    The floor keeps retries possible at low traffic.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ratio: float = settings.PAYMENT_RETRY_BUDGET_RATIO,
+        min_retries_per_second: float = settings.PAYMENT_RETRY_BUDGET_MIN_PER_SECOND,
+        window_seconds: float = settings.PAYMENT_RETRY_BUDGET_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def record_request(self) -> None:
+        """Count a first attempt; every request earns ``ratio`` retries."""
+        now = self._clock()
+        self._requests.append(now)
+        self._prune(now)
+
+    def try_acquire(self) -> bool:
+        """Spend one retry if the budget allows it."""
+        now = self._clock()
+        self._prune(now)
+        if len(self._retries) >= self.allowance:
+            metrics.inc("retry_budget_exhausted_total", budget=self.name)
+            return False
+        self._retries.append(now)
+        metrics.inc("retry_budget_retries_total", budget=self.name)
+        return True
+
+    @property
+    def allowance(self) -> float:
+        """Retries permitted in the current window."""
+        return (
+            self.ratio * len(self._requests)
+            + self.min_retries_per_second * self.window_seconds
+        )
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+
+
+def count_request_in_budget(
+    get_budget: Callable[[RetryCallState], RetryBudget],
+) -> Callable[[RetryCallState], None]:
+    """tenacity ``before`` hook: count each first attempt as a request."""
+    def before(retry_state: RetryCallState) -> None:
+        if retry_state.attempt_number == 1:
+            get_budget(retry_state).record_request()
+
+    return before
+
+
+def stop_before_deadline(
+    wait: Callable[[RetryCallState], float],
+    min_attempt_seconds: float = settings.PAYMENT_TIMEOUT_MIN_SECONDS,
+) -> Callable[[RetryCallState], bool]:
+    """
+    Stop retrying when backoff plus a useful attempt no longer fits.
+
+    ``wait`` must be the retry's wait strategy, used to predict the next sleep.
+    """
+    def stop(retry_state: RetryCallState) -> bool:
+        remaining = remaining_time()
+        if remaining is None or remaining >= wait(retry_state) + min_attempt_seconds:
+            return False
+        logger.info(
+            "retry_skipped_deadline",
+            function=retry_state.fn.__name__ if retry_state.fn else None,
+            attempt=retry_state.attempt_number,
+            remaining_seconds=round(remaining, 3),
+        )
+        metrics.inc("retry_skipped_total", reason="deadline")
+        return True
+
+    return stop
+
+
+def stop_when_budget_exhausted(
+    get_budget: Callable[[RetryCallState], RetryBudget],
+) -> Callable[[RetryCallState], bool]:
+    """
+    Stop retrying when the retry budget is spent.
+
+    Combine it last with ``|`` so a retry is only charged to the budget when
+    every other stop condition allowed it.
+    """
+    def stop(retry_state: RetryCallState) -> bool:
+        if get_budget(retry_state).try_acquire():
+            return False
+        metrics.inc("retry_skipped_total", reason="budget")
+        return True
+
+    return stop
@@ -0,0 +1,6 @@
+"""
+Testing Support
+
+Local stand-ins for external services, used by the test suite and the
+benchmarks in benchmarks/. Never imported by application code.
+"""
@@ -0,0 +1,146 @@
+"""
+Fake Payment Gateway
+
+In-process stand-in for the Contoso Payment Gateway API.
+
+Point PaymentService at it either in-process (no sockets):
+
+    app = create_fake_gateway_app()
+    client = PaymentGatewayClient(base_url="http://gateway", transport=httpx.ASGITransport(app=app))
+
+or over real TCP, for throughput benchmarks:
+
+    uvicorn src.testing.fake_payment_gateway:app --port 9000
+    PAYMENT_GATEWAY_ENABLED=true PAYMENT_GATEWAY_URL=http://127.0.0.1:9000 uvicorn src.main:app
+
+Latency injection: every request waits ``latency_ms``, and with probability
+``tail_probability`` an extra ``tail_latency_ms``, to reproduce a gateway
+with a slow tail.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+import asyncio
+import random
+import uuid
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class FakeGatewayState:
+    """Payments held by the fake gateway, plus knobs for failure injection."""
+    payments: dict[str, dict] = field(default_factory=dict)
+    idempotency_keys: dict[str, str] = field(default_factory=dict)
+    request_count: int = 0
+    batch_sizes: list[int] = field(default_factory=list)
+    fail_next: int = 0  # Respond 503 to the next N requests
+    declined_customers: set[str] = field(default_factory=set)  # Always 402
+    latency_ms: float = 0.0  # Added to every request
+    tail_latency_ms: float = 0.0  # Added on top for tail requests
+    tail_probability: float = 0.0
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+
+    def injected_delay(self) -> float:
+        """Seconds to stall the next request."""
+        delay_ms = self.latency_ms
+        if self.tail_probability and self.rng.random() < self.tail_probability:
+            delay_ms += self.tail_latency_ms
+        return delay_ms / 1000
+
+
+def create_fake_gateway_app(state: Optional[FakeGatewayState] = None) -> FastAPI:
+    """Build a fake gateway app; pass a state object to inspect it from tests."""
+    app = FastAPI(title="Fake Payment Gateway")
+    app.state.gateway = state or FakeGatewayState()
+
+    @app.middleware("http")
+    async def count_and_inject_faults(request: Request, call_next):
+        gateway: FakeGatewayState = request.app.state.gateway
+        gateway.request_count += 1
+        delay = gateway.injected_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if gateway.fail_next > 0:
+            gateway.fail_next -= 1
+            return JSONResponse(status_code=503, content={"error": "unavailable"})
+        return await call_next(request)
+
+    def get_payment(request: Request, payment_id: str) -> dict:
+        payment = request.app.state.gateway.payments.get(payment_id)
+        if payment is None:
+            raise HTTPException(status_code=404, detail="Payment not found")
+        return payment
+
+    def authorize_one(gateway: FakeGatewayState, body: dict, idempotency_key: Optional[str]) -> dict:
+        if idempotency_key and idempotency_key in gateway.idempotency_keys:
+            return {"payment_id": gateway.idempotency_keys[idempotency_key]}
+        if body["customer_id"] in gateway.declined_customers:
+            return {"error": {"status": 402, "message": "Payment declined"}}
+
+        payment_id = f"PAY-{uuid.uuid4().hex[:16].upper()}"
+        gateway.payments[payment_id] = {
+            "payment_id": payment_id,
+            "status": "authorized",
+            "amount": body["amount"],
+            "order_id": body["order_id"],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if idempotency_key:
+            gateway.idempotency_keys[idempotency_key] = payment_id
+        return {"payment_id": payment_id}
+
+    @app.post("/authorizations")
+    async def authorize(
+        request: Request,
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    ):
+        result = authorize_one(request.app.state.gateway, await request.json(), idempotency_key)
+        if "error" in result:
+            raise HTTPException(status_code=result["error"]["status"], detail=result["error"]["message"])
+        return result
+
+    @app.post("/authorizations/batch")
+    async def authorize_batch(request: Request):
+        """Authorize many payments in one request; results are in request order."""
+        gateway: FakeGatewayState = request.app.state.gateway
+        body = await request.json()
+        gateway.batch_sizes.append(len(body["authorizations"]))
+        return {
+            "results": [
+                authorize_one(gateway, item, item.get("idempotency_key"))
+                for item in body["authorizations"]
+            ]
+        }
+
+    @app.post("/payments/{payment_id}/capture")
+    async def capture(request: Request, payment_id: str):
+        get_payment(request, payment_id)["status"] = "captured"
+        return {"captured": True}
+
+    @app.post("/payments/{payment_id}/void")
+    async def void(request: Request, payment_id: str):
+        get_payment(request, payment_id)["status"] = "voided"
+        return {"voided": True}
+
+    @app.post("/payments/{payment_id}/refunds")
+    async def refund(request: Request, payment_id: str):
+        get_payment(request, payment_id)["status"] = "refunded"
+        return {"refund_id": f"REF-{uuid.uuid4().hex[:12].upper()}"}
+
+    @app.get("/payments/{payment_id}")
+    async def payment_status(request: Request, payment_id: str):
+        payment = get_payment(request, payment_id)
+        return {
+            "payment_id": payment_id,
+            "status": payment["status"],
+            "created_at": payment["created_at"],
+        }
+
+    return app
+
+
+# Module-level app for `uvicorn src.testing.fake_payment_gateway:app`
+app = create_fake_gateway_app()
@@ -0,0 +1,276 @@
+"""
+Fake Redis Server
+
+In-process RESP server implementing the small subset of Redis commands used
+by the Redis session backend. Runs on a background thread over real TCP, so
+the client, its pooling and its pipelining are exercised end to end:
+
+    server = FakeRedisServer()
+    server.start()
+    client = RespClient(port=server.port)
+    ...
+    server.stop()
+
+Keys expire on the monotonic clock, checked lazily on access. SUBSCRIBE
+and PUBLISH are supported for invalidation broadcasts. With a password set,
+each connection must AUTH before anything else, as with requirepass.
+"""
+
+from typing import Dict, List, Optional, Set
+import socket
+import socketserver
+import threading
+import time
+
+from src.resp_client import RespError, read_reply
+
+
+class _Ok:
+    """Marker for a ``+OK`` status reply."""
+
+
+OK = _Ok()
+
+
+def encode_reply(value) -> bytes:
+    if value is OK:
+        return b"+OK\r\n"
+    if isinstance(value, RespError):
+        return b"-%s\r\n" % str(value).encode()
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+class FakeRedisServer:
+    """Thread-backed fake Redis; inspect ``data`` and ``commands`` from tests."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        username: str = "default",
+        password: Optional[str] = None,
+    ):
+        self.username = username
+        self.password = password
+        self.data: Dict[bytes, object] = {}  # bytes for strings, dict for sorted sets
+        self.expires: Dict[bytes, float] = {}
+        self.commands: List[str] = []
+        self.connections = 0
+        self.subscribers: Dict[bytes, Set[object]] = {}  # channel -> writable files
+        self._lock = threading.RLock()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server._lock:
+                    server.connections += 1
+                authenticated = server.password is None
+                while True:
+                    try:
+                        request = read_reply(self.rfile)
+                    except (ConnectionError, OSError):
+                        server.unsubscribe_all(self.wfile)
+                        return
+                    if request[0].upper() == b"AUTH":
+                        authenticated = server.authenticate(request[1:])
+                        reply = OK if authenticated else RespError(
+                            "WRONGPASS invalid username-password pair"
+                        )
+                        self.wfile.write(encode_reply(reply))
+                        continue
+                    if not authenticated:
+                        self.wfile.write(encode_reply(RespError("NOAUTH Authentication required.")))
+                        continue
+                    if request[0].upper() == b"SUBSCRIBE":
+                        server.subscribe(request[1:], self.wfile)
+                        continue
+                    reply = server.dispatch(request)
+                    try:
+                        self.wfile.write(encode_reply(reply))
+                    except OSError:
+                        return
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self._server = Server((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def authenticate(self, args: List[bytes]) -> bool:
+        """Check AUTH [username] password against the configured credentials."""
+        *username, password = [arg.decode() for arg in args] or [""]
+        return (
+            self.password is not None
+            and password == self.password
+            and (username or [self.username]) == [self.username]
+        )
+
+    # -- Pub/sub ---------------------------------------------------------------
+
+    def subscribe(self, channels: List[bytes], wfile) -> None:
+        with self._lock:
+            for channel in channels:
+                self.subscribers.setdefault(channel, set()).add(wfile)
+                count = sum(wfile in files for files in self.subscribers.values())
+                wfile.write(encode_reply([b"subscribe", channel, count]))
+
+    def unsubscribe_all(self, wfile) -> None:
+        with self._lock:
+            for files in self.subscribers.values():
+                files.discard(wfile)
+
+    def _cmd_publish(self, channel, message):
+        delivered = 0
+        for wfile in list(self.subscribers.get(channel, ())):
+            try:
+                wfile.write(encode_reply([b"message", channel, message]))
+                delivered += 1
+            except OSError:
+                self.subscribers[channel].discard(wfile)
+        return delivered
+
+    # -- Command dispatch ------------------------------------------------------
+
+    def dispatch(self, request: List[bytes]):
+        name = request[0].decode().upper()
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        with self._lock:
+            self.commands.append(name)
+            if handler is None:
+                return RespError(f"ERR unknown command '{name}'")
+            try:
+                return handler(*request[1:])
+            except (TypeError, ValueError) as e:
+                return RespError(f"ERR {e}")
+
+    def _live(self, key: bytes) -> Optional[object]:
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            del self.expires[key]
+        return self.data.get(key)
+
+    def _cmd_ping(self):
+        return "PONG"
+
+    def _cmd_select(self, db):
+        return OK
+
+    def _cmd_flushall(self):
+        self.data.clear()
+        self.expires.clear()
+        return OK
+
+    def _cmd_dbsize(self):
+        return sum(1 for key in list(self.data) if self._live(key) is not None)
+
+    def _cmd_get(self, key):
+        value = self._live(key)
+        if value is not None and not isinstance(value, bytes):
+            return RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _cmd_mget(self, *keys):
+        return [self._cmd_get(key) for key in keys]
+
+    def _cmd_set(self, key, value, *options):
+        self.data[key] = value
+        self.expires.pop(key, None)
+        options = [option.upper() for option in options]
+        if b"PX" in options:
+            milliseconds = int(options[options.index(b"PX") + 1])
+            self.expires[key] = time.monotonic() + milliseconds / 1000
+        return OK
+
+    def _cmd_del(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self.data[key]
+                self.expires.pop(key, None)
+                deleted += 1
+        return deleted
+
+    def _cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    def _cmd_pttl(self, key):
+        if self._live(key) is None:
+            return -2
+        expires_at = self.expires.get(key)
+        if expires_at is None:
+            return -1
+        return max(0, int((expires_at - time.monotonic()) * 1000))
+
+    def _cmd_pexpire(self, key, milliseconds):
+        if self._live(key) is None:
+            return 0
+        self.expires[key] = time.monotonic() + int(milliseconds) / 1000
+        return 1
+
+    def _zset(self, key) -> Dict[bytes, float]:
+        value = self._live(key)
+        if value is None:
+            value = self.data[key] = {}
+        return value
+
+    def _cmd_zadd(self, key, *pairs):
+        zset = self._zset(key)
+        added = 0
+        for score, member in zip(pairs[::2], pairs[1::2]):
+            added += member not in zset
+            zset[member] = float(score)
+        return added
+
+    def _cmd_zrem(self, key, *members):
+        zset = self._live(key)
+        if zset is None:
+            return 0
+        removed = sum(1 for member in members if zset.pop(member, None) is not None)
+        if not zset:
+            del self.data[key]
+            self.expires.pop(key, None)
+        return removed
+
+    def _cmd_zrange(self, key, start, stop):
+        zset = self._live(key) or {}
+        members = [member for member, _ in sorted(zset.items(), key=lambda item: (item[1], item[0]))]
+        start, stop = int(start), int(stop)
+        stop = len(members) + stop if stop < 0 else stop
+        return members[start:stop + 1]
+
+    def _cmd_zcard(self, key):
+        return len(self._live(key) or {})
@@ -7,6 +7,7 @@ Team Convention: All new tests should use these fixtures.
 Do not create duplicate fixtures in individual test files.
 """
 
+import copy
 import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -186,6 +187,201 @@ def sample_order(
     )
 
 
+@pytest.fixture
+def saved_order(sample_order: Order) -> Order:
+    """
+    The sample order persisted in the order repository.
+    
+    Owned by cust_test_001, so use admin_headers to access it over HTTP.
+    """
+    from src.repositories.order_repo import OrderRepository
+    return OrderRepository().save(sample_order)
+
+
+# =============================================================================
+# PAYMENT GATEWAY FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def fake_gateway():
+    """State of an in-process fake payment gateway (see src/testing/)."""
+    from src.testing.fake_payment_gateway import FakeGatewayState
+    return FakeGatewayState()
+
+
+@pytest.fixture
+async def gateway_client(fake_gateway):
+    """Started PaymentGatewayClient wired to the fake gateway without sockets."""
+    import httpx
+    from src.services.gateway_client import PaymentGatewayClient
+    from src.testing.fake_payment_gateway import create_fake_gateway_app
+    
+    client = PaymentGatewayClient(
+        base_url="http://gateway.test",
+        transport=httpx.ASGITransport(app=create_fake_gateway_app(fake_gateway)),
+    )
+    await client.start()
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def socket_gateway(fake_gateway):
+    """
+    Base URL of the fake gateway served by uvicorn over real TCP.
+    
+    Use this instead of gateway_client when a test depends on timeouts:
+    httpx.ASGITransport does not enforce them.
+    """
+    import threading
+    import time
+    import uvicorn
+    from src.testing.fake_payment_gateway import create_fake_gateway_app
+    
+    server = uvicorn.Server(uvicorn.Config(
+        create_fake_gateway_app(fake_gateway),
+        host="127.0.0.1",
+        port=0,
+        lifespan="off",
+        ws="none",
+        log_level="warning",
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.started, "fake gateway did not start"
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+async def socket_gateway_client(socket_gateway):
+    """Started PaymentGatewayClient connected to the fake gateway over TCP."""
+    from src.services.gateway_client import PaymentGatewayClient
+    
+    client = PaymentGatewayClient(base_url=socket_gateway, timeout=5)
+    await client.start()
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def gateway_payment_service(gateway_client):
+    """PaymentService that talks HTTP to the fake gateway."""
+    from src.services.payment_service import PaymentService
+    return PaymentService(gateway=gateway_client)
+
+
+@pytest.fixture
+def fake_redis():
+    """In-process RESP server standing in for Redis (see src/testing/)."""
+    from src.testing.fake_redis import FakeRedisServer
+    
+    server = FakeRedisServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_redis_with_password():
+    """Fake Redis that requires AUTH (user "app", password "s3cret")."""
+    from src.testing.fake_redis import FakeRedisServer
+    
+    server = FakeRedisServer(username="app", password="s3cret")
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def redis_session_store(fake_redis):
+    """RedisSessionStore connected to the fake Redis server."""
+    from src.legacy.redis_session_store import RedisSessionStore
+    from src.resp_client import RespClient
+    
+    store = RedisSessionStore(RespClient(port=fake_redis.port, pool_size=4))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def make_session():
+    """
+    Factory for sessions to store directly, bypassing login.
+    
+    Usage:
+        def test_expiry(make_session):
+            session = make_session("s1", ttl_seconds=60, age_seconds=30)
+    """
+    def factory(
+        session_id: str,
+        ttl_seconds: float = 3600,
+        user_id: str = "user_001",
+        age_seconds: float = 0,
+    ) -> Session:
+        now = datetime.utcnow()
+        return Session(
+            session_id=session_id,
+            user_id=user_id,
+            user_email="user@contoso.com",
+            is_admin=False,
+            created_at=now - timedelta(seconds=age_seconds),
+            expires_at=now + timedelta(seconds=ttl_seconds),
+            ip_address="10.0.0.1",
+        )
+    
+    return factory
+
+
+@pytest.fixture
+def make_session_worker(fake_redis):
+    """
+    Factory for one worker's session store over the shared fake Redis server.
+    
+    The Redis backend is wrapped in the L1 cache (with its invalidation bus
+    subscribed) when cache=True, and in the negative-lookup filter when
+    filtered=True. Every store built is closed on teardown.
+    """
+    from src.legacy.auth_provider import SESSION_TOKEN_LENGTH
+    from src.legacy.redis_session_store import RedisInvalidationBus, RedisSessionStore
+    from src.legacy.session_cache import CachedSessionStore
+    from src.legacy.session_filter import FilteredSessionStore
+    from src.resp_client import RespClient
+    
+    workers = []
+    
+    def factory(
+        cache: bool = False,
+        cache_ttl_seconds: float = 5.0,
+        filtered: bool = False,
+        miss_ttl_seconds: float = 30.0,
+    ):
+        client = RespClient(port=fake_redis.port, pool_size=4)
+        store = RedisSessionStore(client)
+        if cache:
+            bus = RedisInvalidationBus(client, reconnect_delay_seconds=0.01)
+            store = CachedSessionStore(store, bus=bus, ttl_seconds=cache_ttl_seconds)
+            store.start()
+            assert bus.subscribed.wait(2)
+        if filtered:
+            store = FilteredSessionStore(
+                store,
+                token_length=SESSION_TOKEN_LENGTH,
+                miss_ttl_seconds=miss_ttl_seconds,
+            )
+        workers.append(store)
+        return store
+    
+    yield factory
+    for store in workers:
+        store.close()
+
+
 # =============================================================================
 # REQUEST PAYLOAD FIXTURES
 # =============================================================================
@@ -230,6 +426,7 @@ def cleanup_orders():
     This ensures tests don't interfere with each other.
     """
     from src.repositories.order_repo import _ORDERS
+    from src.repositories.outbox_repo import _DEAD_LETTERS, _OUTBOX
     
     # Store existing orders
     existing_orders = dict(_ORDERS)
@@ -239,3 +436,38 @@ def cleanup_orders():
     # Restore original state after test
     _ORDERS.clear()
     _ORDERS.update(existing_orders)
+    _OUTBOX.clear()
+    _DEAD_LETTERS.clear()
+
+
+@pytest.fixture(autouse=True)
+def cleanup_customers():
+    """Restore the customer store (and its indexes) after each test."""
+    from src.services import customer_service
+    
+    existing_customers = copy.deepcopy(customer_service._CUSTOMERS)
+    
+    yield
+    
+    customer_service._CUSTOMERS.clear()
+    customer_service._CUSTOMERS.update(existing_customers)
+    customer_service.rebuild_indexes()
+
+
+@pytest.fixture(autouse=True)
+def cleanup_quote_cache():
+    """Clear cached order quotes so pricing tests start cold."""
+    from src.services.order_service import invalidate_quote_cache
+    
+    yield
+    
+    invalidate_quote_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with an empty metrics registry."""
+    from src.metrics import metrics
+    
+    metrics.reset()
+    yield
@@ -0,0 +1,144 @@
+"""
+Circuit Breaker Tests
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import pytest
+from decimal import Decimal
+
+from src.metrics import metrics
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from src.services.payment_service import PaymentGatewayError, PaymentService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker(
+        "test_breaker",
+        failure_rate_threshold=0.5,
+        minimum_calls=4,
+        window_seconds=10,
+        open_seconds=5,
+        half_open_max_calls=2,
+        clock=clock,
+    )
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise PaymentGatewayError("gateway down")
+
+
+async def record(breaker: CircuitBreaker, outcomes: str) -> None:
+    """Feed outcomes into the breaker: 's' = success, 'f' = failure."""
+    for outcome in outcomes:
+        try:
+            await breaker.call(succeed if outcome == "s" else fail)
+        except PaymentGatewayError:
+            pass
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+    
+    async def test_stays_closed_below_minimum_calls(self, breaker):
+        """Test a few failures alone do not open the breaker."""
+        await record(breaker, "fff")
+        
+        assert breaker.state == CircuitState.CLOSED
+    
+    async def test_opens_at_failure_rate_threshold(self, breaker):
+        """Test the breaker opens once the failure rate reaches the threshold."""
+        await record(breaker, "ssff")
+        
+        assert breaker.state == CircuitState.OPEN
+    
+    async def test_open_breaker_fails_fast(self, breaker):
+        """Test calls are rejected without running while open."""
+        await record(breaker, "ffff")
+        called = False
+        
+        async def tracked():
+            nonlocal called
+            called = True
+        
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(tracked)
+        
+        assert not called
+    
+    async def test_old_failures_leave_the_window(self, breaker, clock):
+        """Test only outcomes within the rolling window count."""
+        await record(breaker, "fff")
+        clock.now += 11
+        
+        await record(breaker, "sss")
+        
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.failure_rate == 0.0
+    
+    async def test_half_open_successes_close_breaker(self, breaker, clock):
+        """Test successful trial calls after the open period close the breaker."""
+        await record(breaker, "ffff")
+        clock.now += 5
+        
+        assert breaker.state == CircuitState.HALF_OPEN
+        await record(breaker, "ss")
+        
+        assert breaker.state == CircuitState.CLOSED
+    
+    async def test_half_open_failure_reopens_breaker(self, breaker, clock):
+        """Test a failed trial call re-opens the breaker."""
+        await record(breaker, "ffff")
+        clock.now += 5
+        
+        await record(breaker, "f")
+        
+        assert breaker.state == CircuitState.OPEN
+    
+    async def test_state_and_transitions_are_exported(self, breaker):
+        """Test breaker state and transitions show up in metrics."""
+        await record(breaker, "ffff")
+        
+        assert metrics.gauge("payment_circuit_state", breaker="test_breaker") == CircuitState.OPEN.value
+        assert metrics.counter(
+            "payment_circuit_transitions_total",
+            breaker="test_breaker",
+            from_state="closed",
+            to_state="open",
+        ) >= 1
+
+
+class TestPaymentServiceBreaker:
+    """Tests for PaymentService behaviour during a gateway outage."""
+    
+    async def test_authorize_fails_fast_when_open(self, gateway_client, fake_gateway, breaker):
+        """Test authorize neither calls the gateway nor retries while open."""
+        service = PaymentService(gateway=gateway_client, breaker=breaker)
+        fake_gateway.fail_next = 4
+        for _ in range(4):
+            with pytest.raises(PaymentGatewayError):
+                await service.void_authorization("PAY-ANY")
+        requests_before = fake_gateway.request_count
+        
+        with pytest.raises(CircuitOpenError):
+            await service.authorize(amount=Decimal("10"), customer_id="c", order_id="ORD-1")
+        
+        assert fake_gateway.request_count == requests_before
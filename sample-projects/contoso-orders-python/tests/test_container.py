@@ -0,0 +1,29 @@
+"""
+Service Container Tests
+"""
+
+from fastapi.testclient import TestClient
+
+from src.container import ServiceContainer
+from src.main import app
+
+
+class TestServiceContainer:
+    """Tests for the application-scoped service container."""
+    
+    def test_services_share_dependencies(self):
+        """Test OrderService is wired to the container's shared instances."""
+        container = ServiceContainer()
+        
+        assert container.order_service.repository is container.order_repository
+        assert container.order_service.payment_service is container.payment_service
+        assert container.order_service.customer_service is container.customer_service
+    
+    def test_lifespan_starts_and_stops_container(self):
+        """Test the app lifespan drives container startup and shutdown."""
+        container = app.state.container
+        
+        with TestClient(app):
+            assert container.started
+        
+        assert not container.started
@@ -2,9 +2,22 @@
 Customer API Tests
 """
 
+import dataclasses
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 
+from src.exceptions import BusinessException
+from src.models.customer import CustomerTier
+from src.models.order import Order, OrderStatus
+from src.repositories.order_repo import OrderRepository
+from src.services import customer_service
+from src.services.customer_service import CustomerService
+from src.services.order_service import OrderService
+
 
 class TestCustomerEndpoints:
     """Tests for customer API endpoints."""
@@ -92,8 +105,8 @@ class TestCustomerEndpoints:
             headers=auth_headers,
         )
         
-        assert response.status_code == 400
-        assert "already registered" in response.json()["detail"].lower()
+        assert response.status_code == 409
+        assert response.json()["error"]["code"] == "EMAIL_ALREADY_REGISTERED"
     
     def test_update_customer(self, client: TestClient, auth_headers: dict):
         """Test updating customer details."""
@@ -107,8 +120,457 @@ class TestCustomerEndpoints:
         data = response.json()
         assert data["name"] == "Updated Name"
 
+    
+    def test_create_customer_duplicate_email_any_case(self, client: TestClient, auth_headers: dict):
+        """Test duplicates are detected regardless of case and surrounding spaces."""
+        response = client.post(
+            "/api/v1/customers/",
+            params={"name": "Acme Again", "email": " ORDERS@Acme.com"},
+            headers=auth_headers,
+        )
+        
+        assert response.status_code == 409
+    
+    def test_update_customer_email_taken(self, client: TestClient, auth_headers: dict):
+        """Test changing an email to another customer's email is rejected."""
+        response = client.patch(
+            "/api/v1/customers/cust_002",
+            params={"email": "orders@acme.com"},
+            headers=auth_headers,
+        )
+        
+        assert response.status_code == 409
+        assert response.json()["error"]["code"] == "EMAIL_ALREADY_REGISTERED"
+
+
+    def test_update_customer_invalid_tier(self, client: TestClient, auth_headers: dict):
+        """Test an unknown tier is rejected as a validation error, not a server error."""
+        response = client.patch(
+            "/api/v1/customers/cust_002",
+            params={"tier": "diamond"},
+            headers=auth_headers,
+        )
+        
+        assert response.status_code == 422
+
+
+class TestCustomerEmailIndex:
+    """Tests for the normalized email index in CustomerService."""
+    
+    def test_lookup_is_case_insensitive(self):
+        """Test lookups find the customer regardless of email case."""
+        service = CustomerService()
+        
+        customer = service.get_customer_by_email("Orders@ACME.com")
+        
+        assert customer.id == "cust_001"
+    
+    def test_update_moves_index_entry(self):
+        """Test a changed email is found under the new address only."""
+        service = CustomerService()
+        
+        service.update_customer("cust_002", email="jane@newmail.com")
+        
+        assert service.get_customer_by_email("jane@newmail.com").id == "cust_002"
+        assert service.get_customer_by_email("jane.smith@email.com") is None
+    
+    def test_update_to_own_email_in_other_case(self):
+        """Test re-casing a customer's own email is not a conflict."""
+        service = CustomerService()
+        
+        customer = service.update_customer("cust_002", email="Jane.Smith@Email.com")
+        
+        assert customer.email == "Jane.Smith@Email.com"
+        assert service.get_customer_by_email("jane.smith@email.com").id == "cust_002"
+    
+    def test_concurrent_creates_register_email_once(self):
+        """Test racing creates with the same email produce exactly one customer."""
+        service = CustomerService()
+        
+        def create(i):
+            try:
+                return service.create_customer(name=f"Racer {i}", email="race@test.com")
+            except BusinessException:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            created = [c for c in pool.map(create, range(32)) if c is not None]
+        
+        assert len(created) == 1
+        assert service.get_customer_by_email("race@test.com").id == created[0].id
+
+
+
+class TestCustomerListing:
+    """Tests for indexed, cursor-paginated customer listing."""
+    
+    @pytest.fixture
+    def many_customers(self):
+        service = CustomerService()
+        return [
+            service.create_customer(name=f"Customer {i}", email=f"customer{i}@test.com")
+            for i in range(25)
+        ]
+    
+    def test_pages_cover_every_customer_once(self, client: TestClient, auth_headers: dict, many_customers):
+        """Test following next_cursor visits each customer exactly once, oldest first."""
+        seen, cursor = [], None
+        
+        while True:
+            params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+            data = client.get("/api/v1/customers/", params=params, headers=auth_headers).json()
+            seen += [c["id"] for c in data["customers"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert seen == ["cust_001", "cust_002", "cust_003"] + [c.id for c in many_customers]
+    
+    def test_customer_created_while_paging_is_not_skipped(self, many_customers):
+        """Test a customer created between pages appears on a later page, once."""
+        service = CustomerService()
+        first, cursor = service.get_customers_page(limit=10)
+        
+        late = service.create_customer(name="Late Customer", email="late@test.com")
+        seen = [c.id for c in first]
+        while cursor:
+            page, cursor = service.get_customers_page(limit=10, cursor=cursor)
+            seen += [c.id for c in page]
+        
+        assert seen[-1] == late.id
+        assert len(seen) == len(set(seen)) == 29
+    
+    def test_deactivation_leaves_search_index_alone(self, many_customers):
+        """Test deactivating a customer only moves its listing segment."""
+        service = CustomerService()
+        
+        with patch.object(customer_service._SEARCH_INDEX, "add") as add:
+            service.deactivate_customer(many_customers[0].id)
+        
+        add.assert_not_called()
+        matches = service.search_customers("customer0@test.com")
+        assert many_customers[0].id in [c.id for c, _ in matches]
+    
+    def test_malformed_cursor_rejected(self, client: TestClient, auth_headers: dict):
+        """Test a garbage cursor is a 400, not a server error."""
+        response = client.get("/api/v1/customers/", params={"cursor": "cust_001"}, headers=auth_headers)
+        
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_CURSOR"
+    
+    def test_tier_change_moves_customer(self, many_customers):
+        """Test a tier update is reflected in tier-filtered listings."""
+        service = CustomerService()
+        customer = many_customers[0]
+        
+        service.update_customer(customer.id, tier=CustomerTier.PREMIUM)
+        
+        premium = service.get_customers(tier="premium", limit=200)
+        standard = service.get_customers(tier="standard", limit=200)
+        assert customer.id in [c.id for c in premium]
+        assert customer.id not in [c.id for c in standard]
+    
+    def test_deactivated_customer_hidden_unless_requested(self, many_customers):
+        """Test deactivation moves a customer out of active listings."""
+        service = CustomerService()
+        customer = many_customers[0]
+        
+        service.deactivate_customer(customer.id)
+        
+        active = service.get_customers(limit=200)
+        everyone = service.get_customers(active_only=False, limit=200)
+        assert customer.id not in [c.id for c in active]
+        assert customer.id in [c.id for c in everyone]
+    
+    def test_last_page_has_no_cursor(self):
+        """Test a page that reaches the end returns no next_cursor."""
+        service = CustomerService()
+        
+        customers, next_cursor = service.get_customers_page(limit=3)
+        
+        assert [c.id for c in customers] == ["cust_001", "cust_002", "cust_003"]
+        assert next_cursor is None
+
+
+
+class TestCustomerOrders:
+    """Tests for GET /customers/{id}/orders over the per-customer order index."""
+    
+    @pytest.fixture
+    def history(self, sample_order: Order):
+        """Ten orders for test_user_001 (every third cancelled) and one for someone else."""
+        repository = OrderRepository()
+        orders = [
+            repository.save(dataclasses.replace(
+                sample_order,
+                id=f"ORD-HIST{i:04d}",
+                customer_id="test_user_001",
+                status=OrderStatus.CANCELLED if i % 3 == 0 else OrderStatus.PENDING,
+                created_at=sample_order.created_at + timedelta(minutes=i),
+            ))
+            for i in range(10)
+        ]
+        repository.save(dataclasses.replace(sample_order, id="ORD-OTHER0001"))
+        return orders
+    
+    def test_newest_first_with_cursor(self, client: TestClient, auth_headers: dict, history):
+        """Test pages walk the customer's orders newest first without overlap."""
+        seen, cursor = [], None
+        
+        while True:
+            params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/api/v1/customers/test_user_001/orders", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            seen += [o["id"] for o in response.json()["orders"]]
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert seen == [o.id for o in reversed(history)]
+    
+    def test_status_filter(self, client: TestClient, auth_headers: dict, history):
+        """Test only orders in the requested status are returned."""
+        response = client.get(
+            "/api/v1/customers/test_user_001/orders",
+            params={"status": "cancelled"},
+            headers=auth_headers,
+        )
+        
+        ids = [o["id"] for o in response.json()["orders"]]
+        assert ids == ["ORD-HIST0009", "ORD-HIST0006", "ORD-HIST0003", "ORD-HIST0000"]
+    
+    def test_other_customers_orders_forbidden(self, client: TestClient, auth_headers: dict, history):
+        """Test a non-admin cannot list another customer's orders."""
+        response = client.get("/api/v1/customers/cust_test_001/orders", headers=auth_headers)
+        
+        assert response.status_code == 403
+    
+    def test_admin_can_list_any_customer(self, client: TestClient, admin_headers: dict, history):
+        """Test admins can list any customer's orders."""
+        response = client.get("/api/v1/customers/cust_test_001/orders", headers=admin_headers)
+        
+        assert [o["id"] for o in response.json()["orders"]] == ["ORD-OTHER0001"]
+    
+    def test_malformed_cursor_rejected(self, client: TestClient, auth_headers: dict):
+        """Test a garbage cursor is a 400, not a server error."""
+        response = client.get(
+            "/api/v1/customers/test_user_001/orders",
+            params={"cursor": "garbage"},
+            headers=auth_headers,
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_CURSOR"
+    
+    def test_index_follows_order_deletes(self, history):
+        """Test deleting an order removes it from the customer's index."""
+        repository = OrderRepository()
+        
+        repository.delete(history[0].id)
+        
+        assert history[0].id not in [o.id for o in repository.find_by_customer("test_user_001")]
+        assert repository.count(customer_id="test_user_001") == 9
+
+
+class TestCustomerOrderStats:
+    """Tests for incrementally maintained per-customer order aggregates."""
+    
+    def save_order(self, sample_order: Order, order_id: str, customer_id: str, total: str, minutes: int = 0) -> Order:
+        return OrderRepository().save(dataclasses.replace(
+            sample_order,
+            id=order_id,
+            customer_id=customer_id,
+            total=Decimal(total),
+            created_at=sample_order.created_at + timedelta(minutes=minutes),
+        ))
+    
+    def test_saved_orders_accumulate(self, sample_order: Order):
+        """Test spend, count, average and last order time follow saved orders."""
+        self.save_order(sample_order, "ORD-A1", "cust_001", "100.00")
+        last = self.save_order(sample_order, "ORD-A2", "cust_001", "50.00", minutes=5)
+        
+        stats = OrderRepository().customer_stats("cust_001")
+        
+        assert stats.lifetime_spend == Decimal("150.00")
+        assert stats.order_count == 2
+        assert stats.average_order_value == Decimal("75.00")
+        assert stats.last_order_at == last.created_at
+    
+    @pytest.mark.parametrize("status", [OrderStatus.CANCELLED, OrderStatus.REFUNDED])
+    def test_cancelled_and_refunded_orders_stop_counting(self, sample_order: Order, status):
+        """Test a status change made in place and saved reverses the order's contribution."""
+        repository = OrderRepository()
+        self.save_order(sample_order, "ORD-B1", "cust_001", "100.00")
+        order = self.save_order(sample_order, "ORD-B2", "cust_001", "40.00", minutes=5)
+        
+        order.status = status
+        repository.save(order)
+        
+        stats = repository.customer_stats("cust_001")
+        assert stats.lifetime_spend == Decimal("100.00")
+        assert stats.order_count == 1
+        assert stats.last_order_at == order.created_at  # Still the last order placed
+    
+    def test_deleted_order_removed(self, sample_order: Order):
+        """Test deleting an order removes it from the aggregates."""
+        repository = OrderRepository()
+        self.save_order(sample_order, "ORD-C1", "cust_002", "10.00")
+        
+        repository.delete("ORD-C1")
+        
+        stats = repository.customer_stats("cust_002")
+        assert stats.order_count == 0
+        assert stats.lifetime_spend == Decimal("0")
+        assert stats.last_order_at is None
+    
+    def test_top_customers_by_spend(self, sample_order: Order):
+        """Test the top-N query returns the highest spenders first."""
+        self.save_order(sample_order, "ORD-D1", "cust_001", "300.00")
+        self.save_order(sample_order, "ORD-D2", "cust_002", "500.00")
+        self.save_order(sample_order, "ORD-D3", "cust_003", "100.00")
+        self.save_order(sample_order, "ORD-D4", "cust_003", "250.00")
+        
+        top = OrderRepository().top_customers_by_spend(limit=2)
+        
+        assert [(s.customer_id, s.lifetime_spend) for s in top] == [
+            ("cust_002", Decimal("500.00")),
+            ("cust_003", Decimal("350.00")),
+        ]
+    
+    def test_customer_resource_includes_stats(self, client: TestClient, admin_headers: dict, sample_order: Order):
+        """Test GET /customers/{id} embeds the order aggregates for admins."""
+        self.save_order(sample_order, "ORD-E1", "cust_001", "99.99")
+        
+        response = client.get("/api/v1/customers/cust_001", headers=admin_headers)
+        
+        stats = response.json()["order_stats"]
+        assert stats["lifetime_spend"] == "99.99"
+        assert stats["order_count"] == 1
+    
+    def test_customer_resource_hides_stats_from_other_users(self, client: TestClient, auth_headers: dict, sample_order: Order):
+        """Test another user's spend is not exposed where their orders are not."""
+        self.save_order(sample_order, "ORD-E2", "cust_001", "99.99")
+        
+        response = client.get("/api/v1/customers/cust_001", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert "order_stats" not in response.json()
+    
+    async def test_customer_sees_own_stats(self, test_session, sample_order: Order):
+        """Test the customer themselves may read their aggregates."""
+        self.save_order(sample_order, "ORD-E3", test_session.user_id, "10.00")
+        
+        stats = await OrderService().get_customer_order_stats(test_session.user_id, test_session)
+        
+        assert stats.order_count == 1
+    
+    def test_top_spenders_endpoint_admin_only(self, client: TestClient, auth_headers: dict, admin_headers: dict, sample_order: Order):
+        """Test the top-spenders query is for admins only."""
+        self.save_order(sample_order, "ORD-F1", "cust_001", "20.00")
+        
+        forbidden = client.get("/api/v1/customers/top-spenders", headers=auth_headers)
+        allowed = client.get("/api/v1/customers/top-spenders", params={"limit": 1}, headers=admin_headers)
+        
+        assert forbidden.status_code == 403
+        assert allowed.json()["customers"][0]["customer_id"] == "cust_001"
+
 
-# TODO: Add more comprehensive tests
-# - Test customer tier upgrade/downgrade
-# - Test customer deactivation
-# - Test customer order history endpoint
+
+class TestCustomerSearch:
+    """Tests for fuzzy customer search over the trigram index."""
+    
+    def search_ids(self, query: str, **kwargs) -> list:
+        return [c.id for c, _ in CustomerService().search_customers(query, **kwargs)]
+    
+    def test_partial_name_matches(self):
+        """Test a name prefix finds the customer."""
+        ids = self.search_ids("smi")
+        
+        assert ids[0] == "cust_002"
+    
+    def test_email_and_company_match(self):
+        """Test email and company text are searchable too."""
+        by_email = self.search_ids("bob.j@startup")
+        by_company = self.search_ids("startupio")
+        
+        assert by_email[0] == "cust_003"
+        assert by_company[0] == "cust_003"
+    
+    def test_typo_still_matches(self):
+        """Test a misspelled name still finds the customer."""
+        ids = self.search_ids("jonhson")
+        
+        assert ids[0] == "cust_003"
+    
+    def test_exact_match_ranked_first(self):
+        """Test a full match outranks partial matches."""
+        CustomerService().create_customer(name="Jane Smithers", email="js@test.com")
+        
+        results = CustomerService().search_customers("jane smith")
+        
+        assert results[0][0].id == "cust_002"
+        assert results[0][1] == 1.0
+    
+    def test_index_follows_updates(self):
+        """Test a renamed customer is found by the new name only."""
+        service = CustomerService()
+        
+        service.update_customer("cust_002", name="Janet Okafor", email="janet@okafor.com")
+        
+        assert "cust_002" in self.search_ids("okafor")
+        assert "cust_002" not in self.search_ids("smith")
+    
+    def test_new_customer_searchable(self):
+        """Test a created customer is indexed immediately."""
+        customer = CustomerService().create_customer(name="Priya Nakamura", email="priya@test.com")
+        
+        ids = self.search_ids("nakamura")
+        
+        assert ids == [customer.id]
+    
+    def test_active_only_excludes_deactivated(self):
+        """Test active_only drops deactivated customers from results."""
+        service = CustomerService()
+        service.deactivate_customer("cust_003")
+        
+        assert "cust_003" in self.search_ids("johnson")
+        assert "cust_003" not in self.search_ids("johnson", active_only=True)
+    
+    def test_no_match(self):
+        """Test an unrelated query returns nothing."""
+        assert self.search_ids("zzqxv") == []
+    
+    def test_index_stats(self):
+        """Test the index reports its size per customer."""
+        stats = CustomerService().search_index_stats()
+        
+        assert stats["customers"] == 3
+        assert stats["bytes_per_customer"] > 0
+    
+    def test_index_stats_endpoint_admin_only(
+        self, client: TestClient, auth_headers: dict, admin_headers: dict
+    ):
+        """Test GET /customers/search/stats reports memory per customer to admins only."""
+        forbidden = client.get("/api/v1/customers/search/stats", headers=auth_headers)
+        response = client.get("/api/v1/customers/search/stats", headers=admin_headers)
+        
+        assert forbidden.status_code == 403
+        assert response.status_code == 200
+        assert response.json()["customers"] == 3
+        assert response.json()["bytes_per_customer"] > 0
+    
+    def test_search_endpoint(self, client: TestClient, auth_headers: dict):
+        """Test GET /customers/search returns scored matches."""
+        response = client.get("/api/v1/customers/search", params={"q": "acme"}, headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["customers"][0]["id"] == "cust_001"
+        assert data["customers"][0]["score"] == 1.0
+        assert data["count"] == len(data["customers"])
+    
+    def test_search_endpoint_rejects_short_query(self, client: TestClient, auth_headers: dict):
+        """Test a one-character query is rejected."""
+        response = client.get("/api/v1/customers/search", params={"q": "a"}, headers=auth_headers)
+        
+        assert response.status_code == 422
@@ -0,0 +1,67 @@
+"""
+Latency Tracker Tests
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import pytest
+
+from src.services.latency import LatencyTracker
+
+
+@pytest.fixture
+def tracker() -> LatencyTracker:
+    return LatencyTracker(
+        window_size=100,
+        min_samples=10,
+        timeout_multiplier=3.0,
+        min_timeout=0.05,
+        max_timeout=30.0,
+    )
+
+
+class TestLatencyTracker:
+    """Tests for rolling percentiles and adaptive timeouts."""
+    
+    def test_static_timeout_until_enough_samples(self, tracker):
+        """Test the max timeout is used before min_samples are observed."""
+        for _ in range(9):
+            tracker.record("get_status", 0.01)
+        
+        assert tracker.percentile("get_status", 0.99) is None
+        assert tracker.timeout_for("get_status") == 30.0
+    
+    def test_timeout_follows_p99(self, tracker):
+        """Test the timeout is p99 times the multiplier."""
+        for i in range(1, 101):
+            tracker.record("get_status", i / 1000)  # 1ms .. 100ms
+        
+        assert tracker.percentile("get_status", 0.99) == pytest.approx(0.099)
+        assert tracker.timeout_for("get_status") == pytest.approx(0.297)
+    
+    def test_timeout_is_clamped(self, tracker):
+        """Test very fast and very slow operations stay within bounds."""
+        for _ in range(10):
+            tracker.record("fast", 0.001)
+            tracker.record("slow", 20.0)
+        
+        assert tracker.timeout_for("fast") == 0.05
+        assert tracker.timeout_for("slow") == 30.0
+    
+    def test_window_drops_old_samples(self, tracker):
+        """Test percentiles reflect only the most recent window."""
+        for _ in range(100):
+            tracker.record("get_status", 5.0)
+        
+        for _ in range(100):
+            tracker.record("get_status", 0.01)
+        
+        assert tracker.percentile("get_status", 0.99) == 0.01
+    
+    def test_operations_are_tracked_separately(self, tracker):
+        """Test one slow operation does not inflate another's timeout."""
+        for _ in range(10):
+            tracker.record("authorize", 2.0)
+            tracker.record("get_status", 0.01)
+        
+        assert tracker.timeout_for("get_status") == pytest.approx(0.05)
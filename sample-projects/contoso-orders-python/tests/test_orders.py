@@ -10,7 +10,9 @@ import pytest
 from decimal import Decimal
 from fastapi.testclient import TestClient
 
+from src.legacy.auth_provider import Session
 from src.models.order import OrderStatus
+from src.services.order_service import OrderService
 
 
 class TestOrderEndpoints:
@@ -173,3 +175,178 @@ class TestOrderCancellation:
         )
         
         assert response.status_code == 404
+
+
+class TestOrderQuote:
+    """Tests for POST /api/v1/orders/quote."""
+    
+    def test_quote_returns_totals(self, client: TestClient, auth_headers: dict, create_order_payload: dict):
+        """Test quote pricing matches the order pricing rules."""
+        create_order_payload["customer_id"] = "test_user_001"
+        
+        response = client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert Decimal(data["subtotal"]) == Decimal("1299.99")
+        assert Decimal(data["tax"]) == Decimal("1299.99") * Decimal("0.08")
+        assert Decimal(data["shipping_cost"]) == Decimal("7.49")
+        assert Decimal(data["total"]) == (
+            Decimal(data["subtotal"]) + Decimal(data["tax"]) + Decimal(data["shipping_cost"])
+        )
+    
+    def test_quote_does_not_create_order(self, client: TestClient, auth_headers: dict, create_order_payload: dict):
+        """Test quoting leaves the order store untouched."""
+        from src.repositories.order_repo import _ORDERS
+        create_order_payload["customer_id"] = "test_user_001"
+        before = len(_ORDERS)
+        
+        client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers)
+        
+        assert len(_ORDERS) == before
+    
+    def test_equivalent_carts_share_cache_entry(self, client: TestClient, auth_headers: dict, create_order_payload: dict):
+        """Test price formatting and address key order do not change the fingerprint."""
+        from src.services.order_service import _QUOTE_CACHE
+        create_order_payload["customer_id"] = "test_user_001"
+        first = client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers).json()
+        
+        create_order_payload["items"][0]["unit_price"] = "1299.990"
+        create_order_payload["shipping_address"] = dict(
+            reversed(list(create_order_payload["shipping_address"].items()))
+        )
+        hits_before = _QUOTE_CACHE.hits
+        second = client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers).json()
+        
+        assert second["fingerprint"] == first["fingerprint"]
+        assert _QUOTE_CACHE.hits == hits_before + 1
+    
+    def test_padded_state_priced_like_its_fingerprint(self, client: TestClient, auth_headers: dict, create_order_payload: dict):
+        """Test addresses that share a fingerprint also share a price, whichever is quoted first."""
+        create_order_payload["customer_id"] = "test_user_001"
+        create_order_payload["shipping_address"]["state"] = " OR"
+        padded = client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers).json()
+        
+        create_order_payload["shipping_address"]["state"] = "OR"
+        exact = client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers).json()
+        
+        assert padded["fingerprint"] == exact["fingerprint"]
+        assert Decimal(padded["tax"]) == Decimal(exact["tax"]) == Decimal("0")
+    
+    async def test_order_priced_like_its_quote(self, test_session: Session, create_order_payload: dict):
+        """Test order creation normalizes the address the same way quoting does."""
+        service = OrderService()
+        create_order_payload["shipping_address"]["state"] = " OR "
+        cart = dict(create_order_payload, customer_id="test_user_001", session=test_session)
+        quote = await service.quote_order(**cart)
+        
+        order = await service.create_order(**cart)
+        
+        assert order.tax == quote.tax == Decimal("0")
+        assert order.shipping_address.state == "OR"
+    
+    @pytest.mark.parametrize("path", ["/api/v1/orders/quote", "/api/v1/orders/"])
+    def test_quote_and_create_reject_incomplete_address(
+        self, client: TestClient, auth_headers: dict, create_order_payload: dict, path: str
+    ):
+        """Test quote and create validate the address with the same schema."""
+        create_order_payload["customer_id"] = "test_user_001"
+        del create_order_payload["shipping_address"]["postal_code"]
+        
+        response = client.post(path, json=create_order_payload, headers=auth_headers)
+        
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "shipping_address", "postal_code"]
+    
+    def test_invalidate_quote_cache(self, client: TestClient, auth_headers: dict, create_order_payload: dict):
+        """Test pricing changes drop cached quotes."""
+        from src.services.order_service import _QUOTE_CACHE, invalidate_quote_cache
+        create_order_payload["customer_id"] = "test_user_001"
+        client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers)
+        assert len(_QUOTE_CACHE) == 1
+        
+        invalidate_quote_cache()
+        
+        assert len(_QUOTE_CACHE) == 0
+    
+    def test_quote_different_customer_forbidden(self, client: TestClient, auth_headers: dict, create_order_payload: dict):
+        """Test that non-admin cannot quote for a different customer."""
+        response = client.post("/api/v1/orders/quote", json=create_order_payload, headers=auth_headers)
+        
+        assert response.status_code == 403
+        assert response.json()["error"]["code"] == "UNAUTHORIZED_CUSTOMER"
+
+
+class TestOrderConditionalRequests:
+    """Tests for ETag / If-None-Match / If-Match on orders."""
+    
+    def test_get_order_returns_etag(self, client: TestClient, admin_headers: dict, saved_order):
+        """Test GET returns the order's current ETag."""
+        response = client.get(f"/api/v1/orders/{saved_order.id}", headers=admin_headers)
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] == saved_order.etag
+    
+    def test_get_order_not_modified(self, client: TestClient, admin_headers: dict, saved_order):
+        """Test If-None-Match with the current ETag returns 304 and no body."""
+        response = client.get(
+            f"/api/v1/orders/{saved_order.id}",
+            headers={**admin_headers, "If-None-Match": saved_order.etag},
+        )
+        
+        assert response.status_code == 304
+        assert response.content == b""
+    
+    def test_etag_changes_after_update(self, client: TestClient, admin_headers: dict, saved_order):
+        """Test a write invalidates the previous ETag."""
+        old_etag = saved_order.etag
+        
+        client.post(f"/api/v1/orders/{saved_order.id}/cancel", headers=admin_headers)
+        response = client.get(
+            f"/api/v1/orders/{saved_order.id}",
+            headers={**admin_headers, "If-None-Match": old_etag},
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != old_etag
+    
+    def test_cancel_with_stale_if_match_fails(self, client: TestClient, admin_headers: dict, saved_order):
+        """Test If-Match with an outdated ETag returns 412 and leaves the order alone."""
+        response = client.post(
+            f"/api/v1/orders/{saved_order.id}/cancel",
+            headers={**admin_headers, "If-Match": '"stale-etag"'},
+        )
+        
+        assert response.status_code == 412
+        assert response.json()["error"]["code"] == "ORDER_PRECONDITION_FAILED"
+        assert saved_order.status == OrderStatus.PENDING
+    
+    def test_weak_if_match_fails(self, client: TestClient, admin_headers: dict, saved_order):
+        """Test If-Match uses strong comparison: a weak validator never matches."""
+        response = client.post(
+            f"/api/v1/orders/{saved_order.id}/cancel",
+            headers={**admin_headers, "If-Match": f"W/{saved_order.etag}"},
+        )
+        
+        assert response.status_code == 412
+        assert saved_order.status == OrderStatus.PENDING
+    
+    def test_weak_if_none_match_still_matches(self, client: TestClient, admin_headers: dict, saved_order):
+        """Test If-None-Match keeps weak comparison for cache revalidation."""
+        response = client.get(
+            f"/api/v1/orders/{saved_order.id}",
+            headers={**admin_headers, "If-None-Match": f"W/{saved_order.etag}"},
+        )
+        
+        assert response.status_code == 304
+    
+    def test_update_with_current_if_match_succeeds(self, client: TestClient, admin_headers: dict, saved_order):
+        """Test If-Match with the current ETag allows the update."""
+        response = client.patch(
+            f"/api/v1/orders/{saved_order.id}",
+            json={"notes": "Leave at reception"},
+            headers={**admin_headers, "If-Match": saved_order.etag},
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] == saved_order.etag
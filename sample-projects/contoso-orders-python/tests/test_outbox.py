@@ -0,0 +1,257 @@
+"""
+Payment Outbox Tests
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from src.config import settings
+from src.models.order import OrderStatus
+from src.models.outbox import OutboxStatus, PaymentCommandType
+from src.repositories.order_repo import OrderRepository
+from src.repositories.outbox_repo import OutboxRepository
+from src.services.order_service import OrderService
+from src.services.outbox_dispatcher import OutboxDispatcher, new_payment_command
+from src.services.payment_service import PaymentDeclinedError, PaymentGatewayError, PaymentService
+
+
+@pytest.fixture
+def payment_service() -> PaymentService:
+    """PaymentService whose gateway calls are mocked."""
+    service = PaymentService()
+    service.authorize = AsyncMock(return_value="PAY-TEST")
+    service.void_authorization = AsyncMock(return_value=True)
+    return service
+
+
+@pytest.fixture
+def order_service(payment_service: PaymentService) -> OrderService:
+    return OrderService(payment_service=payment_service)
+
+
+@pytest.fixture
+def dispatcher(payment_service: PaymentService) -> OutboxDispatcher:
+    return OutboxDispatcher(
+        outbox_repository=OutboxRepository(),
+        order_repository=OrderRepository(),
+        payment_service=payment_service,
+        max_attempts=2,
+        retry_backoff=0,
+    )
+
+
+class TestOrderOutbox:
+    """Tests for order writes that record payment commands."""
+    
+    async def test_create_order_records_authorize_command(
+        self, order_service, payment_service, test_session, create_order_payload
+    ):
+        """Test order creation writes once and defers the gateway call."""
+        order = await order_service.create_order(
+            customer_id=test_session.user_id,
+            items=create_order_payload["items"],
+            shipping_address=create_order_payload["shipping_address"],
+            session=test_session,
+        )
+        
+        messages = OutboxRepository().find_all(order_id=order.id)
+        assert [m.command for m in messages] == [PaymentCommandType.AUTHORIZE]
+        assert order.version == 1
+        payment_service.authorize.assert_not_called()
+    
+    async def test_cancel_records_void_command(
+        self, order_service, payment_service, admin_session, saved_order
+    ):
+        """Test cancellation records a void instead of calling the gateway inline."""
+        saved_order.payment_id = "PAY-EXISTING"
+        
+        order = await order_service.cancel_order(saved_order.id, admin_session)
+        
+        assert order.status == OrderStatus.CANCELLED
+        messages = OutboxRepository().find_all(order_id=order.id)
+        assert [m.command for m in messages] == [PaymentCommandType.VOID_AUTHORIZATION]
+        assert messages[0].payload == {"payment_id": "PAY-EXISTING"}
+        payment_service.void_authorization.assert_not_called()
+
+
+class TestOutboxDispatcher:
+    """Tests for background delivery of outbox messages."""
+    
+    async def test_dispatch_authorizes_and_sets_payment_id(
+        self, dispatcher, payment_service, saved_order
+    ):
+        """Test the dispatcher authorizes the order and records the payment ID."""
+        message = OutboxRepository().save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+        
+        delivered = await dispatcher.dispatch_once()
+        
+        assert delivered == 1
+        assert saved_order.payment_id == "PAY-TEST"
+        assert message.status == OutboxStatus.DELIVERED
+        payment_service.authorize.assert_awaited_once_with(
+            amount=saved_order.total,
+            customer_id=saved_order.customer_id,
+            order_id=saved_order.id,
+        )
+    
+    async def test_dispatch_skips_authorize_for_cancelled_order(
+        self, dispatcher, payment_service, saved_order
+    ):
+        """Test no authorization happens for an order cancelled before delivery."""
+        saved_order.status = OrderStatus.CANCELLED
+        message = OutboxRepository().save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+        
+        await dispatcher.dispatch_once()
+        
+        payment_service.authorize.assert_not_called()
+        assert message.status == OutboxStatus.DELIVERED
+    
+    async def test_failed_delivery_is_retried_then_marked_failed(
+        self, dispatcher, payment_service, saved_order
+    ):
+        """Test failures are retried and give up after max_attempts."""
+        payment_service.void_authorization.side_effect = PaymentGatewayError("down")
+        message = OutboxRepository().save(new_payment_command(
+            saved_order.id, PaymentCommandType.VOID_AUTHORIZATION, payment_id="PAY-1",
+        ))
+        
+        await dispatcher.dispatch_once()
+        assert message.status == OutboxStatus.PENDING
+        assert message.attempts == 1
+        
+        await dispatcher.dispatch_once()
+        assert message.status == OutboxStatus.FAILED
+        assert message.last_error == "down"
+    
+    async def test_batch_delivery(self, dispatcher, payment_service, saved_order):
+        """Test several due messages are delivered in one pass."""
+        for i in range(3):
+            OutboxRepository().save(new_payment_command(
+                saved_order.id, PaymentCommandType.VOID_AUTHORIZATION, payment_id=f"PAY-{i}",
+            ))
+        
+        delivered = await dispatcher.dispatch_once()
+        
+        assert delivered == 3
+        assert payment_service.void_authorization.await_count == 3
+    
+    async def test_decline_fails_order_without_retry(self, gateway_client, fake_gateway, saved_order):
+        """Test a declined authorization is final: no retries, order marked PAYMENT_FAILED."""
+        fake_gateway.declined_customers.add(saved_order.customer_id)
+        dispatcher = OutboxDispatcher(
+            outbox_repository=OutboxRepository(),
+            order_repository=OrderRepository(),
+            payment_service=PaymentService(gateway=gateway_client, batch_authorizations=False),
+            max_attempts=5,
+            retry_backoff=0,
+        )
+        message = OutboxRepository().save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+        
+        await dispatcher.dispatch_once()
+        
+        assert message.status == OutboxStatus.FAILED
+        assert message.attempts == 1
+        assert fake_gateway.request_count == 1
+        order = OrderRepository().find_by_id(saved_order.id)
+        assert order.status == OrderStatus.PAYMENT_FAILED
+        assert "declined" in order.payment_error
+        assert OrderRepository().customer_stats(order.customer_id).order_count == 0
+    
+    async def test_declined_void_fails_message_only(self, dispatcher, payment_service, saved_order):
+        """Test a declined void is not retried and leaves the order alone."""
+        payment_service.void_authorization.side_effect = PaymentDeclinedError(404, "Payment not found")
+        message = OutboxRepository().save(new_payment_command(
+            saved_order.id, PaymentCommandType.VOID_AUTHORIZATION, payment_id="PAY-1",
+        ))
+        
+        await dispatcher.dispatch_once()
+        
+        assert message.status == OutboxStatus.FAILED
+        assert message.attempts == 1
+        assert saved_order.status == OrderStatus.PENDING
+    
+    async def test_unexpected_error_not_retried(self, dispatcher, payment_service, saved_order):
+        """Test only transient gateway errors are retried."""
+        payment_service.authorize.side_effect = KeyError("payment_id")
+        message = OutboxRepository().save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+        
+        await dispatcher.dispatch_once()
+        
+        assert message.status == OutboxStatus.FAILED
+        assert message.attempts == 1
+
+
+class TestOutboxRepository:
+    """Tests for the pending-message heap and the dead-letter table."""
+    
+    def test_find_due_earliest_first_and_skips_future(self, saved_order):
+        """Test only due messages are claimed, in available_at order."""
+        repository = OutboxRepository()
+        now = datetime.now(timezone.utc)
+        late, early, future = (
+            new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE) for _ in range(3)
+        )
+        late.available_at = now - timedelta(seconds=1)
+        early.available_at = now - timedelta(seconds=5)
+        future.available_at = now + timedelta(minutes=1)
+        for message in (late, early, future):
+            repository.save(message)
+        
+        due = repository.find_due(limit=10, now=now)
+        
+        assert due == [early, late]
+        assert repository.find_due(limit=10, now=now) == []
+    
+    def test_rescheduled_message_is_due_again_after_save(self, saved_order):
+        """Test a claimed message saved with a later available_at is claimed once, then."""
+        repository = OutboxRepository()
+        message = repository.save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+        now = datetime.now(timezone.utc)
+        
+        [claimed] = repository.find_due(limit=1, now=now)
+        claimed.available_at = now + timedelta(seconds=30)
+        repository.save(claimed)
+        
+        assert repository.find_due(limit=10, now=now) == []
+        assert repository.find_due(limit=10, now=now + timedelta(minutes=1)) == [message]
+    
+    async def test_delivered_messages_are_removed(self, dispatcher, saved_order):
+        """Test the outbox only keeps outstanding work."""
+        message = OutboxRepository().save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+        
+        await dispatcher.dispatch_once()
+        
+        assert OutboxRepository().find_by_id(message.id) is None
+        assert OutboxRepository().count() == 0
+    
+    async def test_failed_messages_move_to_bounded_dead_letters(
+        self, dispatcher, payment_service, saved_order, monkeypatch
+    ):
+        """Test FAILED messages leave the outbox and only the newest are kept."""
+        monkeypatch.setattr(settings, "OUTBOX_DEAD_LETTER_MAX_ENTRIES", 2)
+        payment_service.authorize.side_effect = KeyError("payment_id")
+        messages = [
+            OutboxRepository().save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+            for _ in range(3)
+        ]
+        
+        for message in messages:
+            await dispatcher._deliver(message)
+        
+        assert OutboxRepository().count(status=OutboxStatus.PENDING) == 0
+        assert OutboxRepository().find_all(status=OutboxStatus.FAILED) == messages[1:]
+    
+    async def test_cancelled_delivery_releases_message(self, dispatcher, payment_service, saved_order):
+        """Test a delivery cancelled mid-call is claimable again."""
+        payment_service.authorize.side_effect = asyncio.CancelledError
+        message = OutboxRepository().save(new_payment_command(saved_order.id, PaymentCommandType.AUTHORIZE))
+        
+        with pytest.raises(asyncio.CancelledError):
+            await dispatcher.dispatch_once()
+        
+        assert OutboxRepository().find_due(limit=10) == [message]
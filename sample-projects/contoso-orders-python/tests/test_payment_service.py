@@ -0,0 +1,464 @@
+"""
+Payment Service Tests
+
+Runs PaymentService against the in-process fake gateway.
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import asyncio
+import pytest
+import time
+from decimal import Decimal
+
+from src.deadline import DeadlineExceeded, deadline_scope
+from src.metrics import metrics
+from src.services.gateway_client import PaymentGatewayClient
+from src.services.latency import LatencyTracker
+from src.services.payment_service import (
+    PaymentDeclinedError,
+    PaymentGatewayError,
+    PaymentGatewayTimeout,
+    PaymentService,
+)
+
+
+class TestPaymentServiceOverHttp:
+    """Tests for PaymentService with a pooled gateway client."""
+    
+    async def test_authorize_returns_gateway_payment_id(self, gateway_payment_service, fake_gateway):
+        """Test authorize uses the payment ID issued by the gateway."""
+        payment_id = await gateway_payment_service.authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+        
+        assert payment_id in fake_gateway.payments
+        assert fake_gateway.payments[payment_id]["status"] == "authorized"
+    
+    async def test_authorize_is_idempotent_per_order(self, gateway_payment_service, fake_gateway):
+        """Test re-authorizing the same order returns the original payment."""
+        first = await gateway_payment_service.authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+        second = await gateway_payment_service.authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+        
+        assert first == second
+        assert len(fake_gateway.payments) == 1
+    
+    async def test_payment_lifecycle(self, gateway_payment_service):
+        """Test capture, refund and status lookups round-trip through the gateway."""
+        payment_id = await gateway_payment_service.authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+        
+        assert await gateway_payment_service.capture(payment_id) is True
+        refund_id = await gateway_payment_service.refund(payment_id, Decimal("10.00"), "test")
+        status = await gateway_payment_service.get_payment_status(payment_id)
+        
+        assert refund_id.startswith("REF-")
+        assert status["status"] == "refunded"
+    
+    async def test_unknown_payment_is_declined(self, gateway_payment_service):
+        """Test 4xx responses surface as PaymentDeclinedError, not gateway errors."""
+        with pytest.raises(PaymentDeclinedError):
+            await gateway_payment_service.void_authorization("PAY-UNKNOWN")
+    
+    async def test_gateway_outage_raises_gateway_error(self, gateway_payment_service, fake_gateway):
+        """Test 5xx responses surface as PaymentGatewayError."""
+        fake_gateway.fail_next = 1
+        
+        with pytest.raises(PaymentGatewayError):
+            await gateway_payment_service.get_payment_status("PAY-ANY")
+    
+    async def test_client_not_started(self):
+        """Test calls fail cleanly before the client is started."""
+        service = PaymentService(gateway=PaymentGatewayClient(base_url="http://gateway.test"))
+        
+        with pytest.raises(PaymentGatewayError):
+            await service.get_payment_status("PAY-ANY")
+    
+    async def test_concurrency_is_bounded(self, gateway_client):
+        """Test no more than max_concurrency requests are in flight."""
+        gateway_client._semaphore = asyncio.Semaphore(2)
+        in_flight = 0
+        peak = 0
+        original = gateway_client._client.request
+        
+        async def tracking_request(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await original(*args, **kwargs)
+        
+        gateway_client._client.request = tracking_request
+        service = PaymentService(gateway=gateway_client)
+        
+        await asyncio.gather(*(
+            service.authorize(amount=Decimal("1"), customer_id="c", order_id=f"ORD-{i}")
+            for i in range(6)
+        ))
+        
+        assert peak == 2
+
+
+class TestGatewayClientTimeouts:
+    """Tests for request and slot-wait timeouts against the fake gateway over TCP."""
+    
+    async def test_slow_response_times_out(self, socket_gateway_client, fake_gateway):
+        """Test a response slower than the timeout raises PaymentGatewayTimeout."""
+        fake_gateway.latency_ms = 300
+        start = time.perf_counter()
+        
+        with pytest.raises(PaymentGatewayTimeout):
+            await socket_gateway_client.request("GET", "/payments/PAY-ANY", timeout=0.05)
+        
+        assert time.perf_counter() - start < 0.25
+    
+    async def test_slot_wait_bounded_by_timeout(self, socket_gateway_client, fake_gateway):
+        """Test a caller queued behind a saturated client gives up at its timeout."""
+        socket_gateway_client._semaphore = asyncio.Semaphore(1)
+        fake_gateway.latency_ms = 300
+        busy = asyncio.create_task(socket_gateway_client.request("GET", "/payments/PAY-1", timeout=2))
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        
+        with pytest.raises(PaymentGatewayTimeout):
+            await socket_gateway_client.request("GET", "/payments/PAY-2", timeout=0.05)
+        
+        assert time.perf_counter() - start < 0.25
+        assert metrics.counter("payment_gateway_slot_timeouts_total") == 1
+        with pytest.raises(PaymentDeclinedError):  # Unknown payment, after its full latency
+            await busy
+    
+    async def test_slot_wait_not_recorded_as_latency(self, socket_gateway_client, fake_gateway):
+        """Test queueing for a slot does not inflate the latency percentiles."""
+        socket_gateway_client._semaphore = asyncio.Semaphore(1)
+        fake_gateway.latency_ms = 100
+        service = PaymentService(gateway=socket_gateway_client, batch_authorizations=False)
+        
+        await asyncio.gather(*(
+            service.authorize(amount=Decimal("1"), customer_id="c", order_id=f"ORD-{i}")
+            for i in range(3)
+        ))
+        
+        samples = service.latency._windows["authorize"].samples
+        assert len(samples) == 3
+        assert max(samples) < 0.18  # Third caller queued ~200ms, but latency stays ~100ms
+    
+    async def test_slot_permit_granted_at_timeout_is_returned(self, socket_gateway_client):
+        """Test a permit acquired just as the slot wait times out is not lost."""
+        class LateGrantSemaphore(asyncio.Semaphore):
+            async def acquire(self):
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    pass  # The permit is granted as the caller gives up
+                return await super().acquire()
+        
+        socket_gateway_client._semaphore = LateGrantSemaphore(1)
+        
+        with pytest.raises(PaymentGatewayTimeout):
+            async with socket_gateway_client.slot(timeout=0.01):
+                pass
+        await asyncio.sleep(0.01)  # Let the abandoned acquire finish
+        
+        assert not socket_gateway_client._semaphore.locked()
+    
+    async def test_cancelled_slot_wait_returns_no_permit(self, socket_gateway_client):
+        """Test cancelling a caller queued for a slot leaves the pool at full size."""
+        socket_gateway_client._semaphore = asyncio.Semaphore(1)
+        
+        async with socket_gateway_client.slot():
+            waiter = asyncio.create_task(socket_gateway_client.slot().__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        await asyncio.sleep(0.01)
+        
+        assert not socket_gateway_client._semaphore.locked()
+
+
+class TestSimulatedPaymentService:
+    """Tests for the gateway-less simulation mode."""
+    
+    async def test_authorize_without_gateway(self):
+        """Test the default PaymentService still simulates authorizations."""
+        payment_id = await PaymentService().authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+        
+        assert payment_id.startswith("PAY-")
+
+
+class TestAuthorizationBatching:
+    """Tests for coalescing concurrent authorize calls into batches."""
+    
+    @pytest.fixture
+    def batching_service(self, gateway_client) -> PaymentService:
+        service = PaymentService(gateway=gateway_client, batch_authorizations=True)
+        service.batcher.max_batch_size = 4
+        service.batcher.max_delay = 0.01
+        return service
+    
+    async def test_concurrent_calls_share_batches(self, batching_service, fake_gateway):
+        """Test concurrent authorizations are sent in size-bounded batches."""
+        payment_ids = await asyncio.gather(*(
+            batching_service.authorize(amount=Decimal("5"), customer_id="c", order_id=f"ORD-{i}")
+            for i in range(10)
+        ))
+        
+        assert sorted(fake_gateway.batch_sizes) == [2, 4, 4]
+        assert len(set(payment_ids)) == 10
+        assert all(pid in fake_gateway.payments for pid in payment_ids)
+    
+    async def test_single_call_flushed_after_delay(self, batching_service, fake_gateway):
+        """Test a lone request is not held longer than the batch delay."""
+        payment_id = await asyncio.wait_for(
+            batching_service.authorize(amount=Decimal("5"), customer_id="c", order_id="ORD-1"),
+            timeout=1,
+        )
+        
+        assert fake_gateway.batch_sizes == [1]
+        assert payment_id in fake_gateway.payments
+    
+    async def test_decline_only_fails_its_caller(self, batching_service, fake_gateway):
+        """Test a per-item decline is fanned out to the right caller only."""
+        fake_gateway.declined_customers.add("bad_customer")
+        
+        results = await asyncio.gather(
+            batching_service.authorize(amount=Decimal("5"), customer_id="good", order_id="ORD-1"),
+            batching_service.authorize(amount=Decimal("5"), customer_id="bad_customer", order_id="ORD-2"),
+            return_exceptions=True,
+        )
+        
+        assert results[0] in fake_gateway.payments
+        assert isinstance(results[1], PaymentDeclinedError)
+    
+    async def test_caller_stops_waiting_at_its_deadline(self, batching_service, fake_gateway):
+        """Test a slow batch does not hold a caller past its request deadline."""
+        fake_gateway.latency_ms = 1000
+        start = time.perf_counter()
+        
+        with deadline_scope(0.1):
+            with pytest.raises(DeadlineExceeded):
+                await batching_service.authorize(amount=Decimal("5"), customer_id="c", order_id="ORD-1")
+        
+        assert time.perf_counter() - start < 0.5
+        await batching_service.close()  # The batch itself still completes
+        assert fake_gateway.batch_sizes == [1]
+    
+    async def test_batch_sizes_are_tracked(self, batching_service):
+        """Test the batch-size distribution is recorded."""
+        from src.metrics import metrics
+        
+        await asyncio.gather(*(
+            batching_service.authorize(amount=Decimal("5"), customer_id="c", order_id=f"ORD-{i}")
+            for i in range(4)
+        ))
+        
+        histogram = metrics.histogram("payment_authorize_batch_size")
+        assert histogram.count == 1
+        assert histogram.sum == 4
+
+
+class TestPaymentStatusCache:
+    """Tests for single-flight, cached get_payment_status."""
+    
+    @pytest.fixture
+    async def payment_id(self, gateway_payment_service) -> str:
+        return await gateway_payment_service.authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+    
+    async def test_concurrent_lookups_share_one_call(self, gateway_payment_service, fake_gateway, payment_id):
+        """Test simultaneous lookups for one payment make a single gateway call."""
+        requests_before = fake_gateway.request_count
+        
+        statuses = await asyncio.gather(*(
+            gateway_payment_service.get_payment_status(payment_id) for _ in range(5)
+        ))
+        
+        assert fake_gateway.request_count == requests_before + 1
+        assert all(s["status"] == "authorized" for s in statuses)
+    
+    async def test_repeat_lookup_served_from_cache(self, gateway_payment_service, fake_gateway, payment_id):
+        """Test a second lookup within the TTL does not call the gateway."""
+        await gateway_payment_service.get_payment_status(payment_id)
+        requests_before = fake_gateway.request_count
+        
+        await gateway_payment_service.get_payment_status(payment_id)
+        
+        assert fake_gateway.request_count == requests_before
+    
+    async def test_capture_invalidates_status(self, gateway_payment_service, payment_id):
+        """Test a successful capture is visible on the next lookup."""
+        await gateway_payment_service.get_payment_status(payment_id)
+        
+        await gateway_payment_service.capture(payment_id)
+        status = await gateway_payment_service.get_payment_status(payment_id)
+        
+        assert status["status"] == "captured"
+    
+    async def test_invalidation_during_load_is_not_cached(self, gateway_payment_service, fake_gateway, payment_id):
+        """Test a lookup racing a void does not cache the pre-void status."""
+        lookup = asyncio.create_task(gateway_payment_service.get_payment_status(payment_id))
+        await asyncio.sleep(0)  # Let the lookup start its gateway call
+        
+        await gateway_payment_service.void_authorization(payment_id)
+        await lookup
+        status = await gateway_payment_service.get_payment_status(payment_id)
+        
+        assert status["status"] == "voided"
+    
+    async def test_cancelled_leader_does_not_fail_waiters(self, gateway_payment_service, fake_gateway, payment_id):
+        """Test cancelling the lookup that started the load leaves coalesced lookups intact."""
+        fake_gateway.latency_ms = 50
+        leader = asyncio.create_task(gateway_payment_service.get_payment_status(payment_id))
+        await asyncio.sleep(0.01)  # Leader's gateway call is in flight
+        waiter = asyncio.create_task(gateway_payment_service.get_payment_status(payment_id))
+        await asyncio.sleep(0)
+        requests_before = fake_gateway.request_count
+        
+        leader.cancel()
+        status = await waiter
+        
+        assert leader.cancelled()
+        assert status["status"] == "authorized"
+        assert fake_gateway.request_count == requests_before  # Waiter reused the leader's load
+    
+    async def test_failed_load_reaches_every_caller(self, gateway_payment_service, fake_gateway, payment_id):
+        """Test a gateway error is delivered to the leader and coalesced callers alike."""
+        fake_gateway.fail_next = 1
+        
+        results = await asyncio.gather(
+            *(gateway_payment_service.get_payment_status(payment_id) for _ in range(3)),
+            return_exceptions=True,
+        )
+        
+        assert all(isinstance(r, PaymentGatewayError) for r in results)
+    
+    async def test_hit_rate_is_reported(self, gateway_payment_service, payment_id):
+        """Test lookups are counted by result in metrics."""
+        from src.metrics import metrics
+        
+        await gateway_payment_service.get_payment_status(payment_id)
+        await gateway_payment_service.get_payment_status(payment_id)
+        
+        assert metrics.counter("payment_status_cache_total", result="miss") == 1
+        assert metrics.counter("payment_status_cache_total", result="hit") == 1
+        assert metrics.gauge("payment_status_cache_hit_rate") == 0.5
+
+
+class SequenceRandom:
+    """Stand-in for random.Random that returns scripted values, then 1.0."""
+    
+    def __init__(self, *values: float):
+        self.values = list(values)
+    
+    def random(self) -> float:
+        return self.values.pop(0) if self.values else 1.0
+
+
+class TestAdaptiveTimeoutsAndHedging:
+    """Tests for latency-derived timeouts and hedged status lookups."""
+    
+    @pytest.fixture
+    def latency(self) -> LatencyTracker:
+        tracker = LatencyTracker(min_samples=5, min_timeout=0.05, max_timeout=5.0)
+        for _ in range(5):
+            tracker.record("get_status", 0.02)
+        return tracker
+    
+    @pytest.fixture
+    async def payment_id(self, gateway_client, fake_gateway) -> str:
+        service = PaymentService(gateway=gateway_client)
+        payment_id = await service.authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+        fake_gateway.tail_latency_ms = 1000
+        return payment_id
+    
+    async def test_slow_primary_is_hedged(self, gateway_client, fake_gateway, latency, payment_id):
+        """Test a lookup slower than p95 is answered by the hedge request."""
+        fake_gateway.tail_probability = 1.0
+        fake_gateway.rng = SequenceRandom(0.0)  # Only the first request is slow
+        service = PaymentService(gateway=gateway_client, latency=latency, hedge_reads=True)
+        requests_before = fake_gateway.request_count
+        
+        status = await asyncio.wait_for(service.get_payment_status(payment_id), timeout=0.5)
+        
+        assert status["status"] == "authorized"
+        assert fake_gateway.request_count == requests_before + 2
+        assert metrics.counter("payment_gateway_hedged_total", operation="get_status") == 1
+        assert metrics.counter(
+            "payment_gateway_hedge_wins_total", operation="get_status", winner="hedge"
+        ) == 1
+    
+    async def test_fast_primary_is_not_hedged(self, gateway_client, fake_gateway, payment_id):
+        """Test a lookup within p95 sends a single request."""
+        latency = LatencyTracker(min_samples=5)
+        for _ in range(5):
+            latency.record("get_status", 1.0)
+        service = PaymentService(gateway=gateway_client, latency=latency, hedge_reads=True)
+        requests_before = fake_gateway.request_count
+        
+        await service.get_payment_status(payment_id)
+        
+        assert fake_gateway.request_count == requests_before + 1
+        assert metrics.counter("payment_gateway_hedged_total", operation="get_status") == 0
+    
+    async def test_hedging_disabled(self, gateway_client, fake_gateway, latency, payment_id):
+        """Test hedge_reads=False never sends a second request."""
+        fake_gateway.tail_latency_ms = 100
+        fake_gateway.tail_probability = 1.0
+        fake_gateway.rng = SequenceRandom(0.0)
+        service = PaymentService(gateway=gateway_client, latency=latency, hedge_reads=False)
+        requests_before = fake_gateway.request_count
+        
+        await service.get_payment_status(payment_id)
+        
+        assert fake_gateway.request_count == requests_before + 1
+    
+    async def test_timeout_derived_from_latency(self, gateway_client, latency, payment_id):
+        """Test each call passes the adaptive timeout to the client."""
+        # ASGITransport ignores timeouts, so capture the value instead
+        timeouts = []
+        send = gateway_client.send
+        
+        async def recording_send(*args, timeout=None, **kwargs):
+            timeouts.append(timeout)
+            return await send(*args, timeout=timeout, **kwargs)
+        
+        gateway_client.send = recording_send
+        service = PaymentService(gateway=gateway_client, latency=latency, hedge_reads=False)
+        
+        await service.get_payment_status(payment_id)
+        
+        assert timeouts == [pytest.approx(0.06, abs=0.005)]  # p99 of 20ms * 3, less slot wait
+    
+    async def test_timeout_is_recorded_at_its_limit(self, gateway_client, latency, payment_id):
+        """Test a timed-out call raises the latency window instead of vanishing."""
+        async def timing_out_send(method, path, **kwargs):
+            raise PaymentGatewayTimeout(f"Gateway timeout: {method} {path}")
+        
+        gateway_client.send = timing_out_send
+        service = PaymentService(gateway=gateway_client, latency=latency, hedge_reads=False)
+        
+        with pytest.raises(PaymentGatewayTimeout):
+            await service.get_payment_status(payment_id)
+        
+        assert latency.percentile("get_status", 1.0) == pytest.approx(0.06, abs=0.005)
+    
+    async def test_gateway_latency_is_recorded(self, gateway_payment_service):
+        """Test successful calls feed the latency window and metrics."""
+        await gateway_payment_service.authorize(
+            amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+        )
+        
+        assert len(gateway_payment_service.latency._windows["authorize"].samples) == 1
+        assert metrics.histogram("payment_gateway_latency_ms", operation="authorize").count == 1
@@ -0,0 +1,57 @@
+"""
+Product API Tests
+"""
+
+from decimal import Decimal
+from fastapi.testclient import TestClient
+
+from src.api.products import PRODUCT_CATALOG, _hash_catalog, bump_catalog_generation
+
+
+class TestProductConditionalRequests:
+    """Tests for catalog ETags on GET /api/v1/products/."""
+    
+    def test_list_products_returns_etag(self, client: TestClient):
+        """Test the product list carries an ETag."""
+        response = client.get("/api/v1/products/")
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+    
+    def test_list_products_not_modified(self, client: TestClient):
+        """Test If-None-Match with the current catalog ETag returns 304."""
+        etag = client.get("/api/v1/products/").headers["ETag"]
+        
+        response = client.get("/api/v1/products/", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+    
+    def test_etag_depends_on_query(self, client: TestClient):
+        """Test different filters produce different ETags."""
+        all_products = client.get("/api/v1/products/").headers["ETag"]
+        furniture = client.get("/api/v1/products/", params={"category": "furniture"}).headers["ETag"]
+        
+        assert all_products != furniture
+    
+    def test_catalog_change_invalidates_etag(self, client: TestClient, monkeypatch):
+        """Test a changed catalog invalidates issued ETags."""
+        etag = client.get("/api/v1/products/").headers["ETag"]
+        monkeypatch.setattr(PRODUCT_CATALOG[0], "price", Decimal("1199.99"))
+        
+        bump_catalog_generation()
+        response = client.get("/api/v1/products/", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        monkeypatch.undo()
+        bump_catalog_generation()
+    
+    def test_etag_derived_from_catalog_contents(self, client: TestClient):
+        """Test the ETag is stable across processes and moves only with the catalog."""
+        etag = client.get("/api/v1/products/").headers["ETag"]
+        
+        bump_catalog_generation()  # Nothing changed
+        
+        assert client.get("/api/v1/products/").headers["ETag"] == etag
+        assert _hash_catalog() in etag
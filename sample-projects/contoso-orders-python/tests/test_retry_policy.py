@@ -0,0 +1,167 @@
+"""
+Deadline and Retry Policy Tests
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import asyncio
+import pytest
+from decimal import Decimal
+from tenacity import RetryError
+
+from src.deadline import DeadlineExceeded, current_deadline, deadline_scope, remaining_time
+from src.metrics import metrics
+from src.services.circuit_breaker import CircuitState
+from src.services.payment_service import PaymentService
+from src.services.retry_policy import RetryBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDeadlineScope:
+    """Tests for the request deadline context."""
+    
+    def test_no_deadline_by_default(self):
+        """Test code outside a request has no deadline."""
+        assert current_deadline() is None
+        assert remaining_time() is None
+    
+    def test_nested_scope_cannot_extend(self):
+        """Test an inner scope keeps the earlier outer deadline."""
+        with deadline_scope(1.0) as outer:
+            with deadline_scope(60.0) as inner:
+                assert inner is outer
+            with deadline_scope(0.5) as shorter:
+                assert shorter.expires_at < outer.expires_at
+    
+    def test_none_detaches_from_deadline(self):
+        """Test background work can opt out of the request deadline."""
+        with deadline_scope(1.0):
+            with deadline_scope(None):
+                assert remaining_time() is None
+            assert remaining_time() is not None
+    
+    async def test_deadline_follows_spawned_tasks(self):
+        """Test tasks created inside a request inherit its deadline."""
+        with deadline_scope(5.0) as deadline:
+            inherited = await asyncio.create_task(asyncio.sleep(0, result=current_deadline()))
+        
+        assert inherited is deadline
+
+
+class TestRetryBudget:
+    """Tests for the process-wide retry budget."""
+    
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+    
+    @pytest.fixture
+    def budget(self, clock) -> RetryBudget:
+        return RetryBudget(
+            "test_budget", ratio=0.1, min_retries_per_second=0.0, window_seconds=10, clock=clock,
+        )
+    
+    def test_retries_limited_to_ratio_of_requests(self, budget):
+        """Test 20 requests earn exactly 2 retries."""
+        for _ in range(20):
+            budget.record_request()
+        
+        allowed = [budget.try_acquire() for _ in range(3)]
+        
+        assert allowed == [True, True, False]
+        assert metrics.counter("retry_budget_exhausted_total", budget="test_budget") == 1
+    
+    def test_budget_refills_as_window_moves(self, budget, clock):
+        """Test spent retries age out of the window."""
+        for _ in range(10):
+            budget.record_request()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+        
+        clock.now += 11
+        for _ in range(10):
+            budget.record_request()
+        
+        assert budget.try_acquire()
+    
+    def test_floor_allows_retries_at_low_traffic(self, clock):
+        """Test min_retries_per_second permits retries with no requests."""
+        budget = RetryBudget("test_budget", ratio=0.1, min_retries_per_second=0.2, window_seconds=10, clock=clock)
+        
+        allowed = [budget.try_acquire() for _ in range(3)]
+        
+        assert allowed == [True, True, False]
+
+
+class TestPaymentRetryLimits:
+    """Tests for deadline- and budget-limited PaymentService retries."""
+    
+    async def test_no_retry_when_deadline_too_close(self, gateway_client, fake_gateway):
+        """Test a failure is not retried if backoff would outlive the deadline."""
+        service = PaymentService(gateway=gateway_client)
+        fake_gateway.fail_next = 1
+        
+        with deadline_scope(1.0):
+            with pytest.raises(RetryError):
+                await service.authorize(
+                    amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+                )
+        
+        assert fake_gateway.request_count == 1
+        assert metrics.counter("retry_skipped_total", reason="deadline") == 1
+    
+    async def test_no_retry_when_budget_exhausted(self, gateway_client, fake_gateway):
+        """Test a failure is not retried once the retry budget is spent."""
+        budget = RetryBudget("payment_gateway", ratio=0.0, min_retries_per_second=0.0)
+        service = PaymentService(gateway=gateway_client, retry_budget=budget)
+        fake_gateway.fail_next = 1
+        
+        with pytest.raises(RetryError):
+            await service.authorize(
+                amount=Decimal("10.00"), customer_id="cust_001", order_id="ORD-1",
+            )
+        
+        assert fake_gateway.request_count == 1
+        assert metrics.counter("retry_skipped_total", reason="budget") == 1
+    
+    async def test_expired_deadline_skips_gateway(self, gateway_client, fake_gateway):
+        """Test no gateway call is made once the deadline has passed."""
+        service = PaymentService(gateway=gateway_client, hedge_reads=False)
+        
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                await service.get_payment_status("PAY-UNKNOWN")
+        
+        assert fake_gateway.request_count == 0
+    
+    async def test_first_attempts_count_as_requests(self, gateway_payment_service):
+        """Test each authorize call is counted once in the retry budget."""
+        for i in range(3):
+            await gateway_payment_service.authorize(
+                amount=Decimal("10.00"), customer_id="cust_001", order_id=f"ORD-{i}",
+            )
+        
+        assert len(gateway_payment_service.retry_budget._requests) == 3
+    
+    async def test_deadline_cut_timeouts_do_not_open_breaker(self, socket_gateway_client, fake_gateway):
+        """Test calls timed out by a short caller deadline are not gateway failures."""
+        service = PaymentService(gateway=socket_gateway_client, batch_authorizations=False)
+        fake_gateway.latency_ms = 100
+        
+        for i in range(service.breaker.minimum_calls):
+            with deadline_scope(0.01):
+                with pytest.raises(DeadlineExceeded):
+                    await service.authorize(
+                        amount=Decimal("10.00"), customer_id="cust_001", order_id=f"ORD-{i}",
+                    )
+        
+        assert service.breaker.state == CircuitState.CLOSED
+        assert service.breaker.failure_rate == 0.0
+        assert metrics.counter("request_deadline_exceeded_total", operation="authorize") == service.breaker.minimum_calls
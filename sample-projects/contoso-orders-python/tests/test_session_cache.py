@@ -0,0 +1,115 @@
+"""
+Session L1 Cache Tests
+
+Runs CachedSessionStore over the Redis backend and the fake Redis server,
+with one store per simulated worker.
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from src.legacy import auth_provider
+from src.legacy.redis_session_store import RedisSessionStore
+from src.legacy.session_cache import CachedSessionStore
+from src.metrics import metrics
+from src.resp_client import RespClient
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+class TestCachedSessionStore:
+    """Tests for the per-worker L1 session cache."""
+
+    def test_hit_skips_round_trip(self, make_session_worker, make_session):
+        """Test a repeated lookup is answered without touching Redis."""
+        store = make_session_worker(cache=True)
+        store.save(make_session("a" * 64))
+        round_trips = store.backend.client.round_trips
+
+        for _ in range(10):
+            session = store.touch("a" * 64, ttl_seconds=3600, refresh_after_seconds=60)
+
+        assert session.user_id == "user_001"
+        assert store.backend.client.round_trips == round_trips
+        assert metrics.counter("session_l1_total", result="hit") == 10
+
+    def test_miss_loads_and_caches(self, make_session_worker, make_session):
+        """Test a session saved by another worker is loaded once, then cached."""
+        writer, reader = make_session_worker(cache=True), make_session_worker(cache=True)
+        writer.save(make_session("b" * 64))
+
+        first = reader.get("b" * 64)
+        second = reader.get("b" * 64)
+
+        assert first is not None and second is first
+        assert reader.hit_rate == 0.5
+        assert metrics.gauge("session_l1_hit_rate") == 0.5
+
+    def test_get_many_loads_only_uncached(self, make_session_worker, make_session):
+        """Test a bulk lookup serves cached sessions locally and loads the rest at once."""
+        writer, reader = make_session_worker(cache=True), make_session_worker(cache=True)
+        writer.save(make_session("1" * 64))
+        writer.save(make_session("2" * 64))
+        reader.get("1" * 64)
+        round_trips = reader.backend.client.round_trips
+
+        sessions = reader.get_many(["1" * 64, "2" * 64, "3" * 64])
+
+        assert [s is not None for s in sessions] == [True, True, False]
+        assert reader.backend.client.round_trips == round_trips + 1
+        assert reader.get("2" * 64) is sessions[1]  # Now cached
+
+    def test_touch_due_for_refresh_goes_to_backend(self, make_session_worker, fake_redis, make_session):
+        """Test a cached session due for a refresh still slides the Redis expiry."""
+        store = make_session_worker(cache=True)
+        store.save(make_session("c" * 64, ttl_seconds=100))
+
+        session = store.touch("c" * 64, ttl_seconds=3600, refresh_after_seconds=60)
+
+        assert session.expires_at > datetime.utcnow() + timedelta(seconds=3500)
+        assert "PEXPIRE" in fake_redis.commands
+
+    def test_delete_broadcast_to_other_workers(self, make_session_worker, make_session):
+        """Test revoking on one worker evicts the session from every worker's L1."""
+        worker_a, worker_b = make_session_worker(cache=True), make_session_worker(cache=True)
+        worker_a.save(make_session("d" * 64))
+        assert worker_b.get("d" * 64) is not None  # Now cached on worker B
+
+        worker_a.delete("d" * 64)
+
+        assert wait_for(lambda: worker_b.get("d" * 64) is None)
+
+    def test_revoked_session_expires_from_l1_without_broadcast(self, fake_redis, make_session):
+        """Test a worker that misses the broadcast drops the session within the L1 TTL."""
+        store = CachedSessionStore(
+            RedisSessionStore(RespClient(port=fake_redis.port)), ttl_seconds=0.05,
+        )
+        store.save(make_session("e" * 64))
+        fake_redis.data.clear()  # Revoked elsewhere; no bus to hear about it
+        assert store.get("e" * 64) is not None
+
+        time.sleep(0.06)
+
+        assert store.get("e" * 64) is None
+        store.close()
+
+    def test_cleanup_user_sessions_revokes_everywhere(self, make_session_worker, monkeypatch):
+        """Test login-limit cleanup broadcasts the dropped sessions."""
+        worker_a, worker_b = make_session_worker(cache=True), make_session_worker(cache=True)
+        monkeypatch.setattr(auth_provider, "_SESSION_STORE", worker_a)
+        oldest = auth_provider.create_session("user_001", "user@contoso.com")
+        assert worker_b.get(oldest.session_id) is not None
+
+        for _ in range(auth_provider.MAX_SESSIONS_PER_USER):
+            auth_provider.create_session("user_001", "user@contoso.com")
+
+        assert wait_for(lambda: worker_b.get(oldest.session_id) is None)
@@ -0,0 +1,130 @@
+"""
+Session Negative-Lookup Filter Tests
+
+Runs FilteredSessionStore over the Redis backend and the fake Redis server.
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import pytest
+import time
+
+from src.config import settings
+from src.legacy import auth_provider
+from src.legacy.redis_session_store import RedisSessionStore
+from src.legacy.session_cache import CachedSessionStore
+from src.legacy.session_filter import FilteredSessionStore
+from src.metrics import metrics
+
+
+class TestFilteredSessionStore:
+    """Tests for rejecting known-invalid session IDs without a round trip."""
+
+    @pytest.mark.parametrize("session_id", [
+        "",
+        "not-a-token",
+        "A" * 64,  # Uppercase
+        "a" * 63,
+        "a" * 65,
+        "g" * 64,
+        "a" * 63 + "\n",
+    ])
+    def test_malformed_id_rejected_locally(self, make_session_worker, fake_redis, session_id):
+        """Test IDs that _generate_session_token() cannot produce never reach Redis."""
+        store = make_session_worker(filtered=True)
+
+        session = store.touch(session_id, ttl_seconds=1800, refresh_after_seconds=60)
+
+        assert session is None
+        assert fake_redis.commands == []
+        assert metrics.counter("session_lookup_rejected_total", reason="malformed") == 1
+
+    def test_generated_token_is_well_formed(self, make_session_worker):
+        """Test the structural check accepts real tokens."""
+        store = make_session_worker(filtered=True)
+
+        tokens = [auth_provider._generate_session_token() for _ in range(100)]
+
+        assert all(store.is_well_formed(token) for token in tokens)
+
+    def test_repeated_miss_rejected_locally(self, make_session_worker, fake_redis):
+        """Test an unknown ID costs one lookup, then is answered from the miss cache."""
+        store = make_session_worker(filtered=True)
+        unknown = "f" * 64
+        store.get(unknown)
+        commands = len(fake_redis.commands)
+
+        for _ in range(10):
+            assert store.get(unknown) is None
+
+        assert len(fake_redis.commands) == commands
+        assert metrics.counter("session_lookup_rejected_total", reason="recent_miss") == 10
+
+    def test_valid_session_passes_through(self, make_session_worker, make_session):
+        """Test a live session is returned as usual."""
+        store = make_session_worker(filtered=True)
+        store.save(make_session("a" * 64))
+
+        session = store.touch("a" * 64, ttl_seconds=1800, refresh_after_seconds=60)
+
+        assert session.user_id == "user_001"
+
+    def test_get_many_looks_up_only_plausible_ids(self, make_session_worker, fake_redis, make_session):
+        """Test a bulk lookup sends only well-formed, not recently missed IDs."""
+        store = make_session_worker(filtered=True)
+        store.save(make_session("a" * 64))
+        store.get("d" * 64)
+        fake_redis.commands.clear()
+
+        sessions = store.get_many(["junk", "a" * 64, "d" * 64])
+
+        assert [s is not None for s in sessions] == [False, True, False]
+        assert fake_redis.commands == ["MGET", "PTTL"]
+
+    def test_save_clears_local_miss(self, make_session_worker, make_session):
+        """Test a session saved after a miss on the same worker is accepted."""
+        store = make_session_worker(filtered=True)
+        store.get("b" * 64)
+
+        store.save(make_session("b" * 64))
+
+        assert store.get("b" * 64) is not None
+
+    def test_false_negative_on_other_worker_until_miss_expires(self, make_session_worker, make_session):
+        """
+        Test the documented false negative: a worker that cached a miss rejects
+        the ID, once saved elsewhere, until its miss entry expires.
+        """
+        worker_a, worker_b = make_session_worker(filtered=True), make_session_worker(filtered=True, miss_ttl_seconds=0.05)
+        assert worker_b.get("c" * 64) is None  # Looked up before it existed
+        worker_a.save(make_session("c" * 64))
+
+        rejected = worker_b.get("c" * 64)
+        time.sleep(0.06)
+        accepted = worker_b.get("c" * 64)
+
+        assert rejected is None
+        assert accepted is not None
+
+
+class TestSessionStoreSelection:
+    """Tests for the store stack built from settings."""
+
+    def test_redis_backend_is_filtered_and_cached(self, fake_redis, monkeypatch):
+        """Test SESSION_BACKEND=redis builds filter -> L1 cache -> Redis."""
+        monkeypatch.setattr(settings, "SESSION_BACKEND", "redis")
+        monkeypatch.setattr(settings, "SESSION_REDIS_URL", fake_redis.url)
+
+        store = auth_provider._create_session_store()
+
+        assert isinstance(store, FilteredSessionStore)
+        assert isinstance(store.backend, CachedSessionStore)
+        assert isinstance(store.backend.backend, RedisSessionStore)
+        assert store.is_remote
+        store.close()
+
+    def test_memory_backend_is_not_filtered(self):
+        """Test the in-memory store accepts non-canonical dev/test session IDs."""
+        session = auth_provider.get_session("dev_session_001")
+
+        assert session is not None
@@ -0,0 +1,230 @@
+"""
+Session Store Tests
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+
+from src.legacy import auth_provider
+from src.legacy.session_store import InMemorySessionStore, SessionSweeper
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def store(clock) -> InMemorySessionStore:
+    return InMemorySessionStore(clock=clock)
+
+
+class TestInMemorySessionStore:
+    """Tests for expiry-ordered session storage."""
+    
+    def test_live_session_is_returned(self, store, make_session):
+        """Test a stored session is found before it expires."""
+        session = make_session("s1", ttl_seconds=60)
+        store["s1"] = session
+        
+        assert store.get("s1") is session
+        assert "s1" in store
+    
+    def test_expired_session_is_not_returned(self, store, clock, make_session):
+        """Test lookups treat an expired session as missing and drop it."""
+        store["s1"] = make_session("s1", ttl_seconds=60)
+        
+        clock.now += 61
+        
+        assert store.get("s1") is None
+        assert len(store) == 0
+    
+    def test_sweep_evicts_only_expired(self, store, clock, make_session):
+        """Test sweep removes expired sessions and keeps live ones."""
+        store["short"] = make_session("short", ttl_seconds=10)
+        store["long"] = make_session("long", ttl_seconds=100)
+        
+        clock.now += 11
+        evicted = store.sweep()
+        
+        assert evicted == 1
+        assert list(store) == ["long"]
+    
+    def test_refresh_moves_deadline(self, store, clock, make_session):
+        """Test rewriting a session extends its life past the old deadline."""
+        store["s1"] = make_session("s1", ttl_seconds=10)
+        clock.now += 5
+        store["s1"] = make_session("s1", ttl_seconds=10)
+        
+        clock.now += 7
+        evicted = store.sweep()
+        
+        assert evicted == 0
+        assert store.get("s1") is not None
+    
+    def test_sweep_respects_max_evictions(self, store, clock, make_session):
+        """Test a sweep tick stops after max_evictions."""
+        for i in range(5):
+            store[f"s{i}"] = make_session(f"s{i}", ttl_seconds=10)
+        clock.now += 11
+        
+        first = store.sweep(max_evictions=3)
+        second = store.sweep(max_evictions=3)
+        
+        assert (first, second) == (3, 2)
+        assert len(store) == 0
+    
+    def test_stale_heap_entries_stay_bounded(self, store, make_session):
+        """Test repeated refreshes do not grow the heap without bound."""
+        store["s1"] = make_session("s1", ttl_seconds=60)
+        
+        for _ in range(10_000):
+            store["s1"] = make_session("s1", ttl_seconds=60)
+        
+        assert store.heap_size <= 2 * len(store) + 65
+    
+    def test_soak_memory_is_bounded(self, store, clock, make_session):
+        """Test a steady stream of short sessions keeps the store flat."""
+        for tick in range(50):
+            for i in range(100):
+                session_id = f"t{tick}-{i}"
+                store[session_id] = make_session(session_id, ttl_seconds=5)
+            clock.now += 1
+            store.sweep()
+        
+        assert len(store) <= 5 * 100
+        assert store.heap_size <= 2 * len(store) + 65
+
+
+class TestSessionSweeper:
+    """Tests for the background sweeper task."""
+    
+    async def test_sweeper_evicts_in_background(self, store, clock, make_session):
+        """Test expired sessions disappear without being looked up."""
+        store["s1"] = make_session("s1", ttl_seconds=10)
+        sweeper = SessionSweeper(store, interval_seconds=0.01)
+        
+        await sweeper.start()
+        clock.now += 11
+        await asyncio.sleep(0.05)
+        await sweeper.stop()
+        
+        assert len(store) == 0
+
+
+class TestGetSession:
+    """Tests for auth_provider on top of the store."""
+    
+    def test_expired_session_rejected(self, make_session):
+        """Test get_session ignores a session whose expires_at has passed."""
+        session = make_session("expired_test_session", ttl_seconds=-1)
+        auth_provider._SESSION_STORE[session.session_id] = session
+        
+        assert auth_provider.get_session(session.session_id) is None
+    
+    def test_refresh_keeps_session_alive(self, test_session):
+        """Test refresh_session resets the expiry to a full SESSION_TIMEOUT_MINUTES."""
+        refreshed = auth_provider.refresh_session(test_session.session_id)
+        
+        remaining = refreshed.expires_at - datetime.utcnow()
+        assert refreshed is test_session
+        assert timedelta(minutes=29) < remaining <= timedelta(minutes=auth_provider.SESSION_TIMEOUT_MINUTES)
+
+
+class TestPerUserIndex:
+    """Tests for the user_id -> sessions index."""
+    
+    def test_sessions_listed_oldest_first(self, store, make_session):
+        """Test the index orders a user's sessions by created_at."""
+        newer = make_session("newer", ttl_seconds=60)
+        older = make_session("older", ttl_seconds=60)
+        older.created_at = newer.created_at - timedelta(minutes=5)
+        store["newer"] = newer
+        store["older"] = older
+        store["other"] = make_session("other", ttl_seconds=60, user_id="user_002")
+        
+        assert store.session_ids_for_user("user_001") == ["older", "newer"]
+    
+    def test_index_follows_delete_and_expiry(self, store, clock, make_session):
+        """Test invalidated and evicted sessions leave the index."""
+        store["s1"] = make_session("s1", ttl_seconds=10)
+        store["s2"] = make_session("s2", ttl_seconds=100)
+        store["s3"] = make_session("s3", ttl_seconds=100)
+        
+        del store["s2"]
+        clock.now += 11
+        store.sweep()
+        
+        assert store.session_ids_for_user("user_001") == ["s3"]
+    
+    def test_create_session_enforces_limit_per_user(self):
+        """Test logging in again past MAX_SESSIONS_PER_USER drops the oldest session."""
+        user_id = "index_test_user"
+        created = [
+            auth_provider.create_session(user_id, "index@contoso.com")
+            for _ in range(auth_provider.MAX_SESSIONS_PER_USER + 1)
+        ]
+        
+        remaining = auth_provider.get_session_store().session_ids_for_user(user_id)
+        
+        assert created[0].session_id not in remaining
+        assert remaining[-1] == created[-1].session_id
+        assert len(remaining) == auth_provider.MAX_SESSIONS_PER_USER
+        for session_id in remaining:
+            auth_provider.invalidate_session(session_id)
+
+
+class TestTouch:
+    """Tests for fused validate-and-refresh."""
+    
+    def test_recent_session_is_not_rewritten(self, store, clock, make_session):
+        """Test a touch within the refresh interval leaves the expiry alone."""
+        session = make_session("s1", ttl_seconds=1800)
+        store["s1"] = session
+        expires_at = session.expires_at
+        heap_size = store.heap_size
+        
+        clock.now += 30
+        touched = store.touch("s1", ttl_seconds=1800, refresh_after_seconds=60)
+        
+        assert touched is session
+        assert session.expires_at == expires_at
+        assert store.heap_size == heap_size
+    
+    def test_due_session_is_extended(self, store, clock, make_session):
+        """Test a touch after the refresh interval slides the expiry."""
+        session = make_session("s1", ttl_seconds=1800)
+        store["s1"] = session
+        expires_at = session.expires_at
+        
+        clock.now += 61
+        store.touch("s1", ttl_seconds=1800, refresh_after_seconds=60)
+        clock.now += 1800 - 30
+        
+        assert session.expires_at > expires_at
+        assert store.get("s1") is session
+    
+    def test_idle_timeout_is_never_exceeded(self, store, clock, make_session):
+        """Test a session expires within ttl of its last touch."""
+        store["s1"] = make_session("s1", ttl_seconds=1800)
+        clock.now += 59
+        store.touch("s1", ttl_seconds=1800, refresh_after_seconds=60)  # Not due yet
+        
+        clock.now += 1800 - 59
+        
+        assert store.touch("s1", ttl_seconds=1800, refresh_after_seconds=60) is None
+    
+    def test_missing_session(self, store):
+        """Test touching an unknown session returns None."""
+        assert store.touch("nope", ttl_seconds=1800, refresh_after_seconds=60) is None
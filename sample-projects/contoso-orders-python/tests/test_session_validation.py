@@ -0,0 +1,104 @@
+"""
+Batch Session Validation Tests
+
+Covers auth_provider.validate_sessions() and the internal
+/api/v1/internal/sessions/validate endpoint used by BatchProcessor.
+
+Team Convention: Follow the Arrange-Act-Assert pattern in all tests.
+"""
+
+import logging
+import pytest
+
+from src.config import settings
+from src.legacy import auth_provider
+
+
+class TestValidateSessions:
+    """Tests for bulk session validation."""
+    
+    def test_results_in_request_order(self, test_session, admin_session):
+        """Test each token gets its user info, or None, in order."""
+        tokens = ["no_such_session", test_session.session_id, admin_session.session_id]
+        
+        results = auth_provider.validate_sessions(tokens)
+        
+        assert results == [
+            None,
+            {"user_id": "test_user_001", "email": "test@contoso.com", "is_admin": False},
+            {"user_id": "admin_test_001", "email": "admin.test@contoso.com", "is_admin": True},
+        ]
+    
+    def test_duplicate_tokens_looked_up_once(self, test_session, monkeypatch):
+        """Test repeated tokens are answered from one store lookup."""
+        store = auth_provider.get_session_store()
+        requested = []
+        get_many = store.get_many
+        monkeypatch.setattr(store, "get_many", lambda ids: requested.append(ids) or get_many(ids))
+        
+        results = auth_provider.validate_sessions([test_session.session_id] * 3)
+        
+        assert requested == [[test_session.session_id]]
+        assert all(result["user_id"] == "test_user_001" for result in results)
+    
+    def test_logs_once_without_deprecation_warnings(self, test_session, caplog):
+        """Test a batch logs one summary line instead of one warning per token."""
+        with caplog.at_level(logging.INFO, logger=auth_provider.__name__):
+            auth_provider.validate_sessions([test_session.session_id] * 100)
+        
+        assert len(caplog.records) == 1
+        assert caplog.records[0].levelno == logging.INFO
+    
+    def test_redis_backend_single_round_trip(self, redis_session_store, monkeypatch):
+        """Test a batch against Redis is one pipelined lookup."""
+        monkeypatch.setattr(auth_provider, "_SESSION_STORE", redis_session_store)
+        sessions = [
+            auth_provider.create_session(f"user_{i:03d}", "user@contoso.com") for i in range(50)
+        ]
+        round_trips = redis_session_store.client.round_trips
+        
+        results = auth_provider.validate_sessions([s.session_id for s in sessions] + ["f" * 64])
+        
+        assert [r["user_id"] for r in results[:-1]] == [s.user_id for s in sessions]
+        assert results[-1] is None
+        assert redis_session_store.client.round_trips == round_trips + 1
+
+
+class TestValidateSessionsEndpoint:
+    """Tests for POST /api/v1/internal/sessions/validate."""
+    
+    def test_validate(self, client, admin_headers, test_session):
+        """Test the endpoint returns positional results and a valid count."""
+        response = client.post(
+            "/api/v1/internal/sessions/validate",
+            json={"tokens": [test_session.session_id, "bogus"]},
+            headers=admin_headers,
+        )
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["valid"] == 1
+        assert body["results"][0]["user_id"] == "test_user_001"
+        assert body["results"][1] is None
+    
+    def test_requires_admin(self, client, auth_headers):
+        """Test non-admin sessions are refused."""
+        response = client.post(
+            "/api/v1/internal/sessions/validate",
+            json={"tokens": []},
+            headers=auth_headers,
+        )
+        
+        assert response.status_code == 403
+    
+    def test_rejects_oversized_batch(self, client, admin_headers):
+        """Test batches over SESSION_VALIDATE_MAX_TOKENS are rejected."""
+        tokens = ["x"] * (settings.SESSION_VALIDATE_MAX_TOKENS + 1)
+        
+        response = client.post(
+            "/api/v1/internal/sessions/validate",
+            json={"tokens": tokens},
+            headers=admin_headers,
+        )
+        
+        assert response.status_code == 422